@@ -0,0 +1,138 @@
+"""Measures the cost of stage checkpoints and checks that abandoned dialogs keep their progress.
+
+Every dialog is sent and walked through some of its stages: most users complete it,
+the others drop out on a random stage. The run is made without a checkpoint writer and
+with one writing to a sink that takes `--write-latency` seconds per batch. The report
+compares the time per transition and shows the number of written batches. The run
+fails (exit code 1) if a checkpoint of a completed stage is missing or wrong.
+Run from the repository root:
+
+    $ python -m benchmarks.checkpoint --dialogs 5000 --stages 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+from dpydialog import CheckpointWriter, DialogTemplate, DSelect
+from dpydialog.data import StageCheckpoint
+from dpydialog.interfaces.isink import ICheckpointSink
+
+from ..common import OPTIONS, build_template, print_report
+from ..fakes import FakeInteraction, FakeMessage, FakeUser, click
+
+
+class _SlowSink(ICheckpointSink):
+    def __init__(self, latency: float):
+        self._latency = latency
+        self.checkpoints: List[StageCheckpoint] = []
+        self.batches = 0
+
+    async def write(self, checkpoints: List[StageCheckpoint]) -> None:
+        await asyncio.sleep(self._latency)
+        self.checkpoints.extend(checkpoints)
+        self.batches += 1
+
+
+async def run_dialog(template: DialogTemplate, user_id: int, steps: int) -> str:
+    user = FakeUser(user_id)
+    message = FakeMessage()
+    start = FakeInteraction(user, message=message)
+
+    dialog = template.instantiate(start, operator_ids=[user_id])
+    await dialog.send()
+    view = start.response.calls[-1][1]["view"]
+    for step in range(steps):
+        select = next(item for item in view.children if isinstance(item, DSelect))
+        interaction = await click(select, user, message, [str(step % len(OPTIONS))])
+        view = interaction.response.calls[-1][1].get("view")
+        # Fake clicks never wait, a bot gets back to the event loop between interactions
+        await asyncio.sleep(0)
+    return dialog.get_id()
+
+
+async def run(
+    dialogs: int, stages: int, abandon: float, write_latency: float, batch_size: int, seed: int
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    plan = [stages if rng.random() >= abandon else rng.randrange(stages) for _ in range(dialogs)]
+    transitions = sum(plan)
+
+    plain = build_template(stages, buttons=())
+    started = time.perf_counter()
+    for user_id, steps in enumerate(plan):
+        await run_dialog(plain, user_id, steps)
+    plain_seconds = time.perf_counter() - started
+
+    sink = _SlowSink(write_latency)
+    writer = CheckpointWriter(sink, batch_size=batch_size, flush_interval=0.05)
+    checkpointed = build_template(stages, buttons=(), checkpoint_writer=writer)
+    started = time.perf_counter()
+    dialog_ids = [
+        await run_dialog(checkpointed, user_id, steps) for user_id, steps in enumerate(plan)
+    ]
+    checkpoint_seconds = time.perf_counter() - started
+    await writer.flush()
+
+    written: Dict[str, Dict[str, Any]] = {}
+    for checkpoint in sink.checkpoints:
+        written.setdefault(checkpoint.dialog_id, {})[checkpoint.stage_keyname] = checkpoint.value
+
+    errors: List[str] = []
+    for dialog_id, steps in zip(dialog_ids, plan):
+        expected = {f"stage{step}": [str(step % len(OPTIONS))] for step in range(steps)}
+        if written.get(dialog_id, {}) != expected:
+            errors.append(f"{dialog_id} has the checkpoints {written.get(dialog_id)}")
+
+    return {
+        "dialogs": dialogs,
+        "abandoned": sum(1 for steps in plan if steps < stages),
+        "transitions": transitions,
+        "plain_us_per_transition": plain_seconds / max(1, transitions) * 1e6,
+        "checkpoint_us_per_transition": checkpoint_seconds / max(1, transitions) * 1e6,
+        "checkpoints": len(sink.checkpoints),
+        "batches": sink.batches,
+        "dropped": writer.dropped,
+        "errors": len(errors),
+        "first_errors": errors[:10],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dialogs", type=int, default=5000)
+    parser.add_argument("--stages", type=int, default=8)
+    parser.add_argument("--abandon", type=float, default=0.3, help="the share of dropped dialogs")
+    parser.add_argument("--write-latency", type=float, default=0.005, help="seconds per batch")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(
+            args.dialogs,
+            args.stages,
+            args.abandon,
+            args.write_latency,
+            args.batch_size,
+            args.seed,
+        )
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if report["errors"]:
+        print(f"FAIL: {report['errors']} dialogs with wrong checkpoints")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Measures how much memory abandoned dialogs keep and how much of it their timeouts free.
+
+Every dialog is sent, its user answers the first stage and walks away. Sent views are
+kept in a real discord.py view store, like a bot keeps them. The run then waits for
+the idle timeout and reports the dialogs and the memory still alive before and after
+a garbage collection. Run from the repository root:
+
+    $ python -m benchmarks.cleanup --dialogs 2000
+    $ python -m benchmarks.cleanup --dialogs 2000 --no-timeout  # the baseline
+
+Use `--max-live-after-expiry` to fail (exit code 1) when expired dialogs aren't freed.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import sys
+import tracemalloc
+import weakref
+from typing import Any, Dict, Optional
+
+from dpydialog import Dialog, DialogTemplate, DSelect
+
+from ..common import build_template, print_report
+from ..fakes import FakeClient, FakeInteraction, FakeMessage, FakeUser, click
+
+
+async def abandon_dialog(
+    template: DialogTemplate, client: FakeClient, user_id: int, alive: "weakref.WeakSet[Dialog]"
+) -> None:
+    user = FakeUser(user_id)
+    message = FakeMessage()
+    start = FakeInteraction(user, message=message, client=client)
+
+    dialog = template.instantiate(start, operator_ids=[user_id])
+    alive.add(dialog)
+    await dialog.send()
+
+    view = start.response.calls[-1][1]["view"]
+    select = next(item for item in view.children if isinstance(item, DSelect))
+    await click(select, user, message, ["1"], client=client)
+
+
+def _traced_bytes() -> int:
+    return tracemalloc.get_traced_memory()[0]
+
+
+async def measure(dialogs: int, stages: int, idle_timeout: Optional[float]) -> Dict[str, Any]:
+    template = build_template(stages, idle_timeout=idle_timeout)
+    client = FakeClient(keep_views=True)
+    alive: "weakref.WeakSet[Dialog]" = weakref.WeakSet()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = _traced_bytes()
+        for user_id in range(dialogs):
+            await abandon_dialog(template, client, user_id, alive)
+        abandoned_bytes = _traced_bytes() - baseline
+        live_abandoned = len(alive)
+
+        # Freed by reference counting only, the collector stays idle
+        gc.disable()
+        try:
+            await asyncio.sleep((idle_timeout or 0) * 2 + 0.05)
+            # Lets the expiry tasks finish their message edits
+            for _ in range(5):
+                await asyncio.sleep(0)
+            live_after_expiry = len(alive)
+            expired_bytes = _traced_bytes() - baseline
+        finally:
+            gc.enable()
+
+        gc.collect()
+        live_after_gc = len(alive)
+        collected_bytes = _traced_bytes() - baseline
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "dialogs": dialogs,
+        "idle_timeout": idle_timeout,
+        "live_abandoned": live_abandoned,
+        "live_after_expiry": live_after_expiry,
+        "live_after_gc": live_after_gc,
+        "bytes_per_abandoned_dialog": abandoned_bytes / dialogs,
+        "bytes_per_dialog_after_expiry": expired_bytes / dialogs,
+        "bytes_per_dialog_after_gc": collected_bytes / dialogs,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dialogs", type=int, default=2000)
+    parser.add_argument("--stages", type=int, default=3)
+    parser.add_argument("--idle-timeout", type=float, default=0.1)
+    parser.add_argument("--no-timeout", action="store_true", help="measure dialogs without timeouts")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-live-after-expiry", type=int, default=None)
+    args = parser.parse_args()
+
+    idle_timeout = None if args.no_timeout else args.idle_timeout
+    report = asyncio.run(measure(args.dialogs, args.stages, idle_timeout))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if (
+        args.max_live_after_expiry is not None
+        and report["live_after_expiry"] > args.max_live_after_expiry
+    ):
+        print(f"FAIL: {report['live_after_expiry']} dialogs alive after expiry > {args.max_live_after_expiry}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
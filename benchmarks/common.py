@@ -0,0 +1,64 @@
+"""Templates and report helpers shared by the benchmarks."""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import discord
+
+from dpydialog import DButton, DialogTemplate, DSelect, StageAction, StageTemplate
+
+OPTIONS = [discord.SelectOption(label=f"Option {i}", value=str(i)) for i in range(5)]
+
+
+def build_template(
+    stages: int,
+    buttons: Sequence[StageAction] = (StageAction.BACK, StageAction.CLOSE),
+    validation_func: Optional[Callable[[Any], Any]] = None,
+    **kwargs: Any,
+) -> DialogTemplate:
+    """Builds `stages` stages named "stage0", "stage1"... with a NEXT select on the first row.
+
+    Args:
+        stages (int): The number of stages.
+        buttons (Sequence[StageAction], optional):
+            The actions of the buttons on the second row, labeled after the action. Defaults to BACK and CLOSE.
+        validation_func (Optional[Callable[[Any], Any]], optional): The validator of every stage. Defaults to None.
+        **kwargs: The `DialogTemplate` arguments, e.g. `on_success`.
+    """
+    return DialogTemplate(
+        stages=[
+            StageTemplate(
+                keyname=f"stage{index}",
+                content=f"Stage {index}",
+                components=[
+                    *(DButton(label=action.name.title(), row=1, action=action) for action in buttons),
+                    DSelect(options=OPTIONS, row=0, action=StageAction.NEXT),
+                ],
+                validation_func=validation_func,
+            )
+            for index in range(stages)
+        ],
+        **kwargs,
+    )
+
+
+def find(view: discord.ui.View, action_type: type, label: Optional[str] = None) -> discord.ui.Item:
+    """Returns the first item of the type, and with the label if given."""
+    for item in view.children:
+        if isinstance(item, action_type) and (label is None or item.label == label):
+            return item
+    raise LookupError(f"No {action_type.__name__} in the view.")
+
+
+def percentile(samples: List[int], percent: float) -> float:
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Prints the report as aligned `key: value` lines."""
+    width = max(map(len, report), default=0)
+    for key, value in report.items():
+        if isinstance(value, float):
+            value = f"{value:,.2f}"
+        elif isinstance(value, int) and not isinstance(value, bool):
+            value = f"{value:,}"
+        print(f"{key:>{width}}: {value}")
@@ -0,0 +1,144 @@
+"""Fires concurrent clicks at dialogs and checks that every transition happens once.
+
+Every dialog gets bursts of simultaneous clicks on the same view: NEXT bursts, BACK
+bursts, and mixed bursts. An async validator yields to the event loop, so the clicks
+interleave. The run fails (exit code 1) if a stage is skipped, the success callback
+runs more than once, or a BACK burst closes the dialog or moves more than one stage back.
+Run from the repository root:
+
+    $ python -m benchmarks.concurrency --dialogs 500 --burst 5
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+import discord
+
+from dpydialog import DButton, DialogTemplate, DSelect, StageAction
+
+from ..common import build_template, find, print_report
+from ..fakes import FakeInteraction, FakeMessage, FakeUser, click
+
+
+async def _yielding_validator(value: Any) -> bool:
+    await asyncio.sleep(0)
+    return True
+
+
+def build_counting_template(stages: int, successes: Dict[int, int]) -> DialogTemplate:
+    async def on_success(interaction: discord.Interaction, result: Dict[str, Any]) -> None:
+        successes[interaction.user.id] = successes.get(interaction.user.id, 0) + 1
+        await interaction.response.edit_message(content="Done", view=None)
+
+    return build_template(
+        stages,
+        buttons=[StageAction.BACK],
+        validation_func=_yielding_validator,
+        on_success=on_success,
+    )
+
+
+async def stress_dialog(
+    template: DialogTemplate, user_id: int, stages: int, burst: int, rng: random.Random
+) -> List[str]:
+    user = FakeUser(user_id)
+    message = FakeMessage()
+    start = FakeInteraction(user, message=message)
+    dialog = template.instantiate(start, operator_ids=[user_id])
+    await dialog.send()
+
+    errors: List[str] = []
+    current = 0
+    while not dialog.is_finished():
+        view = dialog.get_stage(f"stage{current}").get_components().view
+        kind = rng.choice(["next", "next", "back", "mixed"]) if current > 0 else "next"
+        if kind == "next":
+            clicks = [click(find(view, DSelect), user, message, ["1"]) for _ in range(burst)]
+            allowed = {current + 1}
+        elif kind == "back":
+            clicks = [click(find(view, DButton), user, message) for _ in range(burst)]
+            allowed = {current - 1}
+        else:
+            # A BACK may overtake a NEXT that waits for its validator, either way
+            # exactly one of the clicks wins
+            clicks = [
+                click(find(view, rng.choice([DSelect, DButton])), user, message, ["1"])
+                for _ in range(burst)
+            ]
+            allowed = {current - 1, current + 1}
+
+        await asyncio.gather(*clicks)
+        if dialog.is_finished():
+            if stages not in allowed:
+                errors.append(f"dialog {user_id} finished on the stage {current}")
+            break
+
+        previous, current = current, dialog._current_stage_index
+        if current not in allowed:
+            errors.append(f"dialog {user_id} moved from the stage {previous} to {current}")
+            break
+        history = dialog.get_history()
+        if history != [f"stage{index}" for index in range(current)]:
+            errors.append(f"dialog {user_id} has the history {history}")
+            break
+    return errors
+
+
+async def run(dialogs: int, stages: int, burst: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    successes: Dict[int, int] = {}
+    template = build_counting_template(stages, successes)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(stress_dialog(template, user_id, stages, burst, rng) for user_id in range(dialogs))
+    )
+    elapsed = time.perf_counter() - started
+
+    errors = [error for result in results for error in result]
+    errors += [
+        f"dialog {user_id} succeeded {count} times"
+        for user_id, count in successes.items()
+        if count != 1
+    ]
+    errors += [
+        f"dialog {user_id} never succeeded" for user_id in range(dialogs) if user_id not in successes
+    ]
+    return {
+        "dialogs": dialogs,
+        "stages": stages,
+        "burst": burst,
+        "seconds": elapsed,
+        "errors": len(errors),
+        "first_errors": errors[:10],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dialogs", type=int, default=500)
+    parser.add_argument("--stages", type=int, default=5)
+    parser.add_argument("--burst", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.dialogs, args.stages, args.burst, args.seed))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if report["errors"]:
+        print(f"FAIL: {report['errors']} broken transitions")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Measures the overhead of a component click, from `callback` to the action call.
+
+Components are clicked directly with fake interactions and a no-op action, so only the
+dispatch itself is measured: the action checks and the operator rules lookup. The old
+uncached path, which checked the action on every click, is measured on the same
+components for comparison. Run from the repository root:
+
+    $ python -m benchmarks.dispatch --clicks 200000
+
+Use `--max-ns-per-click` to fail (exit code 1) on regressions.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import sys
+import time
+from functools import partial
+from typing import Any, Dict
+
+import discord
+
+from dpydialog import DButton, DSelect, OperatorRules, StageAction
+from dpydialog.errors import ShouldBeCoroutine, StageActionOutsideDialog
+
+from ..common import OPTIONS, print_report
+from ..fakes import FakeInteraction, FakeUser
+
+
+async def _noop(interaction: discord.Interaction, component: Any) -> None:
+    pass
+
+
+async def _uncached_callback(component: Any, interaction: discord.Interaction) -> None:
+    # The callback before the action was resolved once: every click checked it again
+    action = component.get_action()
+    if isinstance(action, StageAction):
+        raise StageActionOutsideDialog(stage_keyname=component.get_keyname())
+    if not inspect.iscoroutinefunction(action):
+        raise ShouldBeCoroutine(stage_keyname=component.get_keyname())
+
+    if component.get_operator_rules().allows(interaction):
+        await action(interaction, component)
+    else:
+        await component._deny(interaction)
+
+
+async def _clicks(component: Any, clicks: int, uncached: bool = False) -> float:
+    interaction = FakeInteraction(FakeUser(1))
+    callback = partial(_uncached_callback, component) if uncached else component.callback
+    started = time.perf_counter_ns()
+    for _ in range(clicks):
+        await callback(interaction)
+    return (time.perf_counter_ns() - started) / clicks
+
+
+async def _empty(clicks: int) -> float:
+    # The cost of the loop and of awaiting a coroutine, subtracted from the results
+    interaction = FakeInteraction(FakeUser(1))
+    started = time.perf_counter_ns()
+    for _ in range(clicks):
+        await _noop(interaction, None)
+    return (time.perf_counter_ns() - started) / clicks
+
+
+async def measure(clicks: int) -> Dict[str, Any]:
+    restricted = OperatorRules(user_ids=[1], role_ids=[2])
+    components = {
+        "button": DButton(label="Click", action=_noop),
+        "select": DSelect(options=OPTIONS, action=_noop),
+        "restricted_button": DButton(label="Click", action=_noop),
+    }
+    components["restricted_button"].set_operator_rules(restricted)
+
+    for component in components.values():
+        await _clicks(component, 1000)
+        await _clicks(component, 1000, uncached=True)
+    empty = await _empty(clicks)
+
+    report: Dict[str, Any] = {"clicks": clicks}
+    for name, component in components.items():
+        report[f"{name}_ns"] = await _clicks(component, clicks) - empty
+    for name, component in components.items():
+        report[f"{name}_uncached_ns"] = await _clicks(component, clicks, uncached=True) - empty
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clicks", type=int, default=200000)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-ns-per-click", type=float, default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args.clicks))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    limit = args.max_ns_per_click
+    worst = max(
+        value
+        for key, value in report.items()
+        if key.endswith("_ns") and not key.endswith("_uncached_ns")
+    )
+    if limit is not None and worst > limit:
+        print(f"FAIL: {worst:,.0f} ns per click > {limit:,.0f} ns")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
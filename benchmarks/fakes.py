@@ -0,0 +1,151 @@
+"""Local stand-ins for discord.py interactions.
+
+The fakes record every call instead of talking to Discord, so benchmarks measure only
+the overhead of dpydialog itself.
+"""
+import asyncio
+import itertools
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import discord
+from discord.ui.view import ViewStore
+
+_ids = itertools.count(1)
+
+
+class FakeUser:
+    def __init__(self, user_id: int, role_ids: Sequence[int] = ()):
+        self.id = user_id
+        self._roles = sorted(role_ids)
+
+
+class FakeMessage:
+    def __init__(self):
+        self.id = next(_ids)
+        self.deleted = False
+        self.edits = 0
+
+    async def delete(self, delay: Optional[float] = None) -> None:
+        self.deleted = True
+
+    async def edit(self, **kwargs: Any) -> "FakeMessage":
+        self.edits += 1
+        return self
+
+
+class FakeChannel:
+    """A messageable target, `send` takes `latency` seconds and keeps the sent views."""
+
+    def __init__(self, channel_id: Optional[int] = None, latency: float = 0.0):
+        self.id = channel_id if channel_id is not None else next(_ids)
+        self.latency = latency
+        self.sent: List[Tuple[FakeMessage, Optional[discord.ui.View]]] = []
+
+    async def send(self, **kwargs: Any) -> FakeMessage:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        message = FakeMessage()
+        self.sent.append((message, kwargs.get("view")))
+        return message
+
+
+class FakeResponse:
+    def __init__(self, interaction: "FakeInteraction"):
+        self._interaction = interaction
+        self._done = False
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _respond(self, name: str, kwargs: Dict[str, Any]) -> None:
+        if self._done:
+            raise RuntimeError(f"The interaction was already responded to, `{name}` failed.")
+        self._done = True
+        self.calls.append((name, kwargs))
+
+        view = kwargs.get("view")
+        store = self._interaction.client.view_store
+        if store is not None and view is not None and not view.is_finished():
+            message = self._interaction.message
+            store.add_view(view, None if message is None else message.id)
+
+    async def send_message(self, **kwargs: Any) -> None:
+        self._respond("send_message", kwargs)
+
+    async def edit_message(self, **kwargs: Any) -> None:
+        self._respond("edit_message", kwargs)
+
+    async def defer(self, **kwargs: Any) -> None:
+        self._respond("defer", kwargs)
+
+    async def send_modal(self, modal: discord.ui.Modal) -> None:
+        self._respond("send_modal", {"modal": modal})
+
+
+class FakeClient:
+    """With `keep_views`, sent views are kept in a real discord.py view store, like a bot does."""
+
+    def __init__(self, keep_views: bool = False):
+        self.views: List[discord.ui.View] = []
+        self.view_store: Optional[ViewStore] = ViewStore(None) if keep_views else None
+
+    def add_view(self, view: discord.ui.View, message_id: Optional[int] = None) -> None:
+        self.views.append(view)
+
+    def get_user(self, user_id: int) -> None:
+        return None
+
+    def get_channel(self, channel_id: int) -> None:
+        return None
+
+
+class FakeInteraction:
+    """Mimics the attributes of `discord.Interaction` used by dpydialog."""
+
+    def __init__(
+        self,
+        user: FakeUser,
+        message: Optional[FakeMessage] = None,
+        channel_id: int = 1,
+        data: Optional[Dict[str, Any]] = None,
+        client: Optional[FakeClient] = None,
+    ):
+        self.id = next(_ids)
+        self.type = discord.InteractionType.component
+        self.user = user
+        self.message = message
+        self.channel_id = channel_id
+        self.data = data or {}
+        self.client = client or FakeClient()
+        self.created_at = discord.utils.utcnow()
+        self.response = FakeResponse(self)
+        self.original_edits = 0
+
+    async def edit_original_response(self, **kwargs: Any) -> FakeMessage:
+        self.original_edits += 1
+        return self.message or FakeMessage()
+
+
+async def click(
+    item: discord.ui.Item,
+    user: FakeUser,
+    message: FakeMessage,
+    values: Sequence[str] = (),
+    client: Optional[FakeClient] = None,
+) -> FakeInteraction:
+    """Dispatches a component interaction the way the discord.py view store does."""
+    interaction = FakeInteraction(
+        user,
+        message=message,
+        data={"custom_id": getattr(item, "custom_id", None), "values": list(values)},
+        client=client,
+    )
+    if isinstance(item, discord.ui.Select):
+        item._refresh_state(interaction, interaction.data)
+
+    view = item.view
+    if view is None or await view.interaction_check(interaction):
+        await item.callback(interaction)
+    return interaction
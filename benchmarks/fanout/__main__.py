@@ -0,0 +1,140 @@
+"""Sends one dialog to many channels at once and completes them from the result stream.
+
+Every fake channel takes `--latency` seconds to send a message. The run reports how long
+sending the first stages took compared to the ideal `targets * latency / concurrency`,
+the peak number of concurrent sends and the time to stream every outcome. Some channels
+reject the send, their dialogs are reported as failed. The run fails (exit code 1) if the
+concurrency limit is exceeded or an outcome is missing or wrong.
+Run from the repository root:
+
+    $ python -m benchmarks.fanout --targets 1000 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from dpydialog import DialogFanOut, DSelect, StageAction
+
+from ..common import build_template, print_report
+from ..fakes import FakeChannel, FakeMessage, FakeUser, click
+
+
+class _Sends:
+    def __init__(self, targets: int):
+        self.in_flight = 0
+        self.peak = 0
+        self.remaining = targets
+        self.finished = asyncio.Event()
+
+
+class _TrackedChannel(FakeChannel):
+    def __init__(self, sends: _Sends, latency: float, fails: bool):
+        super().__init__(latency=latency)
+        self._sends = sends
+        self._fails = fails
+
+    async def send(self, **kwargs: Any) -> FakeMessage:
+        self._sends.in_flight += 1
+        self._sends.peak = max(self._sends.peak, self._sends.in_flight)
+        try:
+            if self._fails:
+                raise RuntimeError("Cannot send messages to this user")
+            return await super().send(**kwargs)
+        finally:
+            self._sends.in_flight -= 1
+            self._sends.remaining -= 1
+            if not self._sends.remaining:
+                self._sends.finished.set()
+
+
+async def _answer(fanout: DialogFanOut) -> None:
+    # Completes every sent dialog by picking an option on each stage
+    user = FakeUser(1)
+    for dialog in fanout.get_dialogs():
+        message, view = dialog.get_controller().get_target().sent[0]
+        while not dialog.is_finished():
+            select = next(item for item in view.children if isinstance(item, DSelect))
+            interaction = await click(select, user, message, ["1"])
+            view = interaction.response.calls[-1][1].get("view")
+
+
+async def run(
+    targets: int, concurrency: int, latency: float, stages: int, fail_every: int
+) -> Dict[str, Any]:
+    sends = _Sends(targets)
+    failing = {index for index in range(targets) if fail_every > 0 and index % fail_every == 0}
+    channels = [
+        _TrackedChannel(sends, latency, fails=index in failing) for index in range(targets)
+    ]
+    fanout = DialogFanOut(build_template(stages, buttons=[StageAction.BACK]), channels, max_concurrency=concurrency)
+
+    started = time.perf_counter()
+    fanout.start()
+    await sends.finished.wait()
+    # Lets the last sends finish their dialogs' setup
+    await asyncio.sleep(0)
+    sent = time.perf_counter() - started
+
+    answering = asyncio.ensure_future(_answer(fanout))
+    statuses: Counter = Counter()
+    errors: List[str] = []
+    async for outcome in fanout:
+        statuses[outcome.status] += 1
+        if outcome.status == "completed" and len(outcome.result) != stages:
+            errors.append(f"{outcome.dialog_id} completed with {outcome.result}")
+    await answering
+    streamed = time.perf_counter() - started
+
+    if statuses["failed"] != len(failing):
+        errors.append(f"{statuses['failed']} failed sends, expected {len(failing)}")
+    if statuses["completed"] != targets - len(failing):
+        errors.append(
+            f"{statuses['completed']} completed dialogs, expected {targets - len(failing)}"
+        )
+    if sends.peak > concurrency:
+        errors.append(f"{sends.peak} concurrent sends, the limit is {concurrency}")
+
+    return {
+        "targets": targets,
+        "concurrency": concurrency,
+        "peak_sends": sends.peak,
+        "send_seconds": sent,
+        "ideal_seconds": targets * latency / concurrency,
+        "stream_seconds": streamed,
+        "statuses": dict(statuses),
+        "errors": len(errors),
+        "first_errors": errors[:10],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per send")
+    parser.add_argument("--stages", type=int, default=3)
+    parser.add_argument("--fail-every", type=int, default=20, help="every n-th send fails, 0 for none")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(
+        run(args.targets, args.concurrency, args.latency, args.stages, args.fail_every)
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if report["errors"]:
+        print(f"FAIL: {report['errors']} wrong outcomes")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""Measures the import time of dpydialog with `python -X importtime`.
+
+Every scenario runs in fresh interpreters, the reported time is the median of the runs.
+`overhead_ms` is the own time of the modules that a plain `import discord` doesn't
+load, every bot pays for discord.py anyway, so it's what dpydialog adds on top. Run from the repository root:
+
+    $ python -m benchmarks.importtime --runs 7
+
+The run fails (exit code 1) if `from dpydialog import Dialog` loads `discord.ext.commands`,
+and with `--max-overhead-ms` if its overhead exceeds the limit.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Set, Tuple
+
+SCENARIOS = {
+    "package": "import dpydialog",
+    "dialog": "from dpydialog import Dialog",
+    "template": "from dpydialog import DialogTemplate, StageTemplate, DButton, DSelect",
+    "everything": "import dpydialog; [getattr(dpydialog, name) for name in dpydialog.__all__]",
+}
+GUARDED = "dialog"
+REPORT = "import sys; print(sum(name.startswith('dpydialog') for name in sys.modules), 'discord.ext.commands' in sys.modules)"
+
+
+def _run(statement: str) -> Tuple[List[Tuple[int, int, str]], str]:
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"{statement}; {REPORT}"],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    rows = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows, process.stdout.strip()
+
+
+def _modules(statement: str) -> Set[str]:
+    rows, _ = _run(statement)
+    return {name.strip() for _, _, name in rows}
+
+
+def measure_once(statement: str, startup: Set[str], shared: Set[str]) -> Dict[str, Any]:
+    rows, report = _run(statement)
+    total = overhead = 0
+    for self_us, cumulative, name in rows:
+        module = name.strip()
+        if module in startup:
+            continue
+        # Top level imports aren't indented, nested ones are a part of their parent time
+        if name == f" {module}":
+            total += cumulative
+        if module not in shared:
+            overhead += self_us
+
+    modules, commands_loaded = report.split()
+    return {
+        "total_ms": total / 1000,
+        "overhead_ms": overhead / 1000,
+        "modules": int(modules),
+        "commands_loaded": commands_loaded == "True",
+    }
+
+
+def measure(runs: int) -> Dict[str, Any]:
+    startup = _modules("pass")
+    shared = _modules("import discord")
+    report: Dict[str, Any] = {"runs": runs}
+    for scenario, statement in SCENARIOS.items():
+        samples = [measure_once(statement, startup, shared) for _ in range(runs)]
+        report[scenario] = {
+            "total_ms": statistics.median(sample["total_ms"] for sample in samples),
+            "overhead_ms": statistics.median(sample["overhead_ms"] for sample in samples),
+            "modules": samples[-1]["modules"],
+            "commands_loaded": samples[-1]["commands_loaded"],
+        }
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-overhead-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    report = measure(args.runs)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'scenario':>10} {'total_ms':>9} {'overhead_ms':>12} {'modules':>8} {'commands':>9}")
+        for scenario in SCENARIOS:
+            row = report[scenario]
+            print(
+                f"{scenario:>10} {row['total_ms']:>9.2f} {row['overhead_ms']:>12.2f} "
+                f"{row['modules']:>8} {str(row['commands_loaded']):>9}"
+            )
+
+    guarded = report[GUARDED]
+    if guarded["commands_loaded"]:
+        print(f"FAIL: `{SCENARIOS[GUARDED]}` loads discord.ext.commands")
+        return 1
+    limit = args.max_overhead_ms
+    if limit is not None and guarded["overhead_ms"] > limit:
+        print(f"FAIL: `{SCENARIOS[GUARDED]}` adds {guarded['overhead_ms']:.2f} ms > {limit:.2f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Measures the memory kept by live dialogs with tracemalloc.
+
+Every dialog is instantiated from a shared template, sent and its user answers the
+first stage, then the dialog is kept alive. The report has the traced bytes per live
+dialog and the share of them taken by instance `__dict__`s of dpydialog objects.
+Run from the repository root:
+
+    $ python -m benchmarks.memory --dialogs 10000
+
+Use `--max-bytes-per-dialog` to fail (exit code 1) on regressions.
+
+Use `--baseline <git revision>` to measure the dpydialog package of that revision with
+the same benchmark and report both, e.g. the revision before the per-dialog objects
+became slotted:
+
+    $ python -m benchmarks.memory --baseline 85ca059~1
+"""
+import argparse
+import asyncio
+import gc
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+import tracemalloc
+from typing import Any, Dict
+
+from dpydialog import Dialog, DialogTemplate, DSelect
+
+from ..common import build_template, print_report
+from ..fakes import FakeInteraction, FakeMessage, FakeUser, click
+
+
+async def start_dialog(template: DialogTemplate, user_id: int) -> Dialog:
+    user = FakeUser(user_id)
+    message = FakeMessage()
+    start = FakeInteraction(user, message=message)
+
+    dialog = template.instantiate(start, operator_ids=[user_id])
+    await dialog.send()
+
+    view = start.response.calls[-1][1]["view"]
+    select = next(item for item in view.children if isinstance(item, DSelect))
+    await click(select, user, message, ["1"])
+    return dialog
+
+
+def _dict_bytes() -> int:
+    # Instance dicts of the dpydialog objects, slotted objects have none
+    size = 0
+    for obj in gc.get_objects():
+        module = type(obj).__dict__.get("__module__") if not isinstance(obj, type) else None
+        if isinstance(module, str) and module.startswith("dpydialog"):
+            instance_dict = getattr(obj, "__dict__", None)
+            if isinstance(instance_dict, dict):
+                size += sys.getsizeof(instance_dict)
+    return size
+
+
+async def measure(dialogs: int, stages: int) -> Dict[str, Any]:
+    template = build_template(stages)
+    # Warms up the caches of discord.py and the template
+    await start_dialog(template, -1)
+
+    gc.collect()
+    baseline_dicts = _dict_bytes()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        alive = [await start_dialog(template, user_id) for user_id in range(dialogs)]
+        gc.collect()
+        live_bytes = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    dict_bytes = _dict_bytes() - baseline_dicts
+    return {
+        "dialogs": len(alive),
+        "stages": stages,
+        "bytes_per_dialog": live_bytes / len(alive),
+        "dict_bytes_per_dialog": dict_bytes / len(alive),
+    }
+
+
+def measure_revision(revision: str, dialogs: int, stages: int) -> Dict[str, Any]:
+    """Runs this benchmark in a subprocess against the dpydialog package of a git revision."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    archive = subprocess.run(
+        ["git", "archive", revision, "dpydialog"], cwd=root, check=True, capture_output=True
+    ).stdout
+
+    with tempfile.TemporaryDirectory() as directory:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(directory)
+        # The working directory comes first in `sys.path`, so the extracted package is
+        #   imported instead of the checked out one, the benchmarks come from the root
+        paths = [root, os.environ.get("PYTHONPATH")]
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in paths if path))
+        output = subprocess.run(
+            [
+                sys.executable, "-m", "benchmarks.memory",
+                "--dialogs", str(dialogs), "--stages", str(stages), "--json",
+            ],
+            cwd=directory,
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    return json.loads(output)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dialogs", type=int, default=10000)
+    parser.add_argument("--stages", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-bytes-per-dialog", type=float, default=None)
+    parser.add_argument("--baseline", default=None, help="a git revision to compare with")
+    args = parser.parse_args()
+
+    report = asyncio.run(measure(args.dialogs, args.stages))
+    if args.baseline is not None:
+        baseline = measure_revision(args.baseline, args.dialogs, args.stages)
+        report["baseline_bytes_per_dialog"] = baseline["bytes_per_dialog"]
+        report["baseline_dict_bytes_per_dialog"] = baseline["dict_bytes_per_dialog"]
+        report["bytes_ratio"] = report["bytes_per_dialog"] / baseline["bytes_per_dialog"]
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    limit = args.max_bytes_per_dialog
+    if limit is not None and report["bytes_per_dialog"] > limit:
+        print(f"FAIL: {report['bytes_per_dialog']:,.0f} bytes per dialog > {limit:,.0f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
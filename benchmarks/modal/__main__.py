@@ -0,0 +1,87 @@
+"""Compares building and serializing modals from ModalOption lists and from a ModalSchema.
+
+Every iteration builds a five-input support-ticket modal with per-user defaults and
+serializes it, like `send_modal` does. Run from the repository root:
+
+    $ python -m benchmarks.modal --modals 20000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import discord
+
+from dpydialog import DModal, ModalOption, ModalSchema
+
+from ..common import print_report
+
+OPTIONS = [
+    ModalOption("subject", "Subject", max_length=100),
+    ModalOption("order", "Order number", placeholder="#12345", max_length=10),
+    ModalOption("email", "E-mail", required=False),
+    ModalOption("body", "What happened?", style=discord.TextStyle.long, max_length=2000),
+    ModalOption("contact", "How can we reach you?", required=False),
+]
+
+
+async def _noop(interaction: discord.Interaction, modal: DModal) -> None:
+    pass
+
+
+def _timed(build: Callable[[int], DModal], modals: int) -> List[int]:
+    samples = []
+    for user in range(modals):
+        started = time.perf_counter_ns()
+        build(user).to_dict()
+        samples.append(time.perf_counter_ns() - started)
+    return samples
+
+
+def measure(modals: int) -> Dict[str, Any]:
+    schema = ModalSchema(OPTIONS)
+
+    def from_options(user: int) -> DModal:
+        return DModal(_noop, "Support ticket", OPTIONS, defaults={"email": f"user{user}@mail"})
+
+    def from_schema(user: int) -> DModal:
+        return schema.build(_noop, "Support ticket", defaults={"email": f"user{user}@mail"})
+
+    # Warms up both paths, so the first imports and allocations aren't measured
+    _timed(from_options, 100)
+    _timed(from_schema, 100)
+
+    options_ns = statistics.fmean(_timed(from_options, modals))
+    schema_ns = statistics.fmean(_timed(from_schema, modals))
+    return {
+        "modals": modals,
+        "options_us": options_ns / 1000,
+        "schema_us": schema_ns / 1000,
+        "speedup": options_ns / schema_ns,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modals", type=int, default=20000)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--min-speedup", type=float, default=None)
+    args = parser.parse_args()
+
+    report = measure(args.modals)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.min_speedup is not None and report["speedup"] < args.min_speedup:
+        print(f"FAIL: speedup {report['speedup']:.2f}x < {args.min_speedup:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
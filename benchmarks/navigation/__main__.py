@@ -0,0 +1,189 @@
+"""Measures the overhead of dialog navigation with fake interactions.
+
+Every dialog is sent, then its user walks through all stages with one BACK click on the
+second stage. A stage is also rebuilt after its callbacks changed, to check the
+rebuilt view calls the new ones. Run from the repository root:
+
+    $ python -m benchmarks.navigation --dialogs 10000 --stages 5
+
+Use `--min-clicks-per-sec` and `--max-p99-us` to fail (exit code 1) on regressions.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import discord
+
+from dpydialog import DButton, DialogTemplate, DSelect, Stage, StageAction
+
+from ..common import OPTIONS, build_template, find, percentile, print_report
+from ..fakes import FakeInteraction, FakeMessage, FakeUser, click
+
+
+async def _on_success(interaction: discord.Interaction, result: Dict[str, Any]) -> None:
+    await interaction.response.edit_message(content="Done", view=None)
+
+
+async def run_dialog(
+    template: DialogTemplate,
+    user_id: int,
+    stages: int,
+    on_click: Any,
+) -> None:
+    user = FakeUser(user_id)
+    message = FakeMessage()
+    start = FakeInteraction(user, message=message)
+
+    dialog = template.instantiate(start, operator_ids=[user_id])
+    await dialog.send()
+    view = start.response.calls[-1][1]["view"]
+
+    plan: List[str] = []
+    for index in range(stages):
+        plan.append("next")
+        if index == 1:
+            plan.extend(["back", "next"])
+
+    for step in plan:
+        if step == "next":
+            item, values = find(view, DSelect), ["1"]
+        else:
+            item, values = find(view, DButton, "Back"), ()
+
+        interaction = await on_click(item, user, message, values)
+        view = interaction.response.calls[-1][1].get("view")
+
+
+async def check_rebuild() -> List[str]:
+    """Rebuilds a stage view after every callback change and clicks its components."""
+    called: List[str] = []
+
+    def _callback(name: str) -> Any:
+        async def callback(interaction: discord.Interaction, _: Any) -> None:
+            called.append(name)
+
+        return callback
+
+    stage = Stage(
+        keyname="stage",
+        components=[
+            DButton(label="Back", action=StageAction.BACK),
+            DButton(label="Close", action=StageAction.CLOSE),
+            DSelect(options=OPTIONS, action=StageAction.NEXT),
+        ],
+    )
+    user = FakeUser(1)
+    message = FakeMessage()
+    errors: List[str] = []
+
+    for name in ("first", "second"):
+        stage.set_back_callback(_callback(f"{name} back"))
+        stage.set_close_callback(_callback(f"{name} close"))
+        stage.set_next_callback(_callback(f"{name} next"))
+        view = stage.get_components().view
+
+        for item, values, expected in (
+            (find(view, DButton, "Back"), (), f"{name} back"),
+            (find(view, DButton, "Close"), (), f"{name} close"),
+            (find(view, DSelect), ["1"], f"{name} next"),
+        ):
+            del called[:]
+            await click(item, user, message, values)
+            if called != [expected]:
+                errors.append(f"the rebuilt view called {called}, expected {expected!r}")
+    return errors
+
+
+async def measure_latency(dialogs: int, stages: int) -> Dict[str, float]:
+    template = build_template(stages, on_success=_on_success)
+    latencies: List[int] = []
+
+    async def timed_click(*args: Any) -> FakeInteraction:
+        started = time.perf_counter_ns()
+        interaction = await click(*args)
+        latencies.append(time.perf_counter_ns() - started)
+        return interaction
+
+    started = time.perf_counter()
+    for user_id in range(dialogs):
+        await run_dialog(template, user_id, stages, timed_click)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "dialogs": dialogs,
+        "stages": stages,
+        "clicks": len(latencies),
+        "clicks_per_sec": len(latencies) / elapsed,
+        "p50_us": percentile(latencies, 50) / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+        "mean_us": statistics.fmean(latencies) / 1000,
+    }
+
+
+async def measure_allocations(dialogs: int, stages: int) -> Dict[str, float]:
+    template = build_template(stages, on_success=_on_success)
+    peaks: List[int] = []
+
+    async def traced_click(*args: Any) -> FakeInteraction:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        interaction = await click(*args)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        return interaction
+
+    tracemalloc.start()
+    try:
+        snapshot = tracemalloc.take_snapshot()
+        for user_id in range(dialogs):
+            await run_dialog(template, user_id, stages, traced_click)
+        diff = tracemalloc.take_snapshot().compare_to(snapshot, "filename")
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "traced_clicks": len(peaks),
+        "peak_bytes_per_click": statistics.fmean(peaks),
+        "retained_blocks_per_click": sum(stat.count_diff for stat in diff) / len(peaks),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dialogs", type=int, default=10000)
+    parser.add_argument("--stages", type=int, default=5)
+    parser.add_argument("--traced-dialogs", type=int, default=200)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--min-clicks-per-sec", type=float, default=None)
+    parser.add_argument("--max-p99-us", type=float, default=None)
+    args = parser.parse_args()
+
+    report = asyncio.run(measure_latency(args.dialogs, args.stages))
+    report.update(asyncio.run(measure_allocations(args.traced_dialogs, args.stages)))
+    rebuild_errors = asyncio.run(check_rebuild())
+    report["rebuild_errors"] = len(rebuild_errors)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    failed = False
+    if rebuild_errors:
+        print(f"FAIL: {rebuild_errors[0]}")
+        failed = True
+    if args.min_clicks_per_sec is not None and report["clicks_per_sec"] < args.min_clicks_per_sec:
+        print(f"FAIL: {report['clicks_per_sec']:.0f} clicks/sec < {args.min_clicks_per_sec:.0f}")
+        failed = True
+    if args.max_p99_us is not None and report["p99_us"] > args.max_p99_us:
+        print(f"FAIL: p99 {report['p99_us']:.1f} us > {args.max_p99_us:.1f} us")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""Measures the build time and the lookup latency of a SearchIndex over a synthetic catalog.
+
+Queries are prefixes of the catalog words and misspelled words, which fall back to the
+fuzzy index. Run from the repository root:
+
+    $ python -m benchmarks.search --entries 20000 --queries 2000
+
+Use `--max-p99-us` to fail (exit code 1) on regressions.
+"""
+import argparse
+import json
+import random
+import statistics
+import string
+import sys
+import time
+from typing import Dict, List
+
+from dpydialog import SearchIndex
+
+from ..common import percentile, print_report
+
+
+def build_catalog(entries: int, rng: random.Random) -> List[str]:
+    words = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(max(10, entries // 7))
+    ]
+    return [
+        " ".join(rng.choice(words) for _ in range(3)).title() + f" #{number}"
+        for number in range(entries)
+    ]
+
+
+def build_queries(catalog: List[str], queries: int, rng: random.Random) -> List[str]:
+    result = []
+    for label in rng.sample(catalog, min(queries, len(catalog))):
+        word = rng.choice(label.split()[:3])
+        if rng.random() < 0.5:
+            result.append(word[: rng.randint(1, len(word))])
+        else:
+            # Swapped letters only match through the trigram index
+            position = rng.randrange(len(word) - 1)
+            result.append(
+                word[:position] + word[position + 1] + word[position] + word[position + 2 :]
+            )
+    return result
+
+
+def measure(entries: int, queries: int, seed: int) -> Dict[str, float]:
+    rng = random.Random(seed)
+    catalog = build_catalog(entries, rng)
+
+    started = time.perf_counter()
+    index = SearchIndex(catalog, cache_size=0)
+    build_seconds = time.perf_counter() - started
+
+    latencies: List[int] = []
+    matches: List[int] = []
+    for query in build_queries(catalog, queries, rng):
+        started = time.perf_counter_ns()
+        found = index.search(query)
+        latencies.append(time.perf_counter_ns() - started)
+        matches.append(len(found))
+
+    return {
+        "entries": entries,
+        "queries": len(latencies),
+        "build_ms": build_seconds * 1000,
+        "p50_us": percentile(latencies, 50) / 1000,
+        "p99_us": percentile(latencies, 99) / 1000,
+        "mean_us": statistics.fmean(latencies) / 1000,
+        "mean_matches": statistics.fmean(matches),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--max-p99-us", type=float, default=None)
+    args = parser.parse_args()
+
+    report = measure(args.entries, args.queries, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if args.max_p99_us is not None and report["p99_us"] > args.max_p99_us:
+        print(f"FAIL: p99 {report['p99_us']:.1f} us > {args.max_p99_us:.1f} us")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
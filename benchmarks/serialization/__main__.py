@@ -0,0 +1,123 @@
+"""Measures the size and the speed of the dialog state encodings.
+
+Every state holds a typical result: user and role select values (discord objects),
+select option values and a few numbers. The report compares the JSON and the msgpack
+form of the states, and the time to encode, decode and read a restored result lazily.
+Run from the repository root:
+
+    $ python -m benchmarks.serialization --states 5000
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import discord
+
+from dpydialog import DialogState, LazyResult
+from dpydialog.serialization import from_json, to_json
+
+from ..common import print_report
+
+
+def _snowflake(rng: random.Random) -> int:
+    return rng.randrange(10**17, 2 * 10**18)
+
+
+def _discord_object(cls: type, object_id: int) -> Any:
+    # The result only needs the class and the ID, the rest of the object isn't read
+    obj = cls.__new__(cls)
+    obj.id = object_id
+    return obj
+
+
+def build_states(count: int, seed: int) -> List[DialogState]:
+    rng = random.Random(seed)
+    states = []
+    for index in range(count):
+        result = {
+            "users": [_discord_object(discord.User, _snowflake(rng)) for _ in range(3)],
+            "roles": [_discord_object(discord.Role, _snowflake(rng)) for _ in range(2)],
+            "color": [rng.choice(["red", "green", "blue"])],
+            "amount": rng.randrange(1000),
+        }
+        states.append(
+            DialogState(
+                dialog_id=f"{index:032x}",
+                template_name="add-roles",
+                stage_index=3,
+                result=result,
+                operator_ids=[_snowflake(rng)],
+                history=[0, 1, 2],
+            )
+        )
+    return states
+
+
+def _timed(function: Callable[[Any], Any], items: List[Any]) -> Tuple[List[Any], float]:
+    started = time.perf_counter()
+    results = [function(item) for item in items]
+    return results, (time.perf_counter() - started) / len(items) * 1e6
+
+
+def run(states: int, seed: int) -> Dict[str, Any]:
+    dialog_states = build_states(states, seed)
+
+    encoded_json, json_encode_us = _timed(lambda state: to_json(state.to_dict()), dialog_states)
+    encoded_binary, binary_encode_us = _timed(DialogState.to_bytes, dialog_states)
+    decoded_json, json_decode_us = _timed(
+        lambda data: DialogState.from_dict(from_json(data)), encoded_json
+    )
+    decoded_binary, binary_decode_us = _timed(DialogState.from_bytes, encoded_binary)
+
+    errors = sum(
+        1
+        for state, from_text, from_binary in zip(dialog_states, decoded_json, decoded_binary)
+        if not state.to_dict() == from_text.to_dict() == from_binary.to_dict()
+    )
+
+    # A restored dialog usually reads one stage value, the other ones stay reduced
+    _, lazy_us = _timed(
+        lambda state: LazyResult(state.result)["color"] and state, decoded_binary
+    )
+
+    json_bytes = sum(len(data.encode()) for data in encoded_json)
+    binary_bytes = sum(len(data) for data in encoded_binary)
+    return {
+        "states": states,
+        "json_bytes_per_state": json_bytes / states,
+        "msgpack_bytes_per_state": binary_bytes / states,
+        "msgpack_size_ratio": binary_bytes / json_bytes,
+        "json_encode_us": json_encode_us,
+        "msgpack_encode_us": binary_encode_us,
+        "json_decode_us": json_decode_us,
+        "msgpack_decode_us": binary_decode_us,
+        "lazy_read_us": lazy_us,
+        "errors": errors,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--states", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.states, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+    if report["errors"]:
+        print(f"FAIL: {report['errors']} states changed after a round trip")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,149 @@
 __all__ = [
     'Dialog',
     'DialogController',
+    'MessageDialogController',
+    'ChannelRateLimiter',
+    'DialogTemplate',
+    'DialogFanOut',
+    'DialogResultStream',
+    'CheckpointWriter',
+    'DialogPersistence',
+    'DialogRegistry',
+    'StageGraph',
+    'DialogObserver',
+    'MetricsObserver',
     'DButton',
     'DRoleSelect',
     'DUserSelect',
     'DSelect',
     'DModal',
+    'ModalSchema',
     'Stage',
+    'StageTemplate',
+    'PaginatedSelectStage',
+    'OptionProvider',
+    'SearchableSelectStage',
+    'SearchIndex',
+    'FormStage',
+    'ModalStage',
     'StageComponents',
     'StageAction',
-    'ModalOption'
+    'ModalOption',
+    'OperatorRules',
+    'Branch',
+    'DialogState',
+    'RegistryStats',
+    'RenderStats',
+    'DialogResult',
+    'StageCheckpoint',
+    'FanOutResult',
+    'LazyResult',
+    'MemoryDialogStateStore',
+    'FileDialogStateStore',
+    'SQLiteDialogStateStore',
+    'MemoryCheckpointSink',
+    'SQLiteCheckpointSink'
 ]
 
-from .classes.dialog import Dialog
-from .classes.controller import DialogController
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from .classes.components.button import DButton
-from .classes.components.role_select import DRoleSelect
-from .classes.components.user_select import DUserSelect
-from .classes.components.select import DSelect
-from .classes.components.modal import DModal
+# Exported name -> the module defining it. Modules are imported on the first access,
+#   so `from dpydialog import Dialog` doesn't load the stages, the storages or the search.
+_LAZY_IMPORTS: Dict[str, str] = {
+    'Dialog': '.classes.dialog',
+    'DialogController': '.classes.controller',
+    'MessageDialogController': '.classes.controller',
+    'ChannelRateLimiter': '.classes.ratelimit',
+    'DialogTemplate': '.classes.template',
+    'DialogFanOut': '.classes.fanout',
+    'DialogResultStream': '.classes.stream',
+    'CheckpointWriter': '.classes.checkpoint',
+    'DialogPersistence': '.classes.persistence',
+    'DialogRegistry': '.classes.registry',
+    'StageGraph': '.classes.graph',
+    'DialogObserver': '.classes.observer',
+    'MetricsObserver': '.classes.metrics',
+    'DButton': '.classes.components.button',
+    'DRoleSelect': '.classes.components.role_select',
+    'DUserSelect': '.classes.components.user_select',
+    'DSelect': '.classes.components.select',
+    'DModal': '.classes.components.modal',
+    'ModalSchema': '.classes.components.modal',
+    'Stage': '.classes.stages.stage',
+    'StageTemplate': '.classes.stages.template',
+    'PaginatedSelectStage': '.classes.stages.paginated',
+    'OptionProvider': '.classes.pagination',
+    'SearchableSelectStage': '.classes.stages.searchable',
+    'SearchIndex': '.classes.search',
+    'FormStage': '.classes.stages.form',
+    'ModalStage': '.classes.stages.modal',
+    'MemoryDialogStateStore': '.classes.storage.memory',
+    'FileDialogStateStore': '.classes.storage.file',
+    'SQLiteDialogStateStore': '.classes.storage.sqlite',
+    'MemoryCheckpointSink': '.classes.storage.memory',
+    'SQLiteCheckpointSink': '.classes.storage.sqlite',
+    'StageComponents': '.data',
+    'StageAction': '.data',
+    'ModalOption': '.data',
+    'OperatorRules': '.data',
+    'Branch': '.data',
+    'DialogState': '.data',
+    'RegistryStats': '.data',
+    'RenderStats': '.data',
+    'DialogResult': '.data',
+    'StageCheckpoint': '.data',
+    'FanOutResult': '.data',
+    'LazyResult': '.serialization',
+}
 
-from .classes.stages.stage import Stage
 
-from .data import StageComponents, StageAction, ModalOption
+def __getattr__(name: str) -> Any:
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted({*globals(), *__all__})
+
+
+if TYPE_CHECKING:
+    from .classes.dialog import Dialog
+    from .classes.controller import DialogController, MessageDialogController
+    from .classes.ratelimit import ChannelRateLimiter
+    from .classes.template import DialogTemplate
+    from .classes.fanout import DialogFanOut
+    from .classes.stream import DialogResultStream
+    from .classes.checkpoint import CheckpointWriter
+    from .classes.persistence import DialogPersistence
+    from .classes.registry import DialogRegistry
+    from .classes.graph import StageGraph
+    from .classes.observer import DialogObserver
+    from .classes.metrics import MetricsObserver
+
+    from .classes.components.button import DButton
+    from .classes.components.role_select import DRoleSelect
+    from .classes.components.user_select import DUserSelect
+    from .classes.components.select import DSelect
+    from .classes.components.modal import DModal, ModalSchema
+
+    from .classes.stages.stage import Stage
+    from .classes.stages.template import StageTemplate
+    from .classes.stages.paginated import PaginatedSelectStage
+    from .classes.pagination import OptionProvider
+    from .classes.stages.searchable import SearchableSelectStage
+    from .classes.search import SearchIndex
+    from .classes.stages.form import FormStage
+    from .classes.stages.modal import ModalStage
+
+    from .classes.storage.memory import MemoryDialogStateStore, MemoryCheckpointSink
+    from .classes.storage.file import FileDialogStateStore
+    from .classes.storage.sqlite import SQLiteDialogStateStore, SQLiteCheckpointSink
+
+    from .data import StageComponents, StageAction, ModalOption, OperatorRules, Branch, DialogState, RegistryStats, RenderStats, DialogResult, StageCheckpoint, FanOutResult
+    from .serialization import LazyResult
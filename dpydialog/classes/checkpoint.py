@@ -0,0 +1,146 @@
+import asyncio
+from collections import deque
+from typing import Deque, List, Optional
+
+from ..data import StageCheckpoint
+from ..interfaces.isink import ICheckpointSink
+
+
+class CheckpointWriter:
+    """Collects the stage checkpoints of dialogs and writes them to a sink in batches.
+
+    Dialogs record a checkpoint every time a stage is completed, see
+    `Dialog.set_checkpoint_writer` and the `checkpoint_writer` of `DialogTemplate`.
+    Recording never waits: checkpoints are queued in memory and written by a
+    background flush once `batch_size` of them are queued or `flush_interval`
+    seconds after the first queued one. Flushes don't overlap, so the sink gets
+    the batches in order.
+
+    A failed write is retried by the next flush. At most `max_pending` checkpoints
+    are kept, the oldest ones are dropped first while the sink is failing.
+
+    Args:
+        sink (ICheckpointSink): Stores the batches.
+        batch_size (int, optional): The number of checkpoints written at once. Defaults to 100.
+        flush_interval (float, optional): The longest time a checkpoint is queued, in seconds. Defaults to 1.0.
+        max_pending (int, optional): The number of queued checkpoints kept. Defaults to 10000.
+
+    Raises:
+        ValueError: When `batch_size` is less than 1, `max_pending` is less than
+            `batch_size` or `flush_interval` isn't positive.
+    """
+
+    __slots__ = (
+        "_sink",
+        "_batch_size",
+        "_flush_interval",
+        "_max_pending",
+        "_pending",
+        "_timer",
+        "_flushing",
+        "written",
+        "dropped",
+        "failures",
+    )
+
+    def __init__(
+        self,
+        sink: ICheckpointSink,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+    ):
+        if batch_size < 1 or max_pending < batch_size:
+            raise ValueError("Expected 1 <= batch_size <= max_pending.")
+        if flush_interval <= 0:
+            raise ValueError("The flush interval must be positive.")
+
+        self._sink = sink
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending: Deque[StageCheckpoint] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional["asyncio.Future[None]"] = None
+
+        self.written = 0
+        self.dropped = 0
+        self.failures = 0
+
+    def __len__(self) -> int:
+        """Returns the number of checkpoints waiting to be written."""
+        return len(self._pending)
+
+    def record(self, checkpoint: StageCheckpoint) -> None:
+        """Queues the checkpoint, the write happens in the background."""
+        self._pending.append(checkpoint)
+        if len(self._pending) > self._max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+
+        if len(self._pending) >= self._batch_size:
+            self._start_flush(drain=False)
+        elif self._timer is None and self._flushing is None:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        self._timer = asyncio.get_running_loop().call_later(
+            self._flush_interval, self._start_flush, True
+        )
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _start_flush(self, drain: bool) -> None:
+        self._cancel_timer()
+        if self._flushing is None and self._pending:
+            self._flushing = asyncio.ensure_future(self._write(drain))
+            self._flushing.add_done_callback(self._flush_done)
+
+    def _flush_done(self, future: "asyncio.Future[None]") -> None:
+        self._flushing = None
+        failed = not future.cancelled() and future.exception() is not None
+
+        # After a failure the sink gets the flush interval to recover
+        if len(self._pending) >= self._batch_size and not failed:
+            self._start_flush(drain=False)
+        elif self._pending and self._timer is None:
+            self._schedule_flush()
+
+    async def _write(self, drain: bool) -> None:
+        """Writes the full batches, or all queued checkpoints if `drain` is True."""
+        while self._pending and (drain or len(self._pending) >= self._batch_size):
+            count = min(len(self._pending), self._batch_size)
+            batch: List[StageCheckpoint] = [self._pending.popleft() for _ in range(count)]
+            try:
+                await self._sink.write(batch)
+            except Exception:
+                # Retried by the next flush, ahead of the newer checkpoints
+                self.failures += 1
+                self._pending.extendleft(reversed(batch))
+                while len(self._pending) > self._max_pending:
+                    self._pending.popleft()
+                    self.dropped += 1
+                raise
+            self.written += count
+
+    async def flush(self) -> None:
+        """Writes all queued checkpoints, e.g. before the bot shuts down.
+
+        Raises:
+            Exception: The error of the sink, when a write fails.
+        """
+        while self._flushing is not None:
+            try:
+                await asyncio.shield(self._flushing)
+            except Exception:
+                pass  # Retried below
+
+        self._cancel_timer()
+        if not self._pending:
+            return
+        self._flushing = asyncio.ensure_future(self._write(drain=True))
+        self._flushing.add_done_callback(self._flush_done)
+        await asyncio.shield(self._flushing)
@@ -1,35 +1,182 @@
-from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+import copy
+import inspect
+import os
+from typing import Any, Awaitable, Callable, Dict, FrozenSet, Iterable, Optional, Sequence
 
 import discord
 
+from ...data import OperatorRules, StageAction
+from ...errors import NotAllowedToInteract, ShouldBeCoroutine, StageActionOutsideDialog
 from ...interfaces.icomponent import IComponent
+from ...utils import get_slot_names
+
+_UNRESTRICTED = OperatorRules()
+_MISSING = object()
+# The mutable lists of the underlying discord.py components, set through the item setters
+_CLONED_LISTS = ("options", "default_values")
+
+
+def _copy_state(obj: Any) -> Any:
+    # A shallow copy without `copy.copy`, the slot names of every class are resolved once
+    cls = type(obj)
+    new = cls.__new__(cls)
+    state = getattr(obj, "__dict__", None)
+    if state is not None:
+        new.__dict__.update(state)
+    for name in get_slot_names(cls):
+        value = getattr(obj, name, _MISSING)
+        if value is not _MISSING:
+            object.__setattr__(new, name, value)
+    return new
 
 
 class BaseComponent(IComponent):
-    _extras: Optional[Dict[str, Any]] = None
-    _parent_keyname: Optional[str] = None
-    _operator_ids: Optional[Sequence[int]] = None
-    _on_error: Callable[[discord.Interaction, Any], Awaitable[None]] = None
+    # Slots would conflict with the slotted layout of discord.py selects,
+    #   the attributes are set per instance by `_init_component` instead.
+    __slots__ = ()
+
+    def _init_component(
+        self,
+        action: Any,
+        extras: Optional[Dict[str, Any]],
+        operator_ids: Optional[Iterable[int]] = None,
+        on_error_callback: Optional[Callable[[discord.Interaction, Any], Awaitable[None]]] = None,
+    ) -> None:
+        self._extras = extras
+        self._parent_keyname: Optional[str] = None
+        self._operator_rules = (
+            _UNRESTRICTED if operator_ids is None else OperatorRules(user_ids=operator_ids)
+        )
+        # The rules of the stage only narrow the component rules, the click checks both
+        self._stage_rules = _UNRESTRICTED
+        self._allowed = self._operator_rules
+        self._on_error = on_error_callback
+        self._denied_hook: Optional[Callable[[discord.Interaction], None]] = None
+        # Kept apart from `_action`, which a `Stage` replaces with the resolved callback
+        self._stage_action = action if isinstance(action, StageAction) else None
+        self._replace_function(action)
 
     def get_extras(self) -> Optional[Dict[str, Any]]:
         return self._extras
 
+    def _clone(self) -> "BaseComponent":
+        """Copies the prototype for another stage.
+
+        The resolved constructor state (labels, emoji, operator rules) is shared with the
+        prototype. The options and default values are copied, so a clone can change them
+        (e.g. with `append_option`), and the per-dialog state is reset: the view, the
+        callbacks and rules set by a `Stage` and the random custom ID.
+        """
+        underlying = getattr(self, "_underlying", None)
+        if underlying is None:
+            # Not laid out like a discord.py item, built from the constructor arguments instead
+            clone = type(self)(**self._init_kwargs)
+            clone._init_kwargs = self._init_kwargs
+            return clone
+
+        clone = _copy_state(self)
+        # Setters such as `custom_id` and `options` write through to the underlying component
+        clone._underlying = _copy_state(underlying)
+        clone._view = None
+        clone._parent = None
+        clone._rendered_row = None
+        clone._parent_keyname = None
+        clone._denied_hook = None
+        clone._stage_rules = _UNRESTRICTED
+        clone._allowed = self._operator_rules
+        for name in _CLONED_LISTS:
+            values = getattr(underlying, name, None)
+            if values:
+                setattr(clone, name, [copy.copy(value) for value in values])
+        clone._replace_function(self._init_kwargs["action"])
+        if not self._provided_custom_id and underlying.custom_id is not None:
+            clone.custom_id = os.urandom(16).hex()
+            clone._provided_custom_id = False
+        return clone
+
     def set_extras(self, extras: Dict[str, Any]) -> None:
         self._extras = extras
 
+    def get_action(self) -> Any:
+        return self._action
+
+    def _get_stage_action(self) -> Optional[StageAction]:
+        return self._stage_action
+
+    def _replace_function(self, function: Any) -> None:
+        # The action is checked once here, a click only awaits the resolved dispatcher
+        self._action = function
+        if isinstance(function, StageAction):
+            self._dispatch = self._raise_stage_action
+        elif not inspect.iscoroutinefunction(function):
+            self._dispatch = self._raise_not_coroutine
+        else:
+            self._dispatch = function
+
+    async def _raise_stage_action(self, interaction: discord.Interaction, _) -> None:
+        raise StageActionOutsideDialog(
+            "You should not use the `StageAction` as "
+            "`action` outside of the `Stage` class.",
+            stage_keyname=self._parent_keyname,
+        )
+
+    async def _raise_not_coroutine(self, interaction: discord.Interaction, _) -> None:
+        raise ShouldBeCoroutine(stage_keyname=self._parent_keyname)
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        if self._allowed.allows(interaction):
+            await self._dispatch(interaction, self)
+        else:
+            await self._deny(interaction)
+
     def _set_keyname(self, keyname: str) -> None:
         self._parent_keyname = keyname
 
     def get_keyname(self) -> Optional[str]:
         return self._parent_keyname
 
-    def set_operator_ids(self, ids: Sequence[int]) -> None:
-        self._operator_ids = ids
+    def set_operator_ids(self, ids: Optional[Sequence[int]]) -> None:
+        self.set_operator_rules(self._operator_rules.with_user_ids(ids))
+
+    def get_operator_ids(self) -> Optional[FrozenSet[int]]:
+        return self._operator_rules.user_ids
+
+    def set_operator_rules(self, rules: OperatorRules) -> None:
+        self._operator_rules = rules
+        self._allowed = rules.intersect(self._stage_rules)
+
+    def _set_stage_rules(self, rules: OperatorRules) -> None:
+        self._stage_rules = rules
+        self._allowed = self._operator_rules.intersect(rules)
 
-    def get_operator_ids(self) -> Optional[Sequence[int]]:
-        return self._operator_ids
+    def get_operator_rules(self) -> OperatorRules:
+        return self._operator_rules
+
+    def _set_denied_hook(
+        self, hook: Optional[Callable[[discord.Interaction], None]]
+    ) -> None:
+        self._denied_hook = hook
 
     def set_error_callback(
         self, callback: Callable[[discord.Interaction, Any], Awaitable[None]]
     ) -> None:
         self._on_error = callback
+
+    async def _deny(self, interaction: discord.Interaction) -> None:
+        """Reports an interaction of a user the operator rules don't allow.
+
+        Raises:
+            NotAllowedToInteract: If there is no error callback.
+        """
+        if self._denied_hook is not None:
+            self._denied_hook(interaction)
+
+        err = NotAllowedToInteract(
+            "The current user is not allowed to interact with the component.",
+            allowed_ids=self._allowed.user_ids,
+            user_id=interaction.user.id,
+            stage_keyname=self._parent_keyname,
+        )
+        if self._on_error:
+            return await self._on_error(interaction, err)
+        raise err
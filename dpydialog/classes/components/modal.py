@@ -1,4 +1,4 @@
-from typing import Any, Awaitable, Callable, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
 
 import discord
 
@@ -9,6 +9,109 @@ from ...data import ModalOption
 CallbackType = Callable[[discord.Interaction, discord.ui.Modal], Awaitable[None]]
 
 
+class ModalSchema:
+    """Precompiled, immutable inputs of a `DModal`.
+
+    The options are validated once, then every option gets its `TextInput` arguments
+    and a serialized component payload. A modal built from the schema creates the inputs
+    from the prepared arguments, and sends the cached payload with only the per-user
+    defaults patched in. The custom ID of every input is its `varname`.
+
+    Build the schema once (e.g. at import time) and share it between modals. Change
+    the text of the inputs with `defaults`, changing their other attributes isn't
+    reflected in the cached payload.
+
+    Args:
+        options (Sequence[ModalOption]): The inputs of the modal, at most 5.
+
+    Raises:
+        ValueError: When there are no options or more than 5 of them, a varname is repeated,
+            isn't an identifier or clashes with a `DModal` attribute, or a length limit is invalid.
+    """
+
+    __slots__ = ("_options", "_input_kwargs", "_payload", "_indexes")
+
+    def __init__(self, options: Sequence[ModalOption]):
+        if not 1 <= len(options) <= 5:
+            raise ValueError("A modal must have between 1 and 5 options.")
+
+        self._options: Tuple[ModalOption, ...] = tuple(options)
+        self._indexes: Dict[str, int] = {}
+        for index, option in enumerate(self._options):
+            self._check_option(option)
+            self._indexes[option.varname] = index
+
+        self._input_kwargs: Tuple[Dict[str, Any], ...] = tuple(
+            dict(option.to_dict(), custom_id=option.varname) for option in self._options
+        )
+        self._payload: Tuple[Dict[str, Any], ...] = tuple(
+            {"type": 1, "components": [discord.ui.TextInput(**kwargs).to_component_dict()]}
+            for kwargs in self._input_kwargs
+        )
+
+    def _check_option(self, option: ModalOption) -> None:
+        varname = option.varname
+        if not varname.isidentifier() or hasattr(DModal, varname):
+            raise ValueError(
+                f"The '{varname}' varname must be an identifier that isn't a `DModal` attribute."
+            )
+        if varname in self._indexes:
+            raise ValueError(f"The '{varname}' varname is used by several options.")
+        if not 1 <= len(option.label) <= 45:
+            raise ValueError(f"The label of the '{varname}' option must be 1-45 characters long.")
+        if option.placeholder is not None and len(option.placeholder) > 100:
+            raise ValueError(f"The placeholder of the '{varname}' option is longer than 100 characters.")
+
+        min_length = option.min_length or 0
+        max_length = 4000 if option.max_length is None else option.max_length
+        if not 0 <= min_length <= max_length or not 1 <= max_length <= 4000:
+            raise ValueError(
+                f"The '{varname}' option must have 0 <= min_length <= max_length <= 4000."
+            )
+
+    def get_options(self) -> Tuple[ModalOption, ...]:
+        return self._options
+
+    def build(
+        self,
+        action: CallbackType,
+        title: str,
+        defaults: Optional[Mapping[str, Optional[str]]] = None,
+        **kwargs: Any,
+    ) -> "DModal":
+        """Creates a `DModal` with the schema inputs, see `DModal` for the arguments."""
+        return DModal(action=action, title=title, options=self, defaults=defaults, **kwargs)
+
+    def _make_inputs(
+        self, defaults: Optional[Mapping[str, Optional[str]]]
+    ) -> List[discord.ui.TextInput]:
+        all_kwargs = self._input_kwargs
+        if defaults:
+            all_kwargs = list(all_kwargs)
+            for varname, default in defaults.items():
+                index = self._indexes.get(varname)
+                if index is not None:
+                    all_kwargs[index] = dict(all_kwargs[index], default=default)
+        return [discord.ui.TextInput(**kwargs) for kwargs in all_kwargs]
+
+    def _make_payload(
+        self, defaults: Optional[Mapping[str, Optional[str]]]
+    ) -> List[Dict[str, Any]]:
+        payload = list(self._payload)
+        for varname, default in (defaults or {}).items():
+            index = self._indexes.get(varname)
+            if index is None:
+                continue
+
+            component = dict(payload[index]["components"][0])
+            if default is None:
+                component.pop("value", None)
+            else:
+                component["value"] = default
+            payload[index] = {"type": 1, "components": [component]}
+        return payload
+
+
 class DModal(BaseComponent, discord.ui.Modal):
     """A Modal component class that extends both BaseComponent and discord.ui.Modal.
 
@@ -19,10 +122,13 @@ class DModal(BaseComponent, discord.ui.Modal):
         action (CallbackType): A callable that will be executed when the modal is submitted.
             The callback should accept two parameters: interaction and the modal instance.
         title (str): The title of the modal dialog.
-        options (List[ModalOption]): A list of ModalOption objects defining the text input fields.
+        options (Union[List[ModalOption], ModalSchema]):
+            A list of ModalOption objects defining the text input fields, or a precompiled schema.
         custom_id (Optional[str], optional): A custom identifier for the modal. Defaults to discord.utils.MISSING.
         timeout (float, optional): The time in seconds before the modal times out. Defaults to 180.0.
         extras (Dict[str, Any], optional): Additional data to be stored with the modal. Defaults to None.
+        defaults (Optional[Mapping[str, Optional[str]]], optional):
+            Varname -> the prefilled text, overrides `ModalOption.default`. Defaults to None.
 
     Raises:
         ValueError: If the provided action is not callable.
@@ -32,30 +138,66 @@ class DModal(BaseComponent, discord.ui.Modal):
         self,
         action: CallbackType,
         title: str,
-        options: List[ModalOption],
+        options: Union[List[ModalOption], ModalSchema],
         custom_id: Optional[str] = discord.utils.MISSING,
         timeout: float = 180.0,
         extras: Dict[str, Any] = None,
+        defaults: Optional[Mapping[str, Optional[str]]] = None,
     ):
-        self._action = action
-        self._extras = extras
-
-        if not callable(self._action):
-            raise ValueError(f"The Modal component only support callable action.")
+        self._init_component(action, extras)
+        self._init_kwargs = dict(
+            action=action,
+            title=title,
+            options=options,
+            custom_id=custom_id,
+            timeout=timeout,
+            extras=extras,
+            defaults=defaults,
+        )
 
         super().__init__(title=title, timeout=timeout, custom_id=custom_id)
 
-        for option in options:
-            text_input = discord.ui.TextInput(**option.to_dict())
-            setattr(self, option.varname, text_input)
+        self._schema: Optional[ModalSchema] = None
+        self._defaults = defaults
+        self._inputs: Dict[str, discord.ui.TextInput] = {}
+        if isinstance(options, ModalSchema):
+            self._schema = options
+            self._options = options.get_options()
+            text_inputs = options._make_inputs(defaults)
+        else:
+            self._options = options
+            text_inputs = []
+            for option in options:
+                kwargs = option.to_dict()
+                if defaults and option.varname in defaults:
+                    kwargs["default"] = defaults[option.varname]
+                text_inputs.append(discord.ui.TextInput(**kwargs))
+
+        for option, text_input in zip(self._options, text_inputs):
+            # Varnames clashing with the modal attributes are only available in `get_values`
+            if not hasattr(type(self), option.varname):
+                setattr(self, option.varname, text_input)
+            self._inputs[option.varname] = text_input
             self.add_item(text_input)
 
+    def get_options(self) -> Sequence[ModalOption]:
+        return self._options
+
+    def get_values(self) -> Dict[str, str]:
+        """Returns the submitted text of every input by its `varname`."""
+        return {varname: text_input.value for varname, text_input in self._inputs.items()}
+
+    def to_components(self) -> List[Dict[str, Any]]:
+        if self._schema is not None:
+            return self._schema._make_payload(self._defaults)
+        return super().to_components()
+
     def get_action(self) -> CallbackType:
         return self._action
 
     def _replace_function(self, function: CallbackType) -> None:
-        if not callable(self._action):
-            raise ValueError(f"The Modal component only support callable action.")
+        if not callable(function):
+            raise ValueError("The Modal component only support callable action.")
 
         self._action = function
 
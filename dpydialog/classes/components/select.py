@@ -1,14 +1,8 @@
-import inspect
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 
 import discord
 
-from dpydialog.errors import (
-    DialogException,
-    NotAllowedToInteract,
-    ShouldBeCoroutine,
-    StageActionOutsideDialog,
-)
+from dpydialog.errors import DialogException
 
 from .component import BaseComponent
 from ...data import StageAction
@@ -32,8 +26,9 @@ class DSelect(BaseComponent, discord.ui.Select):
         action (Optional[Union[StageAction, CallbackType]], optional):
             Callback function or stage action to execute when a selection is made. Defaults to None.
         extras (Optional[Dict[str, Any]], optional): Additional data to store with the component. Defaults to None.
-        operator_ids: (List[int], optional):
+        operator_ids: (Iterable[int], optional):
             IDs of users allowed to use this component. If None, then everyone can use it. Default to None.
+            Use `set_operator_rules` to allow users by their roles or by a predicate.
 
     Raises:
         ValueError: If StageAction is used outside of a Stage class context.
@@ -50,13 +45,23 @@ class DSelect(BaseComponent, discord.ui.Select):
         row: Optional[int] = None,
         action: Optional[Union[StageAction, CallbackType]] = None,
         extras: Optional[Dict[str, Any]] = None,
-        operator_ids: Optional[List[int]] = None,
+        operator_ids: Optional[Iterable[int]] = None,
         on_error_callback: Callable[[discord.Interaction, DialogException], Awaitable[None]] = None,
     ):
-        self._action = action
-        self._extras = extras
-        self._operator_ids = operator_ids
-        self._on_error = on_error_callback
+        self._init_component(action, extras, operator_ids, on_error_callback)
+        self._init_kwargs = dict(
+            options=options,
+            custom_id=custom_id,
+            placeholder=placeholder,
+            min_values=min_values,
+            max_values=max_values,
+            disabled=disabled,
+            row=row,
+            action=action,
+            extras=extras,
+            operator_ids=operator_ids,
+            on_error_callback=on_error_callback,
+        )
 
         super().__init__(
             custom_id=custom_id,
@@ -67,34 +72,3 @@ class DSelect(BaseComponent, discord.ui.Select):
             row=row,
             options=options,
         )
-
-    def get_action(self) -> Union[StageAction, CallbackType]:
-        return self._action
-
-    def _replace_function(self, function: CallbackType) -> None:
-        self._action = function
-
-    async def callback(self, interaction: discord.Interaction) -> None:
-        if isinstance(self._action, StageAction):
-            raise StageActionOutsideDialog(
-                f"You should not use the `StageAction` as "
-                "`action` outside of the `Stage` class.",
-                stage_keyname=self._parent_keyname,
-            )
-
-        if not inspect.iscoroutinefunction(self._action):
-            raise ShouldBeCoroutine(stage_keyname=self._parent_keyname)
-
-        if interaction.user.id not in self._operator_ids:
-            err = NotAllowedToInteract(
-                "The current user is not allowed to interact with the component.",
-                allowed_ids=self._operator_ids,
-                user_id=interaction.user.id,
-                stage_keyname=self._parent_keyname,
-            )
-            if self._on_error:
-                await self._on_error(interaction, err)
-                return
-            raise err
-
-        await self._action(interaction, self)
@@ -1,19 +1,155 @@
-from typing import Optional, Sequence, Union
+import asyncio
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import discord
 from discord.abc import MISSING
 
-from ..data import StageComponents
+from ..data import RenderStats, StageComponents
+from .ratelimit import ChannelRateLimiter
 
 
 class DialogController:
-    def __init__(self, interaction: discord.Interaction) -> None:
+    """Sends and edits the message of a `Dialog`.
+
+    Args:
+        interaction (discord.Interaction): The interaction that started the dialog.
+        message_sent (bool, optional): Whether the first Stage was already sent. Defaults to False.
+        latency_budget (Optional[float], optional):
+            Seconds after the interaction creation within which it has to be answered.
+            If the dialog doesn't answer in time (e.g. a slow first `prepare`, validation or
+            success callback), the interaction is deferred and the render finishes with `edit_original_response`.
+            If None, then interactions are never deferred. Defaults to None.
+        thinking (bool, optional): Whether deferred interactions show the "thinking" state. Defaults to False.
+        rate_limiter (Optional[ChannelRateLimiter], optional):
+            Limits message edits per channel. Share one limiter between all dialogs. Defaults to None.
+        user_id (Optional[int], optional):
+            The user the dialog belongs to, e.g. the owner of a resumed dialog.
+            If None, then it's the user of the interaction. Defaults to None.
+
+    Renders are coalesced: while an edit of the message is in flight, later renders are
+    acknowledged right away and only the latest of them is applied once the edit is done.
+    """
+
+    __slots__ = (
+        "_interaction",
+        "_last_interaction",
+        "_last_view",
+        "_message_sent",
+        "_latency_budget",
+        "_thinking",
+        "_deferral_timers",
+        "_deferrals",
+        "_stats",
+        "_rate_limiter",
+        "_rendering",
+        "_pending",
+        "_user_id",
+    )
+
+    def __init__(
+        self,
+        interaction: discord.Interaction,
+        message_sent: bool = False,
+        latency_budget: Optional[float] = None,
+        thinking: bool = False,
+        rate_limiter: Optional[ChannelRateLimiter] = None,
+        user_id: Optional[int] = None,
+    ) -> None:
         self._interaction = interaction
-        self._message_sent = False  # True after sending the first Stage
+        self._user_id = user_id
+        self._last_interaction = interaction  # The interaction of the latest render
+        self._last_view: Optional[discord.ui.View] = None
+        self._message_sent = message_sent  # True after sending the first Stage
+
+        self._latency_budget = latency_budget
+        self._thinking = thinking
+        self._deferral_timers: Dict[int, asyncio.TimerHandle] = {}
+        self._deferrals: Dict[int, "asyncio.Future[None]"] = {}
+        self._stats = RenderStats()
+
+        self._rate_limiter = rate_limiter
+        self._rendering = False
+        self._pending: Optional[
+            Tuple[discord.Interaction, StageComponents, Dict[str, Any]]
+        ] = None
 
     def get_interaction(self) -> discord.Interaction:
         return self._interaction
 
+    def get_last_interaction(self) -> discord.Interaction:
+        return self._last_interaction
+
+    def get_user_id(self) -> Optional[int]:
+        """Returns the ID of the user the dialog belongs to."""
+        if self._user_id is not None:
+            return self._user_id
+        return self._interaction.user.id
+
+    def get_stats(self) -> RenderStats:
+        return self._stats
+
+    def watch(self, interaction: discord.Interaction, ephemeral: bool = False) -> None:
+        """Defers the interaction if it isn't answered within the latency budget.
+
+        `ephemeral` is the visibility of the first stage when the deferral sends it.
+        """
+        if (
+            self._latency_budget is None
+            or interaction is None
+            or interaction.id in self._deferral_timers
+        ):
+            return
+
+        elapsed = (discord.utils.utcnow() - interaction.created_at).total_seconds()
+        delay = max(0.0, self._latency_budget - max(0.0, elapsed))
+
+        self._deferral_timers[interaction.id] = asyncio.get_running_loop().call_later(
+            delay, self._start_deferral, interaction, ephemeral
+        )
+
+    def _start_deferral(self, interaction: discord.Interaction, ephemeral: bool) -> None:
+        self._deferral_timers.pop(interaction.id, None)
+        if not interaction.response.is_done():
+            deferral = asyncio.ensure_future(self._defer(interaction, ephemeral))
+            deferral.add_done_callback(
+                lambda _: self._deferrals.pop(interaction.id, None)
+            )
+            self._deferrals[interaction.id] = deferral
+
+    async def _defer(self, interaction: discord.Interaction, ephemeral: bool) -> None:
+        try:
+            await self._defer_response(
+                interaction, ephemeral=ephemeral, thinking=self._thinking
+            )
+        except discord.InteractionResponded:
+            return
+        self._stats.deferred += 1
+
+    async def _defer_response(
+        self,
+        interaction: discord.Interaction,
+        ephemeral: bool = False,
+        thinking: bool = False,
+    ) -> None:
+        if interaction is self._interaction and not self._message_sent:
+            # The deferral creates the message of the first stage, it must be as private as the stage
+            await interaction.response.defer(ephemeral=ephemeral, thinking=True)
+        else:
+            await interaction.response.defer(thinking=thinking)
+
+    async def _settle(self, interaction: discord.Interaction) -> None:
+        """Stops watching the interaction and waits for a deferral that is already running."""
+        if self._latency_budget is None:
+            return
+
+        timer = self._deferral_timers.pop(interaction.id, None)
+        if timer is not None:
+            timer.cancel()
+
+        deferral = self._deferrals.pop(interaction.id, None)
+        if deferral is not None:
+            await deferral
+
     async def render(
         self,
         interaction: discord.Interaction,
@@ -24,7 +160,88 @@ class DialogController:
         files: Sequence[discord.File] = MISSING,
         ephemeral: bool = False,
     ) -> None:
-        if not self._message_sent:
+        await self._settle(interaction)
+
+        options = dict(
+            allowed_mentions=allowed_mentions,
+            delete_after=delete_after,
+            suppress_embeds=suppress_embeds,
+            files=files,
+            ephemeral=ephemeral,
+        )
+        if self._rendering:
+            return await self._coalesce(interaction, components, options)
+
+        self._rendering = True
+        try:
+            await self._render(interaction, components, **options)
+
+            # Only the latest state queued during the edit is worth showing
+            while self._pending is not None:
+                interaction, components, options = self._pending
+                self._pending = None
+                await self._render(interaction, components, **options)
+        finally:
+            self._rendering = False
+
+    async def _coalesce(
+        self,
+        interaction: discord.Interaction,
+        components: StageComponents,
+        options: Dict[str, Any],
+    ) -> None:
+        if not interaction.response.is_done():
+            await self._defer_response(interaction, ephemeral=options["ephemeral"])
+
+        # The edit in flight could have finished while the interaction was deferred
+        if not self._rendering:
+            return await self.render(interaction, components, **options)
+
+        self._stats.coalesced += 1
+        if self._pending is not None:
+            self._stats.dropped += 1
+        self._pending = (interaction, components, options)
+
+    async def _throttle(
+        self, interaction: discord.Interaction, ephemeral: bool = False
+    ) -> None:
+        if self._rate_limiter is None:
+            return
+
+        delay = self._rate_limiter.reserve(interaction.channel_id)
+        if delay > 0:
+            self._stats.throttled += 1
+            if not interaction.response.is_done():
+                await self._defer_response(interaction, ephemeral=ephemeral)
+            await asyncio.sleep(delay)
+
+    async def _render(
+        self,
+        interaction: discord.Interaction,
+        components: StageComponents,
+        allowed_mentions: Optional[discord.AllowedMentions] = MISSING,
+        delete_after: Optional[float] = None,
+        suppress_embeds: bool = False,
+        files: Sequence[discord.File] = MISSING,
+        ephemeral: bool = False,
+    ) -> None:
+        await self._throttle(interaction, ephemeral=ephemeral)
+        self._stats.renders += 1
+        self._last_interaction = interaction
+        self._last_view = components.view
+
+        if interaction.response.is_done():
+            message = await interaction.edit_original_response(
+                content=components.content,
+                embeds=components.embeds,
+                view=components.view,
+                allowed_mentions=allowed_mentions or None,
+                attachments=files,
+            )
+            self._message_sent = True
+            if delete_after is not None:
+                await message.delete(delay=delete_after)
+        elif not self._message_sent:
             await self._interaction.response.send_message(
                 content=components.content,
                 embeds=components.embeds,
@@ -48,4 +265,150 @@ class DialogController:
             )
 
     async def close(self, interaction: discord.Interaction) -> None:
+        await self._settle(interaction)
         await interaction.message.delete()
+
+    async def finish(self, interaction: discord.Interaction) -> None:
+        """Removes the components of the message, used when a dialog completes without a success callback."""
+        await self._settle(interaction)
+        self._last_view = None
+
+        if interaction.response.is_done():
+            await interaction.edit_original_response(view=None)
+        else:
+            await interaction.response.edit_message(view=None)
+
+    async def disable_components(self) -> None:
+        """Disables all components of the message in one edit, errors are ignored.
+
+        The interaction token expires after 15 minutes, then the message is edited directly.
+        """
+        view = self._last_view
+        if view is None:
+            return
+
+        for item in view.children:
+            if hasattr(item, "disabled"):
+                item.disabled = True
+        await self._edit_view(view)
+
+    async def _edit_view(self, view: discord.ui.View) -> None:
+        interaction = self._last_interaction
+        try:
+            await interaction.edit_original_response(view=view)
+        except discord.HTTPException:
+            if interaction.message is None:
+                return
+            try:
+                await interaction.message.edit(view=view)
+            except discord.HTTPException:
+                pass
+
+    def dispose(self) -> None:
+        """Cancels the pending deferrals and drops the queued render."""
+        for timer in self._deferral_timers.values():
+            timer.cancel()
+        self._deferral_timers.clear()
+        self._pending = None
+        self._last_view = None
+
+
+class MessageDialogController(DialogController):
+    """Sends the first stage of a `Dialog` to a channel or to DMs, without an interaction.
+
+    The first stage is sent with `target.send`, the later stages answer the component
+    interactions like `DialogController` does. Until a component is used there is no
+    interaction: `get_interaction` and `get_last_interaction` return None and an expired
+    dialog edits its message directly. Messages can't be ephemeral.
+
+    Args:
+        target (discord.abc.Messageable): The channel, or the user or member to send the dialog to.
+        user_id (Optional[int], optional): The user the dialog belongs to, e.g. the DM recipient. Defaults to None.
+
+        See `DialogController` for the rest of the arguments. The rate limiter also
+        limits the first sends per target.
+    """
+
+    __slots__ = ("_target", "_message")
+
+    def __init__(
+        self,
+        target: discord.abc.Messageable,
+        user_id: Optional[int] = None,
+        latency_budget: Optional[float] = None,
+        thinking: bool = False,
+        rate_limiter: Optional[ChannelRateLimiter] = None,
+    ) -> None:
+        super().__init__(
+            None,
+            latency_budget=latency_budget,
+            thinking=thinking,
+            rate_limiter=rate_limiter,
+            user_id=user_id,
+        )
+        self._target = target
+        self._message: Optional[discord.Message] = None
+
+    def get_target(self) -> discord.abc.Messageable:
+        return self._target
+
+    def get_message(self) -> Optional[discord.Message]:
+        """Returns the sent message, None before the first stage is sent."""
+        return self._message
+
+    def get_user_id(self) -> Optional[int]:
+        return self._user_id
+
+    async def render(
+        self,
+        interaction: Optional[discord.Interaction],
+        components: StageComponents,
+        allowed_mentions: Optional[discord.AllowedMentions] = MISSING,
+        delete_after: Optional[float] = None,
+        suppress_embeds: bool = False,
+        files: Sequence[discord.File] = MISSING,
+        ephemeral: bool = False,
+    ) -> None:
+        if interaction is not None:
+            return await super().render(
+                interaction,
+                components,
+                allowed_mentions=allowed_mentions,
+                delete_after=delete_after,
+                suppress_embeds=suppress_embeds,
+                files=files,
+                ephemeral=ephemeral,
+            )
+
+        if self._rate_limiter is not None:
+            delay = self._rate_limiter.reserve(getattr(self._target, "id", None))
+            if delay > 0:
+                self._stats.throttled += 1
+                await asyncio.sleep(delay)
+
+        self._stats.renders += 1
+        self._last_view = components.view
+        self._message = await self._target.send(
+            content=components.content,
+            embeds=components.embeds,
+            view=components.view,
+            allowed_mentions=allowed_mentions or None,
+            delete_after=delete_after,
+            suppress_embeds=suppress_embeds,
+            files=files or None,
+        )
+        self._message_sent = True
+
+    async def _edit_view(self, view: discord.ui.View) -> None:
+        if self._last_interaction is not None:
+            return await super()._edit_view(view)
+
+        if self._message is not None:
+            try:
+                await self._message.edit(view=view)
+            except discord.HTTPException:
+                pass
+
+    def dispose(self) -> None:
+        super().dispose()
+        self._message = None
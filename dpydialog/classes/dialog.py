@@ -1,20 +1,86 @@
-from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Mapping, MutableMapping, Optional, Sequence
 
 import discord
-from discord.ext import commands
 from discord.abc import MISSING
 
 from ..errors import DialogException, DialogHasNoStages
+from ..serialization import LazyResult, reduce_value
 
-from ..data import StageComponents
+from ..data import (
+    DialogResult,
+    DialogState,
+    OperatorRules,
+    StageCheckpoint,
+    StageComponents,
+)
 from .controller import DialogController
+from .graph import StageGraph, TransitionType
+from .observer import DialogObserver
+from .ratelimit import ChannelRateLimiter
 from ..interfaces.istage import IStage
+from ..interfaces.istore import IDialogStateStore
+
+if TYPE_CHECKING:
+    # Only needed for an annotation, importing `discord.ext.commands` is slow
+    from discord.ext import commands
+
+    from .checkpoint import CheckpointWriter
+    from .registry import DialogRegistry
+    from .stream import DialogResultStream
+
+CUSTOM_ID_PREFIX = "dpyd"
+
+TIMEOUT_IDLE = "idle"
+TIMEOUT_TOTAL = "total"
+TIMEOUT_STAGE = "stage"
+
+# Interactions that never reach a transition (e.g. page buttons) are forgotten after this many
+MAX_TRACKED_CLICKS = 32
 
 
 class Dialog:
+    __slots__ = (
+        "_on_success",
+        "_on_error",
+        "_controller",
+        "_stages",
+        "_result",
+        "_current_stage_index",
+        "_history",
+        "_operator_rules",
+        "_transitions",
+        "_allow_cycles",
+        "_graph",
+        "_dialog_id",
+        "_template_name",
+        "_store",
+        "_registry",
+        "_observer",
+        "_result_stream",
+        "_checkpoints",
+        "_on_timeout",
+        "_on_close",
+        "_on_dispose",
+        "_idle_timeout",
+        "_total_timeout",
+        "_disable_on_timeout",
+        "_last_activity",
+        "_idle_timer",
+        "_total_timer",
+        "_expiry",
+        "_finished",
+        "_lock",
+        "_version",
+        "_click_versions",
+        "__weakref__",
+    )
+
     def __init__(self, controller: DialogController):
         self._on_success: Callable[
-            [discord.Interaction, Dict[str, Any]], Awaitable[None]
+            [discord.Interaction, MutableMapping[str, Any]], Awaitable[None]
         ] = None
         self._on_error: Callable[
             [discord.Interaction, DialogException], Awaitable[None]
@@ -23,73 +89,585 @@ class Dialog:
         self._controller = controller
 
         self._stages: List[IStage] = []
-        self._result: Dict[str, Any] = {}
+        self._result: MutableMapping[str, Any] = {}  # A `LazyResult` after a restore
         self._current_stage_index = 0
-        self._operator_ids: Optional[Sequence[int]] = None
+        self._history: List[int] = []
+        self._operator_rules = OperatorRules()
+
+        self._transitions: Optional[Mapping[str, TransitionType]] = None
+        self._allow_cycles = False
+        self._graph: Optional[StageGraph] = None
+
+        # The same 32 hex digits as `uuid4().hex`, without importing `uuid`
+        self._dialog_id: str = os.urandom(16).hex()
+        self._template_name: Optional[str] = None
+        self._store: Optional[IDialogStateStore] = None
+        self._registry: Optional["DialogRegistry"] = None
+        self._observer: Optional[DialogObserver] = None
+        self._result_stream: Optional["DialogResultStream"] = None
+        self._checkpoints: Optional["CheckpointWriter"] = None
+
+        self._on_timeout: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ] = None
+        self._on_close: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ] = None
+        self._on_dispose: Optional[Callable[["Dialog"], None]] = None
+        self._idle_timeout: Optional[float] = None
+        self._total_timeout: Optional[float] = None
+        self._disable_on_timeout = True
+        self._last_activity = 0.0
+        self._idle_timer: Optional[asyncio.TimerHandle] = None
+        self._total_timer: Optional[asyncio.TimerHandle] = None
+        self._expiry: Optional["asyncio.Future[None]"] = None
+        self._finished = False
+
+        # Transitions are serialized, every transition bumps the version, so clicks
+        # made on an older version of the dialog are recognized as stale
+        self._lock = asyncio.Lock()
+        self._version = 0
+        self._click_versions: Dict[int, int] = {}
 
     @classmethod
-    def from_interaction(cls, interaction: discord.Interaction) -> "Dialog":
-        return cls(DialogController(interaction))
+    def from_interaction(
+        cls,
+        interaction: discord.Interaction,
+        latency_budget: Optional[float] = None,
+        thinking: bool = False,
+        rate_limiter: Optional[ChannelRateLimiter] = None,
+    ) -> "Dialog":
+        """Creates a dialog that answers to the interaction.
+
+        If `latency_budget` is set, interactions that aren't answered within that many
+        seconds are deferred automatically. A shared `rate_limiter` throttles the message
+        edits per channel. See `DialogController`.
+        """
+        return cls(
+            DialogController(
+                interaction,
+                latency_budget=latency_budget,
+                thinking=thinking,
+                rate_limiter=rate_limiter,
+            )
+        )
 
     @classmethod
-    def from_legacy_ctx(cls, ctx: commands.Context) -> "Dialog":
+    def from_legacy_ctx(cls, ctx: "commands.Context") -> "Dialog":
         raise NotImplementedError("This method requires an Interaction Adapter.")
 
-    def set_operator_ids(self, ids: Sequence[int]) -> "Dialog":
-        self._operator_ids = ids
+    def get_id(self) -> str:
+        return self._dialog_id
+
+    def get_controller(self) -> DialogController:
+        return self._controller
+
+    def get_user_id(self) -> Optional[int]:
+        return self._controller.get_user_id()
+
+    def set_transitions(
+        self,
+        transitions: Optional[Mapping[str, TransitionType]],
+        allow_cycles: bool = False,
+    ) -> "Dialog":
+        """Sets the stage that follows each stage, see `StageGraph`.
+
+        Stages without a transition go to the stage added after them. The graph
+        is validated when the dialog is sent.
+        """
+        self._transitions = transitions
+        self._allow_cycles = allow_cycles
+        self._graph = None
+        return self
+
+    def _set_graph(self, graph: StageGraph) -> None:
+        self._graph = graph
+
+    def _get_graph(self) -> StageGraph:
+        if len(self._stages) < 1:
+            raise DialogHasNoStages()
+
+        if self._graph is None:
+            self._graph = StageGraph(
+                [stage.get_keyname() for stage in self._stages],
+                self._transitions,
+                allow_cycles=self._allow_cycles,
+            )
+        return self._graph
+
+    def get_stage(self, keyname: str) -> IStage:
+        """Returns the stage with the keyname.
+
+        Raises:
+            KeyError: If there is no stage with the keyname.
+        """
+        return self._stages[self._get_graph().index_of(keyname)]
+
+    def get_history(self) -> List[str]:
+        """Returns the keynames of the visited stages BACK returns to, from the oldest."""
+        graph = self._get_graph()
+        return [graph.get_keyname(index) for index in self._history]
+
+    def set_registry(self, registry: Optional["DialogRegistry"]) -> "Dialog":
+        """Tracks the dialog in the registry from `send` until it's closed or completed."""
+        self._registry = registry
+        return self
+
+    def set_observer(self, observer: Optional[DialogObserver]) -> "Dialog":
+        """Reports the lifecycle events of the dialog to the observer, see `DialogObserver`."""
+        self._observer = observer
+
+        for stage in self._stages:
+            stage.set_observer(observer, self)
+        return self
+
+    def set_result_stream(self, stream: Optional["DialogResultStream"]) -> "Dialog":
+        """Publishes the result to the stream when the dialog is completed.
+
+        The result is published after the success callback, so it doesn't delay the answer
+        to the interaction. Without a success callback the components are removed instead.
+        """
+        self._result_stream = stream
+        return self
+
+    def set_checkpoint_writer(self, writer: Optional["CheckpointWriter"]) -> "Dialog":
+        """Records the value of every completed stage to the writer as soon as it's saved.
+
+        Unlike the result of the success callback, the checkpoints of abandoned dialogs
+        are kept, so they show where users drop out.
+        """
+        self._checkpoints = writer
+        return self
+
+    def set_timeout(
+        self,
+        idle: Optional[float] = None,
+        total: Optional[float] = None,
+        disable_components: bool = True,
+    ) -> "Dialog":
+        """Expires the dialog after `idle` seconds without interactions or `total` seconds after `send`.
+
+        The dialog also expires when the view of the current stage times out. An expired
+        dialog disables the components of its message (unless `disable_components` is False),
+        calls the timeout callback and is disposed.
+        """
+        self._idle_timeout = idle
+        self._total_timeout = total
+        self._disable_on_timeout = disable_components
+        return self
+
+    def set_timeout_callback(
+        self,
+        function: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ],
+    ) -> "Dialog":
+        """Sets the function called with the latest interaction and the partial result when the dialog expires."""
+        self._on_timeout = function
+        return self
+
+    def set_close_callback(
+        self,
+        function: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ],
+    ) -> "Dialog":
+        """Sets the function called with the interaction and the partial result after the dialog is closed."""
+        self._on_close = function
+        return self
+
+    def set_dispose_callback(self, function: Optional[Callable[["Dialog"], None]]) -> "Dialog":
+        """Sets the function called with the dialog once it's disposed, whatever the reason.
+
+        Unlike the other callbacks it's also called for dialogs evicted from the registry
+        or disposed after a failed close, so owners of many dialogs can account for each.
+        """
+        self._on_dispose = function
+        return self
+
+    def is_finished(self) -> bool:
+        """Whether the dialog was completed, closed, expired or disposed."""
+        return self._finished
+
+    def dispose(self) -> None:
+        """Stops the views and drops the callbacks and timers, the dialog can't be used afterwards.
+
+        Called when the dialog is completed, closed, expired or evicted from the registry,
+        so nothing but the caller keeps an abandoned dialog and its components alive.
+        """
+        self._finished = True
+        for timer in (self._idle_timer, self._total_timer):
+            if timer is not None:
+                timer.cancel()
+        self._idle_timer = self._total_timer = None
+
+        self._release()
+        for stage in self._stages:
+            stage.dispose()
+        self._controller.dispose()
+
+        on_dispose, self._on_dispose = self._on_dispose, None
+        if on_dispose is not None:
+            on_dispose(self)
+
+    def _start_timers(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._last_activity = time.monotonic()
+        if self._idle_timeout is not None:
+            self._idle_timer = loop.call_later(self._idle_timeout, self._check_idle)
+        if self._total_timeout is not None:
+            self._total_timer = loop.call_later(
+                self._total_timeout, self._schedule_expiry, TIMEOUT_TOTAL
+            )
+
+    def _check_idle(self) -> None:
+        remaining = self._last_activity + self._idle_timeout - time.monotonic()
+        if remaining > 0:
+            # Re-arming the timer only when it fires is cheaper than on every click
+            self._idle_timer = asyncio.get_running_loop().call_later(
+                remaining, self._check_idle
+            )
+        else:
+            self._idle_timer = None
+            self._schedule_expiry(TIMEOUT_IDLE)
+
+    def _schedule_expiry(self, reason: str) -> None:
+        if not self._finished and self._expiry is None:
+            self._expiry = asyncio.ensure_future(self._expire(reason))
+
+    async def _expire(self, reason: str) -> None:
+        async with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+
+        if self._observer is not None:
+            stage = self._stages[self._current_stage_index]
+            self._observer.on_timeout(self, stage.get_keyname())
+
+        try:
+            self._release()
+            await self._delete_state()
+            if self._disable_on_timeout:
+                await self._controller.disable_components()
+            if self._on_timeout is not None:
+                await self._on_timeout(
+                    self._controller.get_last_interaction(), self._result
+                )
+        finally:
+            self.dispose()
+
+    def stop(self) -> None:
+        """Stops the views of all stages, the dialog doesn't respond to components afterwards."""
+        for stage in self._stages:
+            stage.invalidate_view()
+
+    def _touch(self) -> None:
+        if self._registry is not None:
+            self._registry.touch(self._dialog_id)
+
+    def _release(self) -> None:
+        if self._registry is not None:
+            self._registry.discard(self._dialog_id)
+
+    def set_state_store(
+        self, store: Optional[IDialogStateStore], template_name: Optional[str] = None
+    ) -> "Dialog":
+        """Saves the dialog progress to the store after every transition.
+
+        Stages of a dialog with a store use persistent views with deterministic custom
+        IDs, so `DialogPersistence` can resume the dialog in any process.
+        """
+        self._store = store
+        self._template_name = template_name
+
+        for stage in self._stages:
+            stage.set_custom_id_prefix(self._get_custom_id_prefix())
+        return self
+
+    def _get_custom_id_prefix(self) -> Optional[str]:
+        if self._store is None:
+            return None
+        return f"{CUSTOM_ID_PREFIX}:{self._dialog_id}"
+
+    def get_state(self) -> DialogState:
+        user_ids = self._operator_rules.user_ids
+        return DialogState(
+            dialog_id=self._dialog_id,
+            template_name=self._template_name,
+            stage_index=self._current_stage_index,
+            result=self._result,
+            operator_ids=None if user_ids is None else list(user_ids),
+            history=list(self._history),
+            user_id=self.get_user_id(),
+        )
+
+    def _restore_state(self, state: DialogState) -> None:
+        self._dialog_id = state.dialog_id
+        self._template_name = state.template_name
+        self._current_stage_index = state.stage_index
+        self._history = list(state.history)
+        # Discord objects are looked up in the cache only when the result is read
+        interaction = self._controller.get_interaction()
+        self._result = LazyResult(
+            state.result,
+            guild=getattr(interaction, "guild", None),
+            client=getattr(interaction, "client", None),
+        )
+        self.set_operator_ids(state.operator_ids)
+        self.set_state_store(self._store, self._template_name)
+
+    async def _save_state(self) -> None:
+        if self._store is not None:
+            await self._store.save(self.get_state())
+
+    async def _delete_state(self) -> None:
+        if self._store is not None:
+            await self._store.delete(self._dialog_id)
+
+    def set_operator_ids(self, ids: Optional[Sequence[int]]) -> "Dialog":
+        return self.set_operator_rules(self._operator_rules.with_user_ids(ids))
+
+    def set_operator_rules(self, rules: OperatorRules) -> "Dialog":
+        self._operator_rules = rules
+
+        for stage in self._stages:
+            stage.set_operator_rules(rules)
+        return self
 
     def set_success_callback(
-        self, function: Callable[[discord.Interaction, Dict[str, Any]], Awaitable[None]]
+        self,
+        function: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ],
     ) -> "Dialog":
+        """Sets the function called with the result when the last stage is completed.
+
+        With a latency budget the interaction may already be deferred when the function
+        runs, check `interaction.response.is_done()` and use `edit_original_response` then.
+        Without a function the components are removed from the message on success.
+        """
         self._on_success = function
+        return self
 
     def set_error_callback(
         self,
         function: Callable[[discord.Interaction, DialogException], Awaitable[None]],
     ) -> "Dialog":
         self._on_error = function
+        return self
 
     def add_stage(self, stage: IStage) -> "Dialog":
         if not isinstance(stage, IStage):
             raise ValueError("Stage class must derive from `IStage`.")
 
-        stage.set_operator_ids(self._operator_ids)
+        stage.set_operator_rules(self._operator_rules)
         stage.set_back_callback(self._to_previous_stage)
         stage.set_next_callback(self._to_next_stage)
         stage.set_close_callback(self._close_dialogue)
+        stage.set_refresh_callback(self._refresh_current_stage)
+        stage.set_interaction_hook(self._on_interaction)
+        stage.set_error_callback(self._handle_error)
+        stage.set_timeout_callback(self._on_stage_timeout)
+        stage.set_observer(self._observer, self)
+        stage.set_custom_id_prefix(self._get_custom_id_prefix())
 
         self._stages.append(stage)
+        self._graph = None
         return self
 
+    def _on_interaction(self, interaction: discord.Interaction, stage_keyname: str) -> None:
+        self._controller.watch(interaction)
+        self._last_activity = time.monotonic()
+
+        # Components of a stage that isn't shown anymore make stale clicks right away,
+        # clicks on the shown stage become stale once another click moves the dialog
+        versions = self._click_versions
+        current = self._stages[self._current_stage_index].get_keyname()
+        versions[interaction.id] = self._version if stage_keyname == current else -1
+        if len(versions) > MAX_TRACKED_CLICKS:
+            del versions[next(iter(versions))]
+
+        if self._observer is not None:
+            self._observer.on_component_click(self, stage_keyname, interaction)
+
+    async def _on_stage_timeout(self, stage_keyname: str) -> None:
+        # Views of the previous stages time out as well, only the shown one matters
+        if self._stages[self._current_stage_index].get_keyname() == stage_keyname:
+            await self._expire(TIMEOUT_STAGE)
+
+    async def _handle_error(
+        self, interaction: discord.Interaction, error: Exception
+    ) -> bool:
+        if self._on_error is None or not isinstance(error, DialogException):
+            return False
+
+        await self._on_error(interaction, error)
+        return True
+
+    def _claim_version(self, interaction: discord.Interaction) -> Optional[int]:
+        """Returns the version of the dialog the interaction was made on."""
+        return self._click_versions.pop(interaction.id, None)
+
+    def _is_stale(self, version: Optional[int]) -> bool:
+        # Interactions made outside the stage views (e.g. by a command) are never stale
+        return self._finished or (version is not None and version != self._version)
+
+    async def _reject(self, interaction: discord.Interaction) -> None:
+        # A click on an already moved on view is only acknowledged, nothing is rendered
+        if not interaction.response.is_done():
+            try:
+                await interaction.response.defer()
+            except discord.InteractionResponded:
+                pass
+
+    async def jump_to(self, interaction: discord.Interaction, keyname: str) -> None:
+        """Moves the dialog to the stage with the keyname, BACK returns to the current stage.
+
+        Raises:
+            KeyError: If there is no stage with the keyname.
+        """
+        index = self._get_graph().index_of(keyname)
+        version = self._claim_version(interaction)
+        if self._is_stale(version):
+            return await self._reject(interaction)
+
+        async with self._lock:
+            if self._is_stale(version):
+                return await self._reject(interaction)
+
+            self._version += 1
+            self._history.append(self._current_stage_index)
+            self._current_stage_index = index
+
+            self._touch()
+            await self._save_state()
+
+        await self._render_current_stage(interaction)
+
     async def _to_previous_stage(self, interaction: discord.Interaction, _):
-        self._current_stage_index -= 1
+        version = self._claim_version(interaction)
+        if self._is_stale(version):
+            return await self._reject(interaction)
 
-        # Can not allow the user to move back from first page, so just close the dialogue
-        if self._current_stage_index < 0:
-            return await self._close_dialogue(interaction, _)
+        async with self._lock:
+            if self._is_stale(version):
+                return await self._reject(interaction)
 
-        components: StageComponents = self._stages[
-            self._current_stage_index
-        ].get_components()
+            self._version += 1
+            # Can not allow the user to move back from first page, so just close the dialogue
+            if not self._history:
+                self._finished = True
+            else:
+                self._current_stage_index = self._history.pop()
+                # The stage is answered again, results of abandoned branches don't stay in the result
+                self._result.pop(self._stages[self._current_stage_index].get_keyname(), None)
 
-        await self._controller.render(interaction, components)
+                self._touch()
+                await self._save_state()
+
+        if self._finished:
+            return await self._close(interaction)
+        await self._render_current_stage(interaction)
+
+    async def _refresh_current_stage(self, interaction: discord.Interaction, _):
+        if self._is_stale(self._claim_version(interaction)):
+            return await self._reject(interaction)
+
+        self._touch()
+        await self._render_current_stage(interaction)
 
     async def _close_dialogue(self, interaction: discord.Interaction, _):
-        await self._controller.close(interaction)
+        version = self._claim_version(interaction)
+        if self._is_stale(version):
+            return await self._reject(interaction)
+
+        async with self._lock:
+            if self._is_stale(version):
+                return await self._reject(interaction)
+
+            self._version += 1
+            self._finished = True
+
+        await self._close(interaction)
+
+    async def _close(self, interaction: discord.Interaction) -> None:
+        self._release()
+        if self._observer is not None:
+            self._observer.on_close(self)
+        try:
+            await self._delete_state()
+            await self._controller.close(interaction)
+            if self._on_close is not None:
+                await self._on_close(interaction, self._result)
+        finally:
+            self.dispose()
 
     async def _to_next_stage(self, interaction: discord.Interaction, value: Any):
-        # Saving the result of the Stage
-        current_stage = self._stages[self._current_stage_index]
-        self._result[current_stage.get_keyname()] = value
+        version = self._claim_version(interaction)
+        if self._is_stale(version):
+            return await self._reject(interaction)
 
-        self._current_stage_index += 1
+        async with self._lock:
+            if self._is_stale(version):
+                return await self._reject(interaction)
 
-        # If the next Stage is out-of-borders, then the dialogue is completed
-        if self._current_stage_index > len(self._stages) - 1:
-            return await self._on_success(interaction, self._result)
+            self._version += 1
+            # Saving the result of the Stage
+            current_stage = self._stages[self._current_stage_index]
+            self._result[current_stage.get_keyname()] = value
+            if self._checkpoints is not None:
+                self._checkpoints.record(
+                    StageCheckpoint(
+                        dialog_id=self._dialog_id,
+                        stage_keyname=current_stage.get_keyname(),
+                        value=reduce_value(value),
+                        user_id=self.get_user_id(),
+                        template_name=self._template_name,
+                        created_at=time.time(),
+                    )
+                )
 
+            next_index = self._get_graph().next_index(self._current_stage_index, value)
+
+            # The stage has no next stage, so the dialogue is completed
+            if next_index is None:
+                self._finished = True
+            else:
+                self._history.append(self._current_stage_index)
+                self._current_stage_index = next_index
+
+                self._touch()
+                await self._save_state()
+
+        if self._finished:
+            return await self._succeed(interaction)
         await self._render_current_stage(interaction)
 
+    async def _succeed(self, interaction: discord.Interaction) -> None:
+        self._release()
+        if self._observer is not None:
+            self._observer.on_success(self, self._result)
+        try:
+            await self._delete_state()
+            try:
+                if self._on_success is None:
+                    await self._controller.finish(interaction)
+                else:
+                    await self._on_success(interaction, self._result)
+            finally:
+                if self._result_stream is not None:
+                    await self._result_stream.publish(
+                        DialogResult(
+                            dialog_id=self._dialog_id,
+                            result=self._result,
+                            user_id=self.get_user_id(),
+                            template_name=self._template_name,
+                        )
+                    )
+        finally:
+            self.dispose()
+
     async def _render_current_stage(
         self,
         interaction: discord.Interaction,
@@ -102,9 +680,11 @@ class Dialog:
         if len(self._stages) < 1:
             raise DialogHasNoStages()
 
-        components: StageComponents = self._stages[
-            self._current_stage_index
-        ].get_components()
+        stage = self._stages[self._current_stage_index]
+        started = time.perf_counter()
+        await stage.prepare()
+        components: StageComponents = stage.get_components()
+        built = time.perf_counter()
 
         await self._controller.render(
             interaction,
@@ -116,6 +696,14 @@ class Dialog:
             ephemeral=ephemeral,
         )
 
+        if self._observer is not None:
+            self._observer.on_stage_render(
+                self,
+                stage.get_keyname(),
+                built - started,
+                time.perf_counter() - built,
+            )
+
     async def send(
         self,
         allowed_mentions: Optional[discord.AllowedMentions] = MISSING,
@@ -124,11 +712,23 @@ class Dialog:
         files: Sequence[discord.File] = MISSING,
         ephemeral: bool = False,
     ):
+        # Validates the stage graph before anything is sent
+        self._get_graph()
+        if self._observer is not None:
+            self._observer.on_dialog_start(self)
+
+        # A slow `prepare` of the first stage is covered by the latency budget as well
+        interaction = self._controller.get_interaction()
+        self._controller.watch(interaction, ephemeral=ephemeral)
         await self._render_current_stage(
-            self._controller.get_interaction(),
+            interaction,
             allowed_mentions=allowed_mentions,
             delete_after=delete_after,
             suppress_embeds=suppress_embeds,
             files=files,
             ephemeral=ephemeral,
         )
+        if self._registry is not None:
+            self._registry.add(self)
+        self._start_timers()
+        await self._save_state()
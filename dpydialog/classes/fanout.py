@@ -0,0 +1,212 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, Iterable, List, MutableMapping, Optional, Tuple
+
+import discord
+from discord.abc import MISSING
+
+from ..data import FanOutResult
+from .dialog import Dialog
+from .ratelimit import TokenBucket
+from .template import DialogTemplate
+
+FANOUT_COMPLETED = "completed"
+FANOUT_CLOSED = "closed"
+FANOUT_TIMEOUT = "timeout"
+FANOUT_FAILED = "failed"
+FANOUT_DISPOSED = "disposed"
+
+
+class DialogFanOut:
+    """Sends the same dialog to many channels or users and streams the outcomes.
+
+    Every target gets its own dialog instantiated from the template, so the stage
+    prototypes and the compiled stage graph are shared by all of them. The first
+    stages are sent by at most `max_concurrency` targets at once, `send_rate` limits
+    the sends per second over all targets and the template rate limiter the sends
+    per target. Users and members get the dialog in their DMs, see `MessageDialogController`.
+
+    Iterate the fan-out to start it and to get a `FanOutResult` of each target as soon
+    as its dialog is completed, closed, expires or fails to be sent. A dialog disposed
+    without any of these outcomes, e.g. evicted from the registry, is reported as
+    "disposed". The iteration ends when every target has an outcome, so give the
+    template a timeout. The template
+    callbacks still run, a dialog completed without a success callback removes its
+    components. A fan-out can be iterated once.
+
+    Args:
+        template (DialogTemplate): The dialog sent to every target.
+        targets (Iterable[discord.abc.Messageable]): Channels, users or members.
+        max_concurrency (int, optional): The number of first stages sent at once. Defaults to 10.
+        send_rate (Optional[float], optional):
+            The maximum number of first stages sent per second. If None, then only
+            the concurrency limits the sends. Defaults to None.
+        restrict_to_recipient (bool, optional):
+            Whether only the recipient of a DM dialog can use it, instead of the
+            template operators. Defaults to True.
+
+    Raises:
+        ValueError: When `max_concurrency` is less than 1 or `send_rate` isn't positive.
+    """
+
+    __slots__ = (
+        "_template",
+        "_targets",
+        "_restrict_to_recipient",
+        "_max_concurrency",
+        "_semaphore",
+        "_bucket",
+        "_queue",
+        "_remaining",
+        "_tasks",
+        "_dialogs",
+    )
+
+    def __init__(
+        self,
+        template: DialogTemplate,
+        targets: Iterable[discord.abc.Messageable],
+        max_concurrency: int = 10,
+        send_rate: Optional[float] = None,
+        restrict_to_recipient: bool = True,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("At least one dialog has to be sent at once.")
+        if send_rate is not None and send_rate <= 0:
+            raise ValueError("The send rate must be positive.")
+
+        self._template = template
+        self._targets: Tuple[discord.abc.Messageable, ...] = tuple(targets)
+        self._restrict_to_recipient = restrict_to_recipient
+        self._max_concurrency = max_concurrency
+        # Created with the first use, so the fan-out can be built outside of the event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bucket = None if send_rate is None else TokenBucket(send_rate, 1.0)
+        self._queue: "Optional[asyncio.Queue[FanOutResult]]" = None
+        self._remaining = len(self._targets)
+        self._tasks: Optional[List["asyncio.Future[None]"]] = None
+        # Dialog ID -> the live dialog
+        self._dialogs: Dict[str, Dialog] = {}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._semaphore
+
+    def _get_queue(self) -> "asyncio.Queue[FanOutResult]":
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        return self._queue
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    def get_dialogs(self) -> List[Dialog]:
+        """Returns the sent dialogs that don't have an outcome yet."""
+        return list(self._dialogs.values())
+
+    def start(self) -> None:
+        """Starts sending the dialogs in the background, iterating the fan-out starts it too."""
+        if self._tasks is None:
+            self._tasks = [
+                asyncio.ensure_future(self._send(target)) for target in self._targets
+            ]
+
+    def __aiter__(self) -> AsyncIterator[FanOutResult]:
+        self.start()
+        return self._results()
+
+    async def _results(self) -> AsyncIterator[FanOutResult]:
+        while self._remaining > 0:
+            outcome = await self._get_queue().get()
+            self._remaining -= 1
+            yield outcome
+
+    def _create_dialog(self, target: discord.abc.Messageable) -> Dialog:
+        user_id = (
+            target.id if isinstance(target, (discord.User, discord.Member)) else None
+        )
+        operator_ids = MISSING
+        if self._restrict_to_recipient and user_id is not None:
+            operator_ids = [user_id]
+
+        template = self._template
+        dialog = template._instantiate(
+            template._create_message_controller(target, user_id), operator_ids
+        )
+        on_success = template._on_success
+        on_timeout = template._on_timeout
+
+        async def succeed(
+            interaction: discord.Interaction, result: MutableMapping[str, Any]
+        ) -> None:
+            try:
+                if on_success is None:
+                    await dialog.get_controller().finish(interaction)
+                else:
+                    await on_success(interaction, result)
+            finally:
+                self._publish(target, dialog, FANOUT_COMPLETED, result)
+
+        async def close(
+            interaction: discord.Interaction, result: MutableMapping[str, Any]
+        ) -> None:
+            self._publish(target, dialog, FANOUT_CLOSED, result)
+
+        async def expire(
+            interaction: Optional[discord.Interaction], result: MutableMapping[str, Any]
+        ) -> None:
+            try:
+                if on_timeout is not None:
+                    await on_timeout(interaction, result)
+            finally:
+                self._publish(target, dialog, FANOUT_TIMEOUT, result)
+
+        def dispose(dialog: Dialog) -> None:
+            # Only reached without an outcome, the other callbacks publish first
+            self._publish(target, dialog, FANOUT_DISPOSED, dialog._result)
+
+        dialog.set_success_callback(succeed)
+        dialog.set_close_callback(close)
+        dialog.set_timeout_callback(expire)
+        dialog.set_dispose_callback(dispose)
+        return dialog
+
+    async def _send(self, target: discord.abc.Messageable) -> None:
+        async with self._get_semaphore():
+            if self._bucket is not None:
+                delay = self._bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+            dialog = None
+            try:
+                dialog = self._create_dialog(target)
+                self._dialogs[dialog.get_id()] = dialog
+                await dialog.send()
+            except Exception as error:
+                if dialog is not None:
+                    self._dialogs.pop(dialog.get_id(), None)
+                    dialog.set_dispose_callback(None)
+                    dialog.dispose()
+                self._get_queue().put_nowait(
+                    FanOutResult(target=target, status=FANOUT_FAILED, error=error)
+                )
+
+    def _publish(
+        self,
+        target: discord.abc.Messageable,
+        dialog: Dialog,
+        status: str,
+        result: MutableMapping[str, Any],
+    ) -> None:
+        if self._dialogs.pop(dialog.get_id(), None) is None:
+            return
+
+        self._get_queue().put_nowait(
+            FanOutResult(
+                target=target,
+                status=status,
+                result=dict(result),
+                dialog_id=dialog.get_id(),
+            )
+        )
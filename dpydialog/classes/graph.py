@@ -0,0 +1,179 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from discord.abc import MISSING
+
+from ..data import Branch
+from ..errors import InvalidStageGraph
+
+TransitionType = Union[str, None, Branch]
+
+# (fixed target index, case -> target index, branch) of a stage, -1 completes the dialog
+_CompiledTransition = Tuple[int, Optional[Dict[Any, int]], Optional[Branch]]
+
+END = -1
+
+
+class StageGraph:
+    """The precompiled transitions between the stages of a dialog.
+
+    Each stage goes to the stage listed in `transitions`: a keyname, a `Branch`
+    choosing the keyname by the stage result, or `None` to complete the dialog.
+    Stages without a transition go to the stage that follows them in `keynames`,
+    the last one completes the dialog. The first stage is the entry point.
+
+    The graph is validated once: every target must exist, every stage must be
+    reachable from the entry point and, unless `allow_cycles` is set, no stage
+    can lead back to itself. Transitions are compiled into index tables, so
+    moving to the next stage is a list index and at most one dict lookup.
+
+    Args:
+        keynames (Sequence[str]): The keynames of the stages, in order.
+        transitions (Optional[Mapping[str, TransitionType]], optional):
+            Stage keyname -> the next stage. Defaults to None.
+        allow_cycles (bool, optional): Whether stages may lead back to earlier ones. Defaults to False.
+
+    Raises:
+        InvalidStageGraph: When a target is missing, a stage is unreachable or there is a cycle.
+    """
+
+    __slots__ = ("_keynames", "_indexes", "_table")
+
+    def __init__(
+        self,
+        keynames: Sequence[str],
+        transitions: Optional[Mapping[str, TransitionType]] = None,
+        allow_cycles: bool = False,
+    ):
+        if not keynames:
+            raise InvalidStageGraph("The stage graph has no stages.")
+
+        self._keynames: Tuple[str, ...] = tuple(keynames)
+        self._indexes: Dict[str, int] = {}
+        for index, keyname in enumerate(self._keynames):
+            if keyname in self._indexes:
+                raise InvalidStageGraph(
+                    f"The '{keyname}' keyname is used by several stages.",
+                    stage_keyname=keyname,
+                )
+            self._indexes[keyname] = index
+
+        transitions = transitions or {}
+        for keyname in transitions:
+            if keyname not in self._indexes:
+                raise InvalidStageGraph(
+                    f"The transition of the unknown '{keyname}' stage.",
+                    stage_keyname=keyname,
+                )
+
+        self._table: List[_CompiledTransition] = [
+            self._compile(index, transitions.get(keyname, MISSING))
+            for index, keyname in enumerate(self._keynames)
+        ]
+        self._check_reachability()
+        if not allow_cycles:
+            self._check_cycles()
+
+    def _resolve(self, source: str, target: Optional[str]) -> int:
+        if target is None:
+            return END
+
+        index = self._indexes.get(target)
+        if index is None:
+            raise InvalidStageGraph(
+                f"The '{source}' stage leads to the missing '{target}' stage.",
+                stage_keyname=source,
+            )
+        return index
+
+    def _compile(self, index: int, transition: Any) -> _CompiledTransition:
+        source = self._keynames[index]
+        if transition is MISSING:
+            return (index + 1 if index + 1 < len(self._keynames) else END, None, None)
+        if isinstance(transition, Branch):
+            cases = {
+                case: self._resolve(source, target)
+                for case, target in transition.cases.items()
+            }
+            return (self._resolve(source, transition.default), cases, transition)
+        if transition is None or isinstance(transition, str):
+            return (self._resolve(source, transition), None, None)
+
+        raise InvalidStageGraph(
+            f"The '{source}' stage transition must be a keyname, a `Branch` or None.",
+            stage_keyname=source,
+        )
+
+    def _successors(self, index: int) -> List[int]:
+        default, cases, _ = self._table[index]
+        targets = {default, *(cases.values() if cases else ())}
+        targets.discard(END)
+        return sorted(targets)
+
+    def _check_reachability(self) -> None:
+        reached = {0}
+        stack = [0]
+        while stack:
+            for target in self._successors(stack.pop()):
+                if target not in reached:
+                    reached.add(target)
+                    stack.append(target)
+
+        for index, keyname in enumerate(self._keynames):
+            if index not in reached:
+                raise InvalidStageGraph(
+                    f"The '{keyname}' stage is unreachable.", stage_keyname=keyname
+                )
+
+    def _check_cycles(self) -> None:
+        # Iterative DFS, large questionnaires shouldn't hit the recursion limit
+        visiting, done = set(), set()
+        stack: List[Tuple[int, List[int]]] = [(0, self._successors(0))]
+        visiting.add(0)
+        while stack:
+            index, successors = stack[-1]
+            if not successors:
+                stack.pop()
+                visiting.discard(index)
+                done.add(index)
+                continue
+
+            target = successors.pop()
+            if target in visiting:
+                keyname = self._keynames[target]
+                raise InvalidStageGraph(
+                    f"The '{keyname}' stage is a part of a cycle.", stage_keyname=keyname
+                )
+            if target not in done:
+                visiting.add(target)
+                stack.append((target, self._successors(target)))
+
+    def __len__(self) -> int:
+        return len(self._keynames)
+
+    def get_keynames(self) -> Tuple[str, ...]:
+        return self._keynames
+
+    def get_keyname(self, index: int) -> str:
+        return self._keynames[index]
+
+    def index_of(self, keyname: str) -> int:
+        """Returns the index of the stage.
+
+        Raises:
+            KeyError: If there is no stage with the keyname.
+        """
+        index = self._indexes.get(keyname)
+        if index is None:
+            raise KeyError(f"There is no '{keyname}' stage in the dialog.")
+        return index
+
+    def next_index(self, index: int, value: Any) -> Optional[int]:
+        """Returns the index of the stage that follows the stage with the result, or None at the end."""
+        target, cases, branch = self._table[index]
+        if cases is not None:
+            try:
+                target = cases.get(branch.key(value), target)
+            except TypeError:
+                pass  # An unhashable result goes to the default target
+        return None if target == END else target
+
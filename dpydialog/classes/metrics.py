@@ -0,0 +1,165 @@
+import bisect
+from typing import TYPE_CHECKING, Any, Dict, List, MutableMapping, Optional, Sequence, Tuple
+
+import discord
+
+from .observer import DialogObserver
+
+if TYPE_CHECKING:
+    from .dialog import Dialog
+
+LabelsType = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+
+class Histogram:
+    """A cumulative histogram with fixed upper bounds, like the Prometheus one."""
+
+    __slots__ = ("_bounds", "_counts", "_sum", "_count")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self._bounds = tuple(sorted(bounds))
+        self._counts = [0] * (len(self._bounds) + 1)  # The last one is +Inf
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._bounds, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self._bounds + (float("inf"),), self._counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else repr(bound)] = cumulative
+        return {"buckets": buckets, "sum": self._sum, "count": self._count}
+
+
+class MetricsObserver(DialogObserver):
+    """An in-process metrics aggregator with counters and histograms.
+
+    Export the collected metrics with `as_dict` or `to_prometheus`. Stage keynames are
+    used as labels, so keep their number bounded.
+
+    Args:
+        prefix (str, optional): The prefix of the metric names. Defaults to "dpydialog".
+        buckets (Sequence[float], optional): Histogram bounds in seconds. Defaults to DEFAULT_BUCKETS.
+    """
+
+    def __init__(self, prefix: str = "dpydialog", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self._prefix = prefix
+        self._buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[LabelsType, int]] = {}
+        self._histograms: Dict[str, Dict[LabelsType, Histogram]] = {}
+
+    def increment(self, name: str, value: int = 1, **labels: str) -> None:
+        series = self._counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self._histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    def get_counter(self, name: str, **labels: str) -> int:
+        return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def reset(self) -> None:
+        self._counters.clear()
+        self._histograms.clear()
+
+    def on_dialog_start(self, dialog: "Dialog") -> None:
+        self.increment("dialogs_started_total")
+
+    def on_stage_render(
+        self,
+        dialog: "Dialog",
+        stage_keyname: str,
+        build_duration: float,
+        send_duration: float,
+    ) -> None:
+        self.observe("stage_build_seconds", build_duration, stage=stage_keyname)
+        self.observe("stage_send_seconds", send_duration, stage=stage_keyname)
+
+    def on_component_click(
+        self, dialog: "Dialog", stage_keyname: str, interaction: discord.Interaction
+    ) -> None:
+        self.increment("component_clicks_total", stage=stage_keyname)
+
+    def on_validation(
+        self, dialog: "Dialog", stage_keyname: str, duration: float, passed: bool
+    ) -> None:
+        outcome = "passed" if passed else "failed"
+        self.increment("validations_total", stage=stage_keyname, outcome=outcome)
+        self.observe("validation_seconds", duration, stage=stage_keyname)
+
+    def on_auth_denied(
+        self, dialog: "Dialog", stage_keyname: str, interaction: discord.Interaction
+    ) -> None:
+        self.increment("auth_denied_total", stage=stage_keyname)
+
+    def on_timeout(self, dialog: "Dialog", stage_keyname: str) -> None:
+        self.increment("dialogs_timed_out_total", stage=stage_keyname)
+
+    def on_close(self, dialog: "Dialog") -> None:
+        self.increment("dialogs_closed_total")
+
+    def on_success(self, dialog: "Dialog", result: MutableMapping[str, Any]) -> None:
+        self.increment("dialogs_completed_total")
+
+    @staticmethod
+    def _format_labels(labels: LabelsType, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (
+            (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for key, value in pairs
+        )
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "counters": {
+                name: [{"labels": dict(labels), "value": value} for labels, value in series.items()]
+                for name, series in self._counters.items()
+            },
+            "histograms": {
+                name: [
+                    {"labels": dict(labels), **histogram.as_dict()}
+                    for labels, histogram in series.items()
+                ]
+                for name, series in self._histograms.items()
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for name, series in sorted(self._counters.items()):
+            full_name = f"{self._prefix}_{name}"
+            lines.append(f"# TYPE {full_name} counter")
+            for labels, value in series.items():
+                lines.append(f"{full_name}{self._format_labels(labels)} {value}")
+
+        for name, series in sorted(self._histograms.items()):
+            full_name = f"{self._prefix}_{name}"
+            lines.append(f"# TYPE {full_name} histogram")
+            for labels, histogram in series.items():
+                data = histogram.as_dict()
+                for bound, count in data["buckets"].items():
+                    label_text = self._format_labels(labels, ("le", bound))
+                    lines.append(f"{full_name}_bucket{label_text} {count}")
+                label_text = self._format_labels(labels)
+                lines.append(f"{full_name}_sum{label_text} {data['sum']}")
+                lines.append(f"{full_name}_count{label_text} {data['count']}")
+
+        return "\n".join(lines) + "\n"
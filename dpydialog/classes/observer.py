@@ -0,0 +1,55 @@
+from typing import TYPE_CHECKING, Any, MutableMapping
+
+import discord
+
+if TYPE_CHECKING:
+    from .dialog import Dialog
+
+
+class DialogObserver:
+    """Receives the lifecycle events of dialogs.
+
+    All methods do nothing by default, override the ones you need. Methods are called
+    synchronously from the dialog code, so they should be fast and must not raise.
+    Durations are in seconds.
+    """
+
+    def on_dialog_start(self, dialog: "Dialog") -> None:
+        pass
+
+    def on_stage_render(
+        self,
+        dialog: "Dialog",
+        stage_keyname: str,
+        build_duration: float,
+        send_duration: float,
+    ) -> None:
+        """Called after a stage is shown.
+
+        `build_duration` is the time spent in `Stage.get_components`,
+        `send_duration` is the time spent in `DialogController.render`.
+        """
+
+    def on_component_click(
+        self, dialog: "Dialog", stage_keyname: str, interaction: discord.Interaction
+    ) -> None:
+        pass
+
+    def on_validation(
+        self, dialog: "Dialog", stage_keyname: str, duration: float, passed: bool
+    ) -> None:
+        pass
+
+    def on_auth_denied(
+        self, dialog: "Dialog", stage_keyname: str, interaction: discord.Interaction
+    ) -> None:
+        pass
+
+    def on_timeout(self, dialog: "Dialog", stage_keyname: str) -> None:
+        pass
+
+    def on_close(self, dialog: "Dialog") -> None:
+        pass
+
+    def on_success(self, dialog: "Dialog", result: MutableMapping[str, Any]) -> None:
+        pass
@@ -0,0 +1,233 @@
+import asyncio
+import inspect
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import discord
+
+OptionType = Union[discord.SelectOption, str]
+QueryType = Callable[
+    [int, int], Union[Sequence[OptionType], Awaitable[Sequence[OptionType]]]
+]
+ProviderSourceType = Union[
+    "OptionProvider",
+    Sequence[OptionType],
+    AsyncIterable[OptionType],
+    Callable[[], AsyncIterable[OptionType]],
+    QueryType,
+]
+
+
+def _to_option(item: OptionType) -> discord.SelectOption:
+    if isinstance(item, discord.SelectOption):
+        return item
+    return discord.SelectOption(label=str(item)[:100], value=str(item)[:100])
+
+
+class OptionProvider(ABC):
+    """A source of select options that is read page by page."""
+
+    @abstractmethod
+    async def fetch(self, offset: int, limit: int) -> List[discord.SelectOption]:
+        """Returns at most `limit` options starting at `offset`, an empty list past the end."""
+
+    def count(self) -> Optional[int]:
+        """Returns the number of options, or None if it isn't known without reading them."""
+        return None
+
+
+class SequenceProvider(OptionProvider):
+    """Reads options from a sequence, only the requested slice is converted to options."""
+
+    def __init__(self, items: Sequence[OptionType]):
+        self._items = items
+
+    async def fetch(self, offset: int, limit: int) -> List[discord.SelectOption]:
+        return [_to_option(item) for item in self._items[offset : offset + limit]]
+
+    def count(self) -> Optional[int]:
+        return len(self._items)
+
+
+class QueryProvider(OptionProvider):
+    """Reads options with a `query(offset, limit)` function, it can be a coroutine function."""
+
+    def __init__(self, query: QueryType):
+        self._query = query
+
+    async def fetch(self, offset: int, limit: int) -> List[discord.SelectOption]:
+        items = self._query(offset, limit)
+        if inspect.isawaitable(items):
+            items = await items
+        return [_to_option(item) for item in list(items)[:limit]]
+
+
+class AsyncIterableProvider(OptionProvider):
+    """Reads options from an async iterable.
+
+    The iterable is read sequentially and only the requested page is kept. Pages before
+    the current position are read again from a new iterator, so pass an async iterable
+    that can be iterated several times or a function creating one (e.g. an async
+    generator function). A one-shot async iterator can't go back.
+    """
+
+    def __init__(
+        self,
+        source: Union[AsyncIterable[OptionType], Callable[[], AsyncIterable[OptionType]]],
+    ):
+        self._source = source
+        self._iterator: Optional[AsyncIterator[OptionType]] = None
+        self._position = 0
+        self._exhausted = False
+
+    def _restart(self) -> None:
+        iterable = self._source() if callable(self._source) else self._source
+        iterator = iterable.__aiter__()
+        if iterator is self._iterator:
+            raise LookupError("A one-shot async iterator can't be read again.")
+
+        self._iterator = iterator
+        self._position = 0
+        self._exhausted = False
+
+    async def fetch(self, offset: int, limit: int) -> List[discord.SelectOption]:
+        if self._iterator is None or offset < self._position:
+            self._restart()
+
+        options: List[discord.SelectOption] = []
+        while not self._exhausted and len(options) < limit:
+            try:
+                item = await self._iterator.__anext__()
+            except StopAsyncIteration:
+                self._exhausted = True
+                break
+
+            if self._position >= offset:
+                options.append(_to_option(item))
+            self._position += 1
+        return options
+
+
+def make_provider(source: ProviderSourceType) -> OptionProvider:
+    """Wraps a sequence, an async iterable or a query function into an `OptionProvider`.
+
+    Raises:
+        TypeError: If the source isn't supported.
+    """
+    if isinstance(source, OptionProvider):
+        return source
+    if isinstance(source, Sequence) and not isinstance(source, str):
+        return SequenceProvider(source)
+    if hasattr(source, "__aiter__") or inspect.isasyncgenfunction(source):
+        return AsyncIterableProvider(source)
+    if callable(source):
+        return QueryProvider(source)
+    raise TypeError(
+        "Options provider must be a sequence, an async iterable or a query function."
+    )
+
+
+class PageCache:
+    """Loads pages from an `OptionProvider` and keeps the recently used ones.
+
+    At most `max_pages` pages are kept, the least recently used page is evicted first.
+    Loads of the same page share one provider call, and provider calls never overlap,
+    since sequential providers can't serve two positions at once.
+
+    Args:
+        provider (OptionProvider): The source of the options.
+        page_size (int, optional): Options per page, at most 25. Defaults to 25.
+        max_pages (int, optional): The number of cached pages. Defaults to 4.
+    """
+
+    def __init__(self, provider: OptionProvider, page_size: int = 25, max_pages: int = 4):
+        if not 1 <= page_size <= 25:
+            raise ValueError("Page size must be between 1 and 25.")
+        if max_pages < 1:
+            raise ValueError("The cache must keep at least one page.")
+
+        self._provider = provider
+        self._page_size = page_size
+        self._max_pages = max_pages
+        self._pages: "OrderedDict[int, List[discord.SelectOption]]" = OrderedDict()
+        self._loading: Dict[int, "asyncio.Future[List[discord.SelectOption]]"] = {}
+        self._lock = asyncio.Lock()
+
+    def get_page_size(self) -> int:
+        return self._page_size
+
+    def page_count(self) -> Optional[int]:
+        """Returns the number of pages, or None if the provider doesn't know its size."""
+        count = self._provider.count()
+        if count is None:
+            return None
+        return max(1, -(-count // self._page_size))
+
+    def peek(self, page: int) -> Optional[List[discord.SelectOption]]:
+        """Returns the page if it's cached, without loading it."""
+        return self._pages.get(page)
+
+    async def get(self, page: int) -> List[discord.SelectOption]:
+        options = self._pages.get(page)
+        if options is not None:
+            self._pages.move_to_end(page)
+            return options
+
+        loading = self._loading.get(page)
+        if loading is None:
+            loading = asyncio.ensure_future(self._load(page))
+            self._loading[page] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(page, None))
+        return await asyncio.shield(loading)
+
+    def prefetch(self, page: int) -> None:
+        """Starts loading the page in the background."""
+        if page < 0 or page in self._pages or page in self._loading:
+            return
+
+        count = self.page_count()
+        if count is not None and page >= count:
+            return
+
+        loading = asyncio.ensure_future(self._load(page))
+        self._loading[page] = loading
+        loading.add_done_callback(self._prefetch_done(page))
+
+    def _prefetch_done(self, page: int) -> Callable[["asyncio.Future[Any]"], None]:
+        def done(future: "asyncio.Future[Any]") -> None:
+            self._loading.pop(page, None)
+            if not future.cancelled():
+                # Failed prefetches are retried by `get`, the error isn't lost there
+                future.exception()
+
+        return done
+
+    async def _load(self, page: int) -> List[discord.SelectOption]:
+        async with self._lock:
+            options = await self._provider.fetch(
+                page * self._page_size, self._page_size
+            )
+
+        self._pages[page] = options
+        self._pages.move_to_end(page)
+        while len(self._pages) > self._max_pages:
+            self._pages.popitem(last=False)
+        return options
+
+    def clear(self) -> None:
+        for loading in self._loading.values():
+            loading.cancel()
+        self._loading.clear()
+        self._pages.clear()
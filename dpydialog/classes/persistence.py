@@ -0,0 +1,184 @@
+import asyncio
+import weakref
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import discord
+from discord.abc import MISSING
+
+from .dialog import CUSTOM_ID_PREFIX, Dialog
+from .storage.file import FileDialogStateStore
+from .template import DialogTemplate
+from ..interfaces.istore import IDialogStateStore
+
+
+class DialogPersistence:
+    """Starts persistent dialogs and resumes them after a restart or in another shard.
+
+    Dialogs started with `start` save their progress to the store after every transition
+    and use components with `dpyd:<dialog id>:<stage keyname>:<component index>` custom IDs.
+    When such a component is used and the dialog isn't alive in the current process,
+    `dispatch` loads the state, rebuilds the dialog from its template and runs the component.
+
+    Call `dispatch` from the `on_interaction` event:
+
+        persistence = DialogPersistence()
+        persistence.add_template("add-roles", ADD_ROLES)
+
+        @bot.event
+        async def on_interaction(interaction: discord.Interaction):
+            await persistence.dispatch(interaction)
+
+    Args:
+        store (Optional[IDialogStateStore], optional):
+            The state backend. Defaults to a `FileDialogStateStore` in the ".dpydialog" directory.
+    """
+
+    def __init__(self, store: Optional[IDialogStateStore] = None):
+        self._store = store if store is not None else FileDialogStateStore()
+        self._templates: Dict[str, DialogTemplate] = {}
+        # Dialogs alive in this process are dispatched by the discord.py view store
+        self._live: "weakref.WeakValueDictionary[str, Dialog]" = (
+            weakref.WeakValueDictionary()
+        )
+        # The dialogs being resumed and the clicks waiting for them
+        self._resuming: Dict[
+            str,
+            Tuple[
+                "asyncio.Future[Optional[Dialog]]",
+                List[Tuple[discord.Interaction, str]],
+            ],
+        ] = {}
+
+    def get_store(self) -> IDialogStateStore:
+        return self._store
+
+    def add_template(self, name: str, template: DialogTemplate) -> None:
+        if ":" in name:
+            raise ValueError("Template names can not contain the ':' character.")
+        self._templates[name] = template
+
+    def _create(
+        self,
+        name: str,
+        interaction: discord.Interaction,
+        message_sent: bool = False,
+        operator_ids: Optional[Sequence[int]] = MISSING,
+        user_id: Optional[int] = None,
+    ) -> Dialog:
+        template = self._templates.get(name)
+        if template is None:
+            raise KeyError(f"The '{name}' dialog template is not registered.")
+
+        controller = template._create_controller(interaction, message_sent, user_id)
+        dialog = template._instantiate(controller, operator_ids)
+        dialog.set_state_store(self._store, name)
+        return dialog
+
+    def start(
+        self,
+        name: str,
+        interaction: discord.Interaction,
+        operator_ids: Optional[Sequence[int]] = MISSING,
+    ) -> Dialog:
+        """Creates a persistent dialog from the registered template.
+
+        Raises:
+            KeyError: If there is no template with the given name.
+        """
+        dialog = self._create(name, interaction, operator_ids=operator_ids)
+        self._live[dialog.get_id()] = dialog
+        return dialog
+
+    async def dispatch(self, interaction: discord.Interaction) -> bool:
+        """Resumes the dialog the interaction belongs to.
+
+        Returns `True` if the interaction was handled by a resumed dialog. Clicks made
+        while the dialog is being resumed wait for it and are run by the same dialog.
+        """
+        if interaction.type != discord.InteractionType.component:
+            return False
+
+        custom_id = (interaction.data or {}).get("custom_id", "")
+        parts = custom_id.split(":", 2)
+        if len(parts) != 3 or parts[0] != CUSTOM_ID_PREFIX:
+            return False
+
+        _, dialog_id, rest = parts
+        keyname, _, index = rest.rpartition(":")
+        if not index.isdigit():
+            return False
+
+        resuming = self._resuming.get(dialog_id)
+        if resuming is not None:
+            # Clicked again while the dialog is resumed, e.g. a double click
+            future, clicks = resuming
+            clicks.append((interaction, keyname))
+            dialog = await future
+        elif dialog_id in self._live:
+            return False
+        else:
+            # Registered before loading the state, so later clicks wait for the same dialog
+            future = asyncio.get_running_loop().create_future()
+            clicks = [(interaction, keyname)]
+            self._resuming[dialog_id] = (future, clicks)
+            dialog = None
+            try:
+                dialog = await self._resume(dialog_id, interaction)
+                if dialog is not None:
+                    # Every click made during the resume was made on the restored version
+                    for click, click_keyname in clicks:
+                        dialog._on_interaction(click, click_keyname)
+            finally:
+                del self._resuming[dialog_id]
+                future.set_result(dialog)
+
+        if dialog is None:
+            return False
+        return await self._run(dialog, interaction, keyname, custom_id)
+
+    async def _resume(
+        self, dialog_id: str, interaction: discord.Interaction
+    ) -> Optional[Dialog]:
+        state = await self._store.load(dialog_id)
+        if state is None or state.template_name not in self._templates:
+            return None
+
+        # The interaction belongs to whoever clicked, the dialog still belongs to its owner
+        dialog = self._create(
+            state.template_name, interaction, message_sent=True, user_id=state.user_id
+        )
+        dialog._restore_state(state)
+        dialog._start_timers()
+        self._live[dialog_id] = dialog
+        return dialog
+
+    async def _run(
+        self,
+        dialog: Dialog,
+        interaction: discord.Interaction,
+        keyname: str,
+        custom_id: str,
+    ) -> bool:
+        stage = dialog._stages[dialog._current_stage_index]
+        if stage.get_keyname() != keyname:
+            # A component of an outdated stage, the message was already moved on
+            await interaction.response.defer()
+            return True
+
+        await stage.prepare()
+        view = stage.get_components().view
+        if interaction.message is not None:
+            # The next clicks on this message are dispatched by discord.py itself
+            interaction.client.add_view(view, message_id=interaction.message.id)
+
+        for item in view.children:
+            if getattr(item, "custom_id", None) == custom_id:
+                item._refresh_state(interaction, interaction.data)
+                try:
+                    await item.callback(interaction)
+                except Exception as e:
+                    # Handled like the discord.py view store does for the live views
+                    await view.on_error(interaction, e, item)
+                return True
+
+        return False
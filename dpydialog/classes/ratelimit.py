@@ -0,0 +1,75 @@
+import time
+from typing import Dict, Optional
+
+
+class TokenBucket:
+    """A token bucket that hands out reservations instead of rejecting requests.
+
+    `reserve` always takes a token and returns how many seconds the caller has to wait
+    before using it, so concurrent callers are queued fairly.
+    """
+
+    __slots__ = ("_rate", "_capacity", "_tokens", "_updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        self._refill(time.monotonic())
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self._tokens >= self._capacity
+
+
+class ChannelRateLimiter:
+    """Per-channel token buckets shared by the controllers of many dialogs.
+
+    Args:
+        rate (int, optional): The number of edits allowed per `per` seconds. Defaults to 5.
+        per (float, optional): The length of the window in seconds. Defaults to 5.0.
+        burst (Optional[int], optional): The bucket capacity. Defaults to `rate`.
+        max_channels (int, optional): Full buckets are pruned when there are more channels. Defaults to 10000.
+    """
+
+    def __init__(
+        self,
+        rate: int = 5,
+        per: float = 5.0,
+        burst: Optional[int] = None,
+        max_channels: int = 10000,
+    ):
+        if rate < 1 or per <= 0:
+            raise ValueError("The rate limit must allow at least one edit per window.")
+
+        self._rate = rate / per
+        self._capacity = float(burst if burst is not None else rate)
+        self._max_channels = max_channels
+        self._buckets: Dict[int, TokenBucket] = {}
+
+    def reserve(self, channel_id: Optional[int]) -> float:
+        """Takes a token of the channel and returns the seconds to wait before the edit."""
+        bucket = self._buckets.get(channel_id)
+        if bucket is None:
+            if len(self._buckets) >= self._max_channels:
+                self._prune()
+            bucket = self._buckets[channel_id] = TokenBucket(self._rate, self._capacity)
+        return bucket.reserve()
+
+    def _prune(self) -> None:
+        for channel_id in [key for key, bucket in self._buckets.items() if bucket.is_full()]:
+            del self._buckets[channel_id]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,222 @@
+import asyncio
+import inspect
+import sys
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set
+
+from ..data import RegistryStats
+from ..utils import get_slot_names
+
+if TYPE_CHECKING:
+    from .dialog import Dialog
+
+
+EvictCallbackType = Callable[["Dialog", str], Any]
+
+EVICT_LRU = "lru"
+EVICT_TTL = "ttl"
+EVICT_USER_LIMIT = "user_limit"
+
+
+def _approximate_size(obj: Any, seen: Set[int]) -> int:
+    """Sums `sys.getsizeof` over the containers and the dpydialog objects reachable from `obj`.
+
+    Objects of other libraries (views, members, roles) are counted shallowly, since
+    they are usually shared with the discord.py cache.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += _approximate_size(key, seen) + _approximate_size(value, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += _approximate_size(item, seen)
+    elif type(obj).__module__.startswith("dpydialog"):
+        if hasattr(obj, "__dict__"):
+            size += _approximate_size(obj.__dict__, seen)
+        # Slotted objects keep their attributes outside of `__dict__`
+        for name in get_slot_names(type(obj)):
+            size += _approximate_size(getattr(obj, name, None), seen)
+    return size
+
+
+class DialogRegistry:
+    """A bounded registry of the live dialogs.
+
+    The registry keeps dialogs in the least-recently-used order. When a limit is hit,
+    the oldest dialog is evicted: it's removed from the registry and disposed
+    (see `Dialog.dispose`), and `on_evict` is called with the dialog and the eviction reason
+    (`"lru"`, `"ttl"` or `"user_limit"`).
+
+    With a `ttl`, expired dialogs are swept every `sweep_interval` seconds while the
+    registry isn't empty, and on every `add`. `evict_expired` sweeps them on demand.
+
+    Args:
+        max_dialogs (int, optional): The maximum number of live dialogs. Defaults to 10000.
+        ttl (Optional[float], optional):
+            Seconds of inactivity after which a dialog is evicted. If None, then dialogs never expire.
+            Defaults to None.
+        max_per_user (Optional[int], optional):
+            The maximum number of live dialogs of a single user. Defaults to None.
+        on_evict (Optional[EvictCallbackType], optional):
+            Cleanup hook, it can be a coroutine function. Defaults to None.
+        sweep_interval (Optional[float], optional):
+            Seconds between the sweeps of expired dialogs. Defaults to the `ttl`.
+
+    Raises:
+        ValueError: When a limit is less than 1 or an interval isn't positive.
+    """
+
+    def __init__(
+        self,
+        max_dialogs: int = 10000,
+        ttl: Optional[float] = None,
+        max_per_user: Optional[int] = None,
+        on_evict: Optional[EvictCallbackType] = None,
+        sweep_interval: Optional[float] = None,
+    ):
+        if max_dialogs < 1:
+            raise ValueError("The registry must allow at least one dialog.")
+        if max_per_user is not None and max_per_user < 1:
+            raise ValueError("The registry must allow at least one dialog per user.")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("The ttl must be positive.")
+        if sweep_interval is not None and sweep_interval <= 0:
+            raise ValueError("The sweep interval must be positive.")
+
+        self._max_dialogs = max_dialogs
+        self._ttl = ttl
+        self._max_per_user = max_per_user
+        self._on_evict = on_evict
+        self._sweep_interval = sweep_interval if sweep_interval is not None else ttl
+        self._sweep_timer: Optional[asyncio.TimerHandle] = None
+        # Running `on_evict` coroutines, the event loop only keeps weak references to them
+        self._evict_tasks: Set["asyncio.Future[Any]"] = set()
+
+        # dialog ID -> (dialog, last activity), ordered from the least recently used
+        self._dialogs: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._by_user: Dict[int, "OrderedDict[str, None]"] = {}
+        self._evictions: Dict[str, int] = {
+            EVICT_LRU: 0,
+            EVICT_TTL: 0,
+            EVICT_USER_LIMIT: 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._dialogs)
+
+    def __contains__(self, dialog_id: str) -> bool:
+        return dialog_id in self._dialogs
+
+    def get(self, dialog_id: str) -> Optional["Dialog"]:
+        entry = self._dialogs.get(dialog_id)
+        return None if entry is None else entry[0]
+
+    def add(self, dialog: "Dialog") -> None:
+        dialog_id = dialog.get_id()
+        if dialog_id in self._dialogs:
+            return self.touch(dialog_id)
+
+        self.evict_expired()
+
+        user_id = dialog.get_user_id()
+        user_dialogs = self._by_user.setdefault(user_id, OrderedDict())
+        if self._max_per_user is not None:
+            while len(user_dialogs) >= self._max_per_user:
+                self._evict(next(iter(user_dialogs)), EVICT_USER_LIMIT)
+
+        while len(self._dialogs) >= self._max_dialogs:
+            self._evict(next(iter(self._dialogs)), EVICT_LRU)
+
+        self._dialogs[dialog_id] = [dialog, time.monotonic()]
+        self._by_user.setdefault(user_id, user_dialogs)[dialog_id] = None
+        self._schedule_sweep()
+
+    def touch(self, dialog_id: str) -> None:
+        entry = self._dialogs.get(dialog_id)
+        if entry is None:
+            return
+
+        entry[1] = time.monotonic()
+        self._dialogs.move_to_end(dialog_id)
+
+        user_dialogs = self._by_user.get(entry[0].get_user_id())
+        if user_dialogs is not None:
+            user_dialogs.move_to_end(dialog_id)
+
+    def discard(self, dialog_id: str) -> Optional["Dialog"]:
+        entry = self._dialogs.pop(dialog_id, None)
+        if entry is None:
+            return None
+
+        user_id = entry[0].get_user_id()
+        user_dialogs = self._by_user.get(user_id)
+        if user_dialogs is not None:
+            user_dialogs.pop(dialog_id, None)
+            if not user_dialogs:
+                del self._by_user[user_id]
+        return entry[0]
+
+    def evict_expired(self) -> int:
+        """Evicts the dialogs inactive for longer than `ttl`, returns their count."""
+        if self._ttl is None:
+            return 0
+
+        deadline = time.monotonic() - self._ttl
+        expired = []
+        for dialog_id, (_, last_activity) in self._dialogs.items():
+            if last_activity > deadline:
+                break
+            expired.append(dialog_id)
+
+        for dialog_id in expired:
+            self._evict(dialog_id, EVICT_TTL)
+        return len(expired)
+
+    def _schedule_sweep(self) -> None:
+        if self._ttl is None or self._sweep_timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside of the event loop, the next `add` schedules it
+            return
+        self._sweep_timer = loop.call_later(self._sweep_interval, self._sweep)
+
+    def _sweep(self) -> None:
+        self._sweep_timer = None
+        self.evict_expired()
+        if self._dialogs:
+            self._schedule_sweep()
+
+    def _evict(self, dialog_id: str, reason: str) -> None:
+        dialog = self.discard(dialog_id)
+        if dialog is None:
+            return
+
+        self._evictions[reason] += 1
+        dialog.dispose()
+
+        if self._on_evict is not None:
+            result = self._on_evict(dialog, reason)
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._evict_tasks.add(task)
+                task.add_done_callback(self._evict_tasks.discard)
+
+    def get_stats(self) -> RegistryStats:
+        seen: Set[int] = set()
+        approx_bytes = sum(
+            _approximate_size(dialog, seen) for dialog, _ in self._dialogs.values()
+        )
+        return RegistryStats(
+            live=len(self._dialogs),
+            users=len(self._by_user),
+            approx_bytes=approx_bytes,
+            evictions=dict(self._evictions),
+        )
@@ -0,0 +1,197 @@
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import discord
+
+from .pagination import OptionType, _to_option
+
+# Indexes shared between dialogs, see `SearchIndex.shared`
+_SHARED_INDEXES: "OrderedDict[Hashable, SearchIndex]" = OrderedDict()
+MAX_SHARED_INDEXES = 32
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return " ".join(
+        "".join(char for char in text if not unicodedata.combining(char)).split()
+    )
+
+
+def _trigrams(text: str) -> List[str]:
+    padded = f"  {text} "
+    return list({padded[index : index + 3] for index in range(len(padded) - 2)})
+
+
+class SearchIndex:
+    """An in-memory index for searching select options by their labels.
+
+    Labels are normalized (case, accents and whitespace) and indexed in two sorted
+    key arrays that work as a flattened prefix trie: one with the whole labels and
+    one with every word suffix of the labels, so "juice" finds "Orange Juice".
+    A lookup is a binary search followed by a scan of at most `limit` keys, so it
+    doesn't depend on the number of options.
+
+    When the prefix matches don't fill the result, an optional trigram index adds
+    fuzzy matches ranked by the trigram similarity, so "oragne" still finds "Orange".
+
+    Build the index once per option set, e.g. with `SearchIndex.shared`, it's immutable
+    and can be used by any number of dialogs.
+
+    Args:
+        options (Sequence[OptionType]): Select options or strings used as both labels and values.
+        fuzzy (bool, optional): Whether to build the trigram index. Defaults to True.
+        min_similarity (float, optional): The minimum trigram similarity of fuzzy matches. Defaults to 0.3.
+        cache_size (int, optional): The number of the recent query results kept. Defaults to 256.
+    """
+
+    __slots__ = (
+        "_options",
+        "_labels",
+        "_label_ids",
+        "_words",
+        "_word_ids",
+        "_trigram_ids",
+        "_trigram_counts",
+        "_min_similarity",
+        "_cache",
+        "_cache_size",
+        "_source",
+    )
+
+    def __init__(
+        self,
+        options: Sequence[OptionType],
+        fuzzy: bool = True,
+        min_similarity: float = 0.3,
+        cache_size: int = 256,
+    ):
+        self._options: Tuple[discord.SelectOption, ...] = tuple(
+            _to_option(option) for option in options
+        )
+        self._min_similarity = min_similarity
+        self._cache: "OrderedDict[Tuple[str, int], Tuple[int, ...]]" = OrderedDict()
+        self._cache_size = cache_size
+        self._source: Any = None
+
+        self._trigram_ids: Optional[Dict[str, array]] = {} if fuzzy else None
+        self._trigram_counts: Optional[array] = array("H") if fuzzy else None
+
+        labels: List[Tuple[str, int]] = []
+        words: List[Tuple[str, int]] = []
+        for index, option in enumerate(self._options):
+            label = _normalize(option.label)
+            labels.append((label, index))
+
+            position = label.find(" ")
+            while position != -1:
+                words.append((label[position + 1 :], index))
+                position = label.find(" ", position + 1)
+
+            if fuzzy:
+                self._index_trigrams(index, label)
+
+        labels.sort()
+        words.sort()
+        self._labels: List[str] = [key for key, _ in labels]
+        self._label_ids = array("I", (index for _, index in labels))
+        self._words: List[str] = [key for key, _ in words]
+        self._word_ids = array("I", (index for _, index in words))
+
+    def _index_trigrams(self, index: int, label: str) -> None:
+        trigrams = _trigrams(label)
+        self._trigram_counts.append(min(len(trigrams), 0xFFFF))
+        for trigram in trigrams:
+            postings = self._trigram_ids.get(trigram)
+            if postings is None:
+                postings = self._trigram_ids[trigram] = array("I")
+            postings.append(index)
+
+    @classmethod
+    def shared(
+        cls, options: Sequence[OptionType], key: Optional[Hashable] = None, **kwargs: Any
+    ) -> "SearchIndex":
+        """Returns the index of the option set, it's built only on the first call.
+
+        Indexes are shared by `key`, or by the identity of `options` if there is no key.
+        The most recently used `MAX_SHARED_INDEXES` indexes are kept.
+        """
+        key = ("id", id(options)) if key is None else ("key", key)
+        index = _SHARED_INDEXES.get(key)
+        if index is None:
+            index = cls(options, **kwargs)
+            # Keeps the source alive, so its identity isn't reused while cached
+            index._source = options
+            _SHARED_INDEXES[key] = index
+            while len(_SHARED_INDEXES) > MAX_SHARED_INDEXES:
+                _SHARED_INDEXES.popitem(last=False)
+        else:
+            _SHARED_INDEXES.move_to_end(key)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._options)
+
+    def get_options(self) -> Tuple[discord.SelectOption, ...]:
+        return self._options
+
+    def search(self, query: str, limit: int = 25) -> List[discord.SelectOption]:
+        """Returns at most `limit` options matching the query, the best matches first.
+
+        Label prefix matches come first, then word prefix matches, both in
+        alphabetical order, then fuzzy matches by similarity. An empty query
+        returns the first options.
+        """
+        query = _normalize(query)
+        if not query:
+            return list(self._options[:limit])
+
+        cache_key = (query, limit)
+        ids = self._cache.get(cache_key)
+        if ids is None:
+            ids = self._search(query, limit)
+            self._cache[cache_key] = ids
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(cache_key)
+        return [self._options[index] for index in ids]
+
+    def _search(self, query: str, limit: int) -> Tuple[int, ...]:
+        found: Dict[int, None] = {}
+        for keys, ids in ((self._labels, self._label_ids), (self._words, self._word_ids)):
+            position = bisect_left(keys, query)
+            while (
+                len(found) < limit
+                and position < len(keys)
+                and keys[position].startswith(query)
+            ):
+                found.setdefault(ids[position])
+                position += 1
+
+        if len(found) < limit and self._trigram_ids is not None and len(query) >= 3:
+            for index in self._fuzzy(query, limit):
+                if len(found) >= limit:
+                    break
+                found.setdefault(index)
+
+        return tuple(found)
+
+    def _fuzzy(self, query: str, limit: int) -> List[int]:
+        trigrams = _trigrams(query)
+        shared: "Counter[int]" = Counter()
+        for trigram in trigrams:
+            postings = self._trigram_ids.get(trigram)
+            if postings is not None:
+                shared.update(postings)
+
+        scored = []
+        for index, common in shared.items():
+            similarity = common / (len(trigrams) + self._trigram_counts[index] - common)
+            if similarity >= self._min_similarity:
+                scored.append((-similarity, index))
+
+        scored.sort()
+        return [index for _, index in scored[: limit * 2]]
@@ -0,0 +1,161 @@
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+import discord
+
+from .stage import Stage
+from .validation import ValidationCallbackType
+from ..components.button import DButton
+from ..components.role_select import DRoleSelect
+from ..components.select import DSelect
+from ..components.user_select import DUserSelect
+from ...data import StageAction, StageComponents
+from ...errors import ValidationError
+from ...interfaces.icomponent import IComponent
+
+FieldType = Union[DSelect, DUserSelect, DRoleSelect]
+
+
+class FormStage(Stage):
+    """A stage that collects the values of several selects and submits them at once.
+
+    Every field is a select without an action. A pick only stores the values in the
+    stage and acknowledges the interaction, the message isn't edited. A component with
+    the `StageAction.SUBMIT` action validates the collected values and completes the
+    stage; if the components have none, a "Submit" button is added.
+
+    The result is a dict of field name -> the list of the selected values, so a form
+    with several selects takes one stage and one message edit instead of one per select.
+    When the stage is shown again, e.g. after BACK, the selects show the stored values.
+
+    Args:
+        keyname (str): Unique identifier for the stage
+        components (List[IComponent]): Additional UI components for this stage
+        fields (Mapping[str, FieldType]): Field name -> the select collecting its values.
+        required (Optional[Sequence[str]], optional):
+            Fields that must be filled before submitting. If None, then all fields are required.
+            Defaults to None.
+        submit_label (str, optional): The label of the added "Submit" button. Defaults to "Submit".
+
+        See `Stage` for the rest of the arguments.
+
+    Raises:
+        ValueError: When a field isn't a select, has an action or a required field is unknown.
+        ValidationError: When the form is submitted with empty required fields.
+    """
+
+    __slots__ = (
+        "_fields",
+        "_field_names",
+        "_required",
+        "_values",
+    )
+
+    def __init__(
+        self,
+        keyname: str,
+        components: List[IComponent],
+        fields: Mapping[str, FieldType],
+        content: Optional[str] = None,
+        embeds: Optional[List[discord.Embed]] = [],
+        validation_func: Optional[
+            Union[ValidationCallbackType, Sequence[ValidationCallbackType]]
+        ] = None,
+        timeout: float = 180.0,
+        validation_timeout: Optional[float] = None,
+        validation_executor: Optional[Executor] = None,
+        required: Optional[Sequence[str]] = None,
+        submit_label: str = "Submit",
+    ):
+        if not fields:
+            raise ValueError("Form stage must have at least one field.")
+
+        for name, field in fields.items():
+            if not isinstance(field, (DSelect, DUserSelect, DRoleSelect)):
+                raise ValueError(f"The '{name}' field must be a select component.")
+            if field.get_action() is not None:
+                raise ValueError(f"The '{name}' field must not have an action.")
+
+        self._fields: Dict[str, FieldType] = dict(fields)
+        # id(select) -> field name, the field callback is shared by all selects
+        self._field_names: Dict[int, str] = {
+            id(field): name for name, field in self._fields.items()
+        }
+        self._required = tuple(self._fields if required is None else required)
+        for name in self._required:
+            if name not in self._fields:
+                raise ValueError(f"The required '{name}' field isn't a field of the form.")
+        self._values: Dict[str, List[Any]] = {}
+
+        for field in self._fields.values():
+            field._replace_function(self._on_field)
+
+        extra: List[IComponent] = []
+        if not any(component.get_action() == StageAction.SUBMIT for component in components):
+            extra.append(
+                DButton(
+                    label=submit_label,
+                    style=discord.ButtonStyle.primary,
+                    action=StageAction.SUBMIT,
+                )
+            )
+
+        super().__init__(
+            keyname=keyname,
+            components=[*components, *self._fields.values(), *extra],
+            content=content,
+            embeds=embeds,
+            validation_func=validation_func,
+            timeout=timeout,
+            validation_timeout=validation_timeout,
+            validation_executor=validation_executor,
+        )
+
+    def get_values(self) -> Dict[str, List[Any]]:
+        return dict(self._values)
+
+    def dispose(self) -> None:
+        super().dispose()
+        self._values.clear()
+
+    def _process_components_actions(self) -> None:
+        super()._process_components_actions()
+        for component in self._components:
+            if component._get_stage_action() == StageAction.SUBMIT:
+                component._replace_function(self._on_submit)
+
+    def _apply_values(self) -> None:
+        for name, field in self._fields.items():
+            values = self._values.get(name)
+            if isinstance(field, DSelect):
+                picked = set(values or ())
+                for option in field.options:
+                    option.default = option.value in picked
+            else:
+                field.default_values = values or []
+
+    def get_components(self) -> StageComponents:
+        self._apply_values()
+        return super().get_components()
+
+    async def _on_field(self, interaction: discord.Interaction, field: FieldType) -> None:
+        name = self._field_names[id(field)]
+        if field.values:
+            self._values[name] = list(field.values)
+        else:
+            self._values.pop(name, None)
+
+        if not interaction.response.is_done():
+            await interaction.response.defer()
+
+    async def _on_submit(self, interaction: discord.Interaction, _) -> None:
+        missing = [name for name in self._required if name not in self._values]
+        if missing:
+            raise ValidationError(
+                f"Fill the {', '.join(repr(name) for name in missing)} field(s) "
+                f"of the '{self._keyname}' stage.",
+                stage_keyname=self._keyname,
+            )
+        await self._complete(
+            interaction, {name: self._values.get(name, []) for name in self._fields}
+        )
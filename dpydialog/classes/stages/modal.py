@@ -0,0 +1,159 @@
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import discord
+
+from .stage import Stage
+from .validation import ValidationCallbackType
+from ..components.button import DButton
+from ..components.modal import DModal, ModalSchema
+from ...data import ModalOption, StageAction, StageComponents
+from ...errors import DialogException
+from ...interfaces.icomponent import IComponent
+
+
+class ModalStage(Stage):
+    """A stage that asks for several text values with one modal.
+
+    A component with the `StageAction.ENTER_MANUALLY` action opens the modal; if the
+    components have none, a button is added. The submitted texts are parsed with
+    `ModalOption.parse`, so the options declare their type (`coerce`) and format
+    (`pattern`). The result is a dict of varname -> the parsed value, or
+    `result_type(**values)` when a result type (e.g. a dataclass) is given.
+
+    Invalid inputs don't complete the stage: all the errors are listed in the
+    message at once and the modal is opened again with the submitted texts.
+
+    Args:
+        keyname (str): Unique identifier for the stage
+        components (List[IComponent]): Additional UI components for this stage
+        title (str): The title of the modal.
+        options (Union[Sequence[ModalOption], ModalSchema]):
+            The inputs of the modal, at most 5. Pass a `ModalSchema` to share the compiled
+            inputs between the dialogs of a template.
+        result_type (Optional[Callable[..., Any]], optional):
+            Called with the parsed values as keyword arguments to build the result. Defaults to None.
+        button_label (str, optional): The label of the added button. Defaults to "Fill in".
+
+        See `Stage` for the rest of the arguments.
+
+    Raises:
+        ValueError: When the options are invalid, see `ModalSchema`.
+    """
+
+    __slots__ = (
+        "_title",
+        "_schema",
+        "_options",
+        "_result_type",
+        "_submitted",
+        "_errors",
+    )
+
+    def __init__(
+        self,
+        keyname: str,
+        components: List[IComponent],
+        title: str,
+        options: Union[Sequence[ModalOption], ModalSchema],
+        content: Optional[str] = None,
+        embeds: Optional[List[discord.Embed]] = [],
+        validation_func: Optional[
+            Union[ValidationCallbackType, Sequence[ValidationCallbackType]]
+        ] = None,
+        timeout: float = 180.0,
+        validation_timeout: Optional[float] = None,
+        validation_executor: Optional[Executor] = None,
+        result_type: Optional[Callable[..., Any]] = None,
+        button_label: str = "Fill in",
+    ):
+        self._title = title
+        self._schema = options if isinstance(options, ModalSchema) else ModalSchema(options)
+        self._options = self._schema.get_options()
+        self._result_type = result_type
+        # The texts of the latest invalid submission and the errors by varname
+        self._submitted: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+
+        extra: List[IComponent] = []
+        if not any(
+            component.get_action() == StageAction.ENTER_MANUALLY for component in components
+        ):
+            extra.append(
+                DButton(
+                    label=button_label,
+                    style=discord.ButtonStyle.primary,
+                    action=StageAction.ENTER_MANUALLY,
+                )
+            )
+
+        super().__init__(
+            keyname=keyname,
+            components=[*components, *extra],
+            content=content,
+            embeds=embeds,
+            validation_func=validation_func,
+            timeout=timeout,
+            validation_timeout=validation_timeout,
+            validation_executor=validation_executor,
+        )
+
+    def get_errors(self) -> Dict[str, str]:
+        return dict(self._errors)
+
+    def dispose(self) -> None:
+        super().dispose()
+        self._submitted.clear()
+        self._errors.clear()
+
+    def _process_components_actions(self) -> None:
+        super()._process_components_actions()
+        for component in self._components:
+            if component._get_stage_action() == StageAction.ENTER_MANUALLY:
+                component._replace_function(self._on_open)
+
+    def get_components(self) -> StageComponents:
+        components = super().get_components()
+        if not self._errors:
+            return components
+
+        labels = {option.varname: option.label for option in self._options}
+        lines = [f"**{labels[varname]}** {error}" for varname, error in self._errors.items()]
+        if components.content:
+            lines.insert(0, components.content)
+        return StageComponents(
+            content="\n".join(lines), embeds=components.embeds, view=components.view
+        )
+
+    def _build_modal(self) -> DModal:
+        defaults = {varname: text for varname, text in self._submitted.items() if text}
+        return self._schema.build(self._on_submit, self._title, defaults=defaults)
+
+    async def _on_open(self, interaction: discord.Interaction, _) -> None:
+        await interaction.response.send_modal(self._build_modal())
+
+    async def _on_submit(self, interaction: discord.Interaction, modal: DModal) -> None:
+        # Modal submissions don't pass the view, the dialog still has to see them
+        self._on_view_interaction(interaction)
+
+        texts = modal.get_values()
+        values: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for option in self._options:
+            try:
+                values[option.varname] = option.parse(texts.get(option.varname) or "")
+            except ValueError as e:
+                errors[option.varname] = str(e)
+
+        self._submitted = texts
+        self._errors = errors
+        if errors:
+            return await self._refresh_callback(interaction, None)
+
+        result = values if self._result_type is None else self._result_type(**values)
+        try:
+            await self._complete(interaction, result)
+        except DialogException as e:
+            # Modals aren't a part of the view, so its error hook doesn't see these errors
+            if self._error_callback is None or not await self._error_callback(interaction, e):
+                raise
@@ -0,0 +1,231 @@
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Sequence, Union
+
+import discord
+
+from .stage import Stage
+from .validation import ValidationCallbackType
+from ..components.button import DButton
+from ..components.select import DSelect
+from ..pagination import PageCache, ProviderSourceType, make_provider
+from ...data import StageComponents
+from ...errors import ValidationError
+from ...interfaces.icomponent import IComponent
+
+# Discord requires at least one option even in a disabled select
+_EMPTY_OPTION = discord.SelectOption(label="Nothing to select", value="-")
+
+
+class PaginatedSelectStage(Stage):
+    """A stage with a select over any number of options, shown page by page.
+
+    Options are pulled from the provider one page at a time: a sequence, an async
+    iterable or a `query(offset, limit)` function, see `make_provider`. Recently used
+    pages are cached and the next page is prefetched in the background, so memory
+    stays proportional to `max_cached_pages`, not to the whole dataset.
+
+    With `max_values` of 1 picking an option completes the stage. Otherwise the
+    selections are kept across pages and the "Done" button completes the stage.
+    The result is a list of the selected option values.
+
+    The select takes the row 0 and the page buttons take the row 4, place the
+    other components (e.g. BACK and CLOSE buttons) in the rows 1-3.
+
+    Args:
+        keyname (str): Unique identifier for the stage
+        components (List[IComponent]): Additional UI components for this stage
+        provider (ProviderSourceType): The source of the options.
+        page_size (int, optional): Options per page, at most 25. Defaults to 25.
+        max_cached_pages (int, optional): The number of pages kept in memory. Defaults to 4.
+        placeholder (Optional[str], optional): Placeholder text of the select. Defaults to None.
+        min_values (int, optional): The minimum number of selected options. Defaults to 1.
+        max_values (int, optional): The maximum number of selected options. Defaults to 1.
+
+        See `Stage` for the rest of the arguments.
+
+    Raises:
+        ValidationError: When "Done" is used with fewer than `min_values` selected options.
+    """
+
+    __slots__ = (
+        "_cache",
+        "_page",
+        "_end",
+        "_options",
+        "_min_values",
+        "_max_values",
+        "_selected",
+        "_select",
+        "_previous_button",
+        "_page_button",
+        "_next_button",
+        "_done_button",
+    )
+
+    def __init__(
+        self,
+        keyname: str,
+        components: List[IComponent],
+        provider: ProviderSourceType,
+        content: Optional[str] = None,
+        embeds: Optional[List[discord.Embed]] = [],
+        validation_func: Optional[
+            Union[ValidationCallbackType, Sequence[ValidationCallbackType]]
+        ] = None,
+        timeout: float = 180.0,
+        validation_timeout: Optional[float] = None,
+        validation_executor: Optional[Executor] = None,
+        page_size: int = 25,
+        max_cached_pages: int = 4,
+        placeholder: Optional[str] = None,
+        min_values: int = 1,
+        max_values: int = 1,
+    ):
+        if max_values < 1 or not 0 <= min_values <= max_values:
+            raise ValueError("Expected 0 <= min_values <= max_values and max_values >= 1.")
+
+        self._cache = PageCache(
+            make_provider(provider), page_size=page_size, max_pages=max_cached_pages
+        )
+        self._page = 0
+        self._end: Optional[int] = None  # The first page known to be empty
+        self._options: Optional[List[discord.SelectOption]] = None
+        self._min_values = min_values
+        self._max_values = max_values
+        # value -> option, in the selection order
+        self._selected: Dict[str, discord.SelectOption] = {}
+
+        self._select = DSelect(
+            options=[_EMPTY_OPTION],
+            placeholder=placeholder,
+            row=0,
+            action=self._on_select,
+        )
+        self._previous_button = DButton(emoji="◀️", row=4, action=self._on_previous)
+        self._page_button = DButton(label="1", row=4, disabled=True)
+        self._next_button = DButton(emoji="▶️", row=4, action=self._on_next)
+        paging = [self._select, self._previous_button, self._page_button, self._next_button]
+        self._done_button: Optional[DButton] = None
+        if max_values > 1:
+            self._done_button = DButton(
+                label="Done", style=discord.ButtonStyle.primary, row=4, action=self._on_done
+            )
+            paging.append(self._done_button)
+
+        super().__init__(
+            keyname=keyname,
+            components=[*components, *paging],
+            content=content,
+            embeds=embeds,
+            validation_func=validation_func,
+            timeout=timeout,
+            validation_timeout=validation_timeout,
+            validation_executor=validation_executor,
+        )
+
+    def get_page(self) -> int:
+        return self._page
+
+    def get_selected(self) -> List[str]:
+        return list(self._selected)
+
+    def dispose(self) -> None:
+        super().dispose()
+        self._cache.clear()
+        self._options = None
+        self._selected.clear()
+
+    async def prepare(self) -> None:
+        self._options = await self._cache.get(self._page)
+        self._cache.prefetch(self._page + 1)
+
+    def _has_next_page(self) -> bool:
+        if self._end is not None and self._page + 1 >= self._end:
+            return False
+
+        count = self._cache.page_count()
+        if count is not None:
+            return self._page + 1 < count
+
+        next_page = self._cache.peek(self._page + 1)
+        if next_page is not None:
+            return len(next_page) > 0
+        return len(self._options or ()) == self._cache.get_page_size()
+
+    def _apply_page(self) -> None:
+        options = self._options or []
+        select = self._select
+
+        if not options:
+            select.options = [_EMPTY_OPTION]
+            select.min_values = select.max_values = 1
+            select.disabled = True
+        elif self._max_values == 1:
+            select.options = options
+            select.min_values = select.max_values = 1
+            select.disabled = False
+        else:
+            page_values = {option.value for option in options}
+            elsewhere = sum(1 for value in self._selected if value not in page_values)
+            select.options = [
+                discord.SelectOption(
+                    label=option.label,
+                    value=option.value,
+                    description=option.description,
+                    emoji=option.emoji,
+                    default=option.value in self._selected,
+                )
+                for option in options
+            ]
+            select.min_values = 0
+            select.max_values = max(1, min(len(options), self._max_values - elsewhere))
+            select.disabled = False
+
+        count = self._cache.page_count()
+        self._page_button.label = (
+            f"{self._page + 1}/{count}" if count is not None else str(self._page + 1)
+        )
+        self._previous_button.disabled = self._page == 0
+        self._next_button.disabled = not self._has_next_page()
+        if self._done_button is not None:
+            self._done_button.disabled = len(self._selected) < self._min_values
+
+    def get_components(self) -> StageComponents:
+        self._apply_page()
+        return super().get_components()
+
+    async def _show_page(self, interaction: discord.Interaction, page: int) -> None:
+        options = await self._cache.get(page)
+        if not options and page > 0:
+            # The provider ran out of options, the current page stays the last one
+            self._end = page
+        else:
+            self._page = page
+            self._options = options
+        await self._refresh_callback(interaction, None)
+
+    async def _on_previous(self, interaction: discord.Interaction, _) -> None:
+        await self._show_page(interaction, max(0, self._page - 1))
+
+    async def _on_next(self, interaction: discord.Interaction, _) -> None:
+        await self._show_page(interaction, self._page + 1)
+
+    async def _on_select(self, interaction: discord.Interaction, select: DSelect) -> None:
+        if self._max_values == 1:
+            return await self._complete(interaction, list(select.values))
+
+        picked = set(select.values)
+        for option in self._options or ():
+            if option.value not in picked:
+                self._selected.pop(option.value, None)
+            elif option.value not in self._selected and len(self._selected) < self._max_values:
+                self._selected[option.value] = option
+        await self._refresh_callback(interaction, None)
+
+    async def _on_done(self, interaction: discord.Interaction, _) -> None:
+        if len(self._selected) < self._min_values:
+            raise ValidationError(
+                f"Select at least {self._min_values} option(s) in the '{self._keyname}' stage.",
+                stage_keyname=self._keyname,
+            )
+        await self._complete(interaction, list(self._selected))
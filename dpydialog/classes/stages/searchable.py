@@ -0,0 +1,160 @@
+from concurrent.futures import Executor
+from typing import List, Optional, Sequence, Union
+
+import discord
+
+from .stage import Stage
+from .validation import ValidationCallbackType
+from ..components.button import DButton
+from ..components.modal import DModal
+from ..components.select import DSelect
+from ..pagination import OptionType
+from ..search import SearchIndex
+from ...data import ModalOption, StageComponents
+from ...errors import DialogException
+from ...interfaces.icomponent import IComponent
+
+_NO_MATCHES = discord.SelectOption(label="Nothing found", value="-")
+
+
+class SearchableSelectStage(Stage):
+    """A stage with a select of the options matching a search query.
+
+    The "Search" button opens a modal with a query input, the select then shows
+    the best `max_results` matches from the `SearchIndex`. Before the first search
+    the select shows the first options. Picking options completes the stage, the
+    result is a list of the selected option values.
+
+    Pass a prebuilt `SearchIndex`, or the options: then the index is taken from
+    `SearchIndex.shared`, so every dialog using the same option set reuses one index.
+
+    The select takes the row 0 and the "Search" button takes the row 4.
+
+    Args:
+        keyname (str): Unique identifier for the stage
+        components (List[IComponent]): Additional UI components for this stage
+        options (Union[SearchIndex, Sequence[OptionType]]): The index or the options to search.
+        placeholder (Optional[str], optional): Placeholder text of the select. Defaults to None.
+        query_label (str, optional): The label of the query input. Defaults to "Search".
+        max_results (int, optional): The number of shown matches, at most 25. Defaults to 25.
+        min_values (int, optional): The minimum number of selected options. Defaults to 1.
+        max_values (int, optional): The maximum number of selected options. Defaults to 1.
+
+        See `Stage` for the rest of the arguments.
+    """
+
+    __slots__ = (
+        "_index",
+        "_query_label",
+        "_max_results",
+        "_min_values",
+        "_max_values",
+        "_query",
+        "_matches",
+        "_select",
+        "_search_button",
+    )
+
+    def __init__(
+        self,
+        keyname: str,
+        components: List[IComponent],
+        options: Union[SearchIndex, Sequence[OptionType]],
+        content: Optional[str] = None,
+        embeds: Optional[List[discord.Embed]] = [],
+        validation_func: Optional[
+            Union[ValidationCallbackType, Sequence[ValidationCallbackType]]
+        ] = None,
+        timeout: float = 180.0,
+        validation_timeout: Optional[float] = None,
+        validation_executor: Optional[Executor] = None,
+        placeholder: Optional[str] = None,
+        query_label: str = "Search",
+        max_results: int = 25,
+        min_values: int = 1,
+        max_values: int = 1,
+    ):
+        if not 1 <= max_results <= 25:
+            raise ValueError("The number of shown matches must be between 1 and 25.")
+
+        self._index = options if isinstance(options, SearchIndex) else SearchIndex.shared(options)
+        self._query_label = query_label
+        self._max_results = max_results
+        self._min_values = min_values
+        self._max_values = max_values
+        self._query = ""
+        self._matches: List[discord.SelectOption] = self._index.search("", max_results)
+
+        self._select = DSelect(
+            options=[_NO_MATCHES],
+            placeholder=placeholder,
+            row=0,
+            action=self._on_select,
+        )
+        self._search_button = DButton(
+            label=query_label, emoji="🔎", row=4, action=self._on_search
+        )
+
+        super().__init__(
+            keyname=keyname,
+            components=[*components, self._select, self._search_button],
+            content=content,
+            embeds=embeds,
+            validation_func=validation_func,
+            timeout=timeout,
+            validation_timeout=validation_timeout,
+            validation_executor=validation_executor,
+        )
+
+    def get_query(self) -> str:
+        return self._query
+
+    def get_matches(self) -> List[discord.SelectOption]:
+        return self._matches
+
+    def _apply_matches(self) -> None:
+        select = self._select
+        if self._matches:
+            select.options = self._matches
+            select.min_values = min(self._min_values, len(self._matches))
+            select.max_values = max(1, min(self._max_values, len(self._matches)))
+            select.disabled = False
+        else:
+            select.options = [_NO_MATCHES]
+            select.min_values = select.max_values = 1
+            select.disabled = True
+
+    def get_components(self) -> StageComponents:
+        self._apply_matches()
+        return super().get_components()
+
+    async def _on_search(self, interaction: discord.Interaction, _) -> None:
+        modal = DModal(
+            action=self._on_query,
+            title=self._query_label,
+            options=[
+                ModalOption(
+                    varname="query",
+                    label=self._query_label,
+                    default=self._query or None,
+                    max_length=100,
+                )
+            ],
+        )
+        await interaction.response.send_modal(modal)
+
+    async def _on_query(self, interaction: discord.Interaction, modal: DModal) -> None:
+        # Modal submissions don't pass the view, the dialog still has to see them
+        self._on_view_interaction(interaction)
+
+        self._query = modal.query.value
+        self._matches = self._index.search(self._query, self._max_results)
+        try:
+            await self._refresh_callback(interaction, None)
+        except DialogException as e:
+            # Modals aren't a part of the view, so its error hook doesn't see these errors
+            if self._error_callback is None or not await self._error_callback(interaction, e):
+                raise
+
+    async def _on_select(self, interaction: discord.Interaction, select: DSelect) -> None:
+        await self._complete(interaction, list(select.values))
@@ -1,4 +1,16 @@
-from typing import Any, Awaitable, Callable, List, Optional, Sequence, Union
+import time
+from concurrent.futures import Executor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 import discord
 
@@ -6,13 +18,25 @@ from ..components.select import DSelect
 from ..components.user_select import DUserSelect
 from ..components.role_select import DRoleSelect
 from ...errors import ValidationError
-from ...data import StageAction, StageComponents
+from ...data import OperatorRules, StageAction, StageComponents
 from ...interfaces.icomponent import IComponent
 from ...interfaces.istage import IStage
+from .validation import ValidationCallbackType, ValidationPipeline
+from .view import ErrorHookType, StageView
+
+if TYPE_CHECKING:
+    from ..observer import DialogObserver
 
 
 CallbackType = Callable[[discord.Interaction, Any], Awaitable[None]]
-ValidationCallbackType = Callable[[Any], bool]
+TimeoutCallbackType = Callable[[str], Awaitable[None]]
+InteractionHookType = Callable[[discord.Interaction, str], None]
+
+
+async def _acknowledge(interaction: discord.Interaction, _: Any) -> None:
+    # Clicks that were dispatched before the stage was disposed are only acknowledged
+    if not interaction.response.is_done():
+        await interaction.response.defer()
 
 
 class Stage(IStage):
@@ -26,7 +50,13 @@ class Stage(IStage):
         components (List[IComponent]): List of UI components for this stage
         content (Optional[str], optional): Text content to display. Defaults to None.
         embeds (Optional[List[discord.Embed]], optional): List of embeds to display. Defaults to [].
-        validation_func (ValidationCallbackType, optional): Function to validate stage input. Defaults to None.
+        validation_func (Union[ValidationCallbackType, Sequence[ValidationCallbackType]], optional):
+            Function or list of functions to validate stage input. Coroutine functions are supported
+            and run concurrently, see `ValidationPipeline`. A prepared `ValidationPipeline` is
+            used as is. Defaults to None.
+        validation_timeout (Optional[float], optional): Seconds each concurrent validator may run. Defaults to None.
+        validation_executor (Optional[Executor], optional):
+            Executor to offload synchronous validators to. Defaults to None.
         timeout (float, optional): Timeout duration in seconds. Defaults to 180.0.
 
     Methods:
@@ -39,24 +69,81 @@ class Stage(IStage):
         set_next_callback(callback: CallbackType) -> None:
             Sets the callback function for when user proceeds to next stage.
 
+        set_refresh_callback(callback: CallbackType) -> None:
+            Sets the callback function that renders the stage again, e.g. after its page changed.
+
+        prepare() -> None:
+            Coroutine that loads the data needed by `get_components`, awaited before every render.
+
         get_keyname() -> str:
             Returns the stage's unique identifier.
 
         get_components() -> StageComponents:
             Returns a StageComponents object containing all UI elements.
+            The built view is cached and reused until the callbacks or the operator
+            rules change.
+
+        invalidate_view() -> None:
+            Drops the cached view so the next `get_components` call rebuilds it.
+
+        dispose() -> None:
+            Stops the view and drops the callbacks, the stage can't be used afterwards.
+
+        set_interaction_hook(hook: InteractionHookType) -> None:
+            Sets the function called with every interaction before the component callback.
+
+        set_error_callback(callback: ErrorHookType) -> None:
+            Sets the function called with errors raised by the component callbacks.
+
+        set_timeout_callback(callback: TimeoutCallbackType) -> None:
+            Sets the function called with the stage keyname when the view times out.
+
+        set_observer(observer: Optional[DialogObserver], dialog: Any) -> None:
+            Reports validations and denied interactions of the dialog to the observer.
+
+        set_custom_id_prefix(prefix: Optional[str]) -> None:
+            Makes the view persistent: components get deterministic custom IDs
+            in the `<prefix>:<keyname>:<index>` form and the view never times out.
 
     Raises:
         ValidationError: When validation of stage input fails.
+        ValidationTimeout: When a validator doesn't finish in time.
     """
 
+    __slots__ = (
+        "_keyname",
+        "_content",
+        "_embeds",
+        "_timeout",
+        "_components",
+        "_validation",
+        "_back_callback",
+        "_next_callback",
+        "_close_callback",
+        "_refresh_callback",
+        "_interaction_hook",
+        "_error_callback",
+        "_timeout_callback",
+        "_observer",
+        "_dialog",
+        "_operator_rules",
+        "_custom_id_prefix",
+        "_view",
+        "_view_key",
+    )
+
     def __init__(
         self,
         keyname: str,
         components: List[IComponent],
         content: Optional[str] = None,
         embeds: Optional[List[discord.Embed]] = [],
-        validation_func: ValidationCallbackType = None,
+        validation_func: Optional[
+            Union[ValidationCallbackType, Sequence[ValidationCallbackType], ValidationPipeline]
+        ] = None,
         timeout: float = 180.0,
+        validation_timeout: Optional[float] = None,
+        validation_executor: Optional[Executor] = None,
     ):
         self._keyname = keyname
         self._content = content
@@ -66,15 +153,37 @@ class Stage(IStage):
 
         self._components: List[IComponent] = components
 
-        self._validation_func = validation_func
+        self._validation: Optional[ValidationPipeline] = None
+        if isinstance(validation_func, ValidationPipeline):
+            self._validation = validation_func
+        elif validation_func is not None:
+            self._validation = ValidationPipeline(
+                validation_func,
+                timeout=validation_timeout,
+                executor=validation_executor,
+                stage_keyname=keyname,
+            )
 
         self._back_callback: CallbackType = None
         self._next_callback: CallbackType = None
         self._close_callback: CallbackType = None
-        self._operator_ids: Optional[Sequence[int]] = None
+        self._refresh_callback: CallbackType = None
+        self._interaction_hook: Optional[InteractionHookType] = None
+        self._error_callback: Optional[ErrorHookType] = None
+        self._timeout_callback: Optional[TimeoutCallbackType] = None
+        self._observer: Optional["DialogObserver"] = None
+        self._dialog: Any = None
+        self._operator_rules = OperatorRules()
+        self._custom_id_prefix: Optional[str] = None
+
+        self._view: Optional[discord.ui.View] = None
+        self._view_key: Optional[Tuple[Any, ...]] = None
 
-    def set_operator_ids(self, ids: Sequence[int]) -> None:
-        self._operator_ids = ids
+    def set_operator_ids(self, ids: Optional[Sequence[int]]) -> None:
+        self._operator_rules = self._operator_rules.with_user_ids(ids)
+
+    def set_operator_rules(self, rules: OperatorRules) -> None:
+        self._operator_rules = rules
 
     def set_back_callback(self, callback: CallbackType) -> None:
         self._back_callback = callback
@@ -85,29 +194,113 @@ class Stage(IStage):
     def set_next_callback(self, callback: CallbackType) -> None:
         self._next_callback = callback
 
+    def set_refresh_callback(self, callback: CallbackType) -> None:
+        self._refresh_callback = callback
+
+    def set_interaction_hook(self, hook: Optional[InteractionHookType]) -> None:
+        self._interaction_hook = hook
+
+    def set_error_callback(self, callback: Optional[ErrorHookType]) -> None:
+        self._error_callback = callback
+
+    def set_timeout_callback(self, callback: Optional[TimeoutCallbackType]) -> None:
+        self._timeout_callback = callback
+
+    def set_observer(self, observer: Optional["DialogObserver"], dialog: Any) -> None:
+        self._observer = observer
+        self._dialog = dialog
+
+    def _on_view_interaction(self, interaction: discord.Interaction) -> None:
+        if self._interaction_hook is not None:
+            self._interaction_hook(interaction, self._keyname)
+
+    async def _on_view_timeout(self) -> None:
+        if self._timeout_callback is not None:
+            await self._timeout_callback(self._keyname)
+
+    def _report_auth_denied(self, interaction: discord.Interaction) -> None:
+        if self._observer is not None:
+            self._observer.on_auth_denied(self._dialog, self._keyname, interaction)
+
+    async def _validate(self, value: Any) -> bool:
+        if self._observer is None:
+            return await self._validation.validate(value)
+
+        started = time.perf_counter()
+        passed = False
+        try:
+            passed = await self._validation.validate(value)
+            return passed
+        finally:
+            self._observer.on_validation(
+                self._dialog, self._keyname, time.perf_counter() - started, passed
+            )
+
+    def set_custom_id_prefix(self, prefix: Optional[str]) -> None:
+        self._custom_id_prefix = prefix
+
+    def get_custom_id(self, index: int) -> Optional[str]:
+        if self._custom_id_prefix is None:
+            return None
+
+        custom_id = f"{self._custom_id_prefix}:{self._keyname}:{index}"
+        if len(custom_id) > 100:
+            raise ValueError(
+                f"The '{custom_id}' custom ID is longer than 100 characters, "
+                "use a shorter stage keyname."
+            )
+        return custom_id
+
+    def invalidate_view(self) -> None:
+        if self._view is not None:
+            self._view.stop()
+
+        self._view = None
+        self._view_key = None
+
+    def dispose(self) -> None:
+        if self._view is not None:
+            self._view.dispose()
+        self.invalidate_view()
+
+        for component in self._components:
+            component._replace_function(_acknowledge)
+            component._set_denied_hook(None)
+
+        self._back_callback = _acknowledge
+        self._next_callback = _acknowledge
+        self._close_callback = _acknowledge
+        self._refresh_callback = _acknowledge
+        self._interaction_hook = None
+        self._error_callback = None
+        self._timeout_callback = None
+        self._observer = None
+        self._dialog = None
+
     async def _process_select_component(
         self,
         interaction: discord.Interaction,
         select: Union[DRoleSelect, DSelect, DUserSelect],
     ) -> None:
-        value = select.values
-        if callable(self._validation_func):
-            if self._validation_func(value):
-                await self._next_callback(interaction, value)
-            else:
-                raise ValidationError(
-                    f"The '{self._keyname}' stage result validation not passed.",
-                    stage_keyname=self._keyname,
-                )
+        await self._complete(interaction, select.values)
+
+    async def _complete(self, interaction: discord.Interaction, value: Any) -> None:
+        if self._validation is not None and not await self._validate(value):
+            raise ValidationError(
+                f"The '{self._keyname}' stage result validation not passed.",
+                stage_keyname=self._keyname,
+            )
         await self._next_callback(interaction, value)
 
     def get_keyname(self) -> str:
         return self._keyname
 
     def _process_components_actions(self) -> None:
+        # Resolved from the declared action, so a rebuild after the callbacks changed
+        #   never keeps the callbacks bound by the previous build.
         for component in self._components:
-            action = component.get_action()
-            if isinstance(action, StageAction):
+            action = component._get_stage_action()
+            if action is not None:
                 if action == StageAction.BACK:
                     component._replace_function(self._back_callback)
                 if action == StageAction.CLOSE:
@@ -115,12 +308,55 @@ class Stage(IStage):
                 if action == StageAction.NEXT:
                     component._replace_function(self._process_select_component)
 
-    def get_components(self) -> StageComponents:
+    def _get_view_key(self) -> Tuple[Any, ...]:
+        return (
+            self._back_callback,
+            self._next_callback,
+            self._close_callback,
+            self._interaction_hook,
+            self._error_callback,
+            self._timeout_callback,
+            self._observer,
+            self._operator_rules,
+            self._custom_id_prefix,
+        )
+
+    def _build_view(self) -> discord.ui.View:
         self._process_components_actions()
-        view = discord.ui.View(timeout=self._timeout)
+        persistent = self._custom_id_prefix is not None
+        view = StageView(
+            timeout=None if persistent else self._timeout,
+            interaction_hook=self._on_view_interaction,
+            error_hook=self._error_callback,
+            timeout_hook=self._on_view_timeout,
+        )
+        denied_hook = None if self._observer is None else self._report_auth_denied
 
-        for component in self._components:
-            component.set_operator_ids(self._operator_ids)
+        for index, component in enumerate(self._components):
+            component._set_keyname(self._keyname)
+            component._set_stage_rules(self._operator_rules)
+            component._set_denied_hook(denied_hook)
+            # Link buttons can't have a custom ID
+            if persistent and getattr(component, "url", None) is None:
+                component.custom_id = self.get_custom_id(index)
             view.add_item(component)
 
-        return StageComponents(content=self._content, embeds=self._embeds, view=view)
+        return view
+
+    async def prepare(self) -> None:
+        """Loads the data needed by `get_components`, called by the dialog before every render."""
+
+    def get_components(self) -> StageComponents:
+        key = self._get_view_key()
+
+        if self._view is None or self._view_key != key or self._view.is_finished():
+            self.invalidate_view()
+            self._view = self._build_view()
+            self._view_key = key
+        elif self._custom_id_prefix is None:
+            # Restarts the timeout countdown of the already prepared view
+            self._view.timeout = self._timeout
+
+        return StageComponents(
+            content=self._content, embeds=self._embeds, view=self._view
+        )
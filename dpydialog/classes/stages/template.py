@@ -0,0 +1,140 @@
+from concurrent.futures import Executor
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+import discord
+
+from .stage import Stage
+from .validation import ValidationCallbackType, ValidationPipeline
+from ...interfaces.icomponent import IComponent
+
+
+def _has_component(value: Any) -> bool:
+    if isinstance(value, IComponent):
+        return True
+    if isinstance(value, Mapping):
+        return any(_has_component(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_component(item) for item in value)
+    return False
+
+
+def _clone_argument(value: Any) -> Any:
+    # Components in the stage arguments (e.g. the fields of a `FormStage`) are
+    # prototypes too, every stage gets its own copies
+    if isinstance(value, IComponent):
+        return value._clone()
+    if isinstance(value, Mapping):
+        return {key: _clone_argument(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone_argument(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_clone_argument(item) for item in value)
+    return value
+
+
+class StageTemplate:
+    """An immutable, precompiled description of a `Stage`.
+
+    The template validates its components once and keeps them as prototypes.
+    Every `instantiate` call produces a fresh `Stage` whose components are cloned
+    from the prototypes, so a single template can be shared by any number of
+    dialogs without them stepping on each other's views.
+
+    Args:
+        keyname (str): Unique identifier for the stage
+        components (Sequence[IComponent]): UI components used as prototypes for this stage
+        content (Optional[str], optional): Text content to display. Defaults to None.
+        embeds (Optional[Sequence[discord.Embed]], optional): Embeds to display. Defaults to None.
+        validation_func (Union[ValidationCallbackType, Sequence[ValidationCallbackType]], optional):
+            Function or list of functions to validate stage input. Defaults to None.
+        timeout (float, optional): Timeout duration in seconds. Defaults to 180.0.
+        validation_timeout (Optional[float], optional): Seconds each concurrent validator may run. Defaults to None.
+        validation_executor (Optional[Executor], optional):
+            Executor to offload synchronous validators to. Defaults to None.
+        stage_class (Type[Stage], optional): The class of the produced stages. Defaults to Stage.
+        stage_kwargs (Optional[Dict[str, Any]], optional):
+            Additional arguments of the `stage_class`, e.g. the provider of a `PaginatedSelectStage`.
+            Components in them are cloned like the `components`. Defaults to None.
+
+    Raises:
+        ValueError: When the keyname is empty or a component doesn't derive from `IComponent`.
+    """
+
+    __slots__ = (
+        "_keyname",
+        "_prototypes",
+        "_content",
+        "_embeds",
+        "_validation",
+        "_timeout",
+        "_stage_class",
+        "_stage_kwargs",
+        "_cloned_kwargs",
+    )
+
+    def __init__(
+        self,
+        keyname: str,
+        components: Sequence[IComponent],
+        content: Optional[str] = None,
+        embeds: Optional[Sequence[discord.Embed]] = None,
+        validation_func: Optional[
+            Union[ValidationCallbackType, Sequence[ValidationCallbackType]]
+        ] = None,
+        timeout: float = 180.0,
+        validation_timeout: Optional[float] = None,
+        validation_executor: Optional[Executor] = None,
+        stage_class: Type[Stage] = Stage,
+        stage_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        if not keyname:
+            raise ValueError("Stage template must have a non-empty keyname.")
+
+        for component in components:
+            if not isinstance(component, IComponent):
+                raise ValueError("Stage components must derive from `IComponent`.")
+
+        self._keyname = keyname
+        self._prototypes: Tuple[IComponent, ...] = tuple(components)
+        self._content = content
+        # Shared by all produced stages, the stages never mutate it
+        self._embeds: List[discord.Embed] = list(embeds or [])
+        # The pipeline holds no per-dialog state, all produced stages share it
+        self._validation: Optional[ValidationPipeline] = None
+        if validation_func is not None:
+            self._validation = ValidationPipeline(
+                validation_func,
+                timeout=validation_timeout,
+                executor=validation_executor,
+                stage_keyname=keyname,
+            )
+        self._timeout = timeout
+        self._stage_class = stage_class
+        self._stage_kwargs: Dict[str, Any] = dict(stage_kwargs or {})
+        # Only the arguments holding components are cloned, the rest is passed as is
+        self._cloned_kwargs: Tuple[str, ...] = tuple(
+            key for key, value in self._stage_kwargs.items() if _has_component(value)
+        )
+
+    def get_keyname(self) -> str:
+        return self._keyname
+
+    def get_components(self) -> Tuple[IComponent, ...]:
+        return self._prototypes
+
+    def instantiate(self) -> Stage:
+        kwargs = self._stage_kwargs
+        if self._cloned_kwargs:
+            kwargs = dict(kwargs)
+            for key in self._cloned_kwargs:
+                kwargs[key] = _clone_argument(kwargs[key])
+
+        return self._stage_class(
+            keyname=self._keyname,
+            components=[component._clone() for component in self._prototypes],
+            content=self._content,
+            embeds=self._embeds,
+            validation_func=self._validation,
+            timeout=self._timeout,
+            **kwargs,
+        )
@@ -0,0 +1,127 @@
+import asyncio
+import inspect
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Union
+
+from ...errors import ValidationTimeout
+
+ValidationCallbackType = Callable[[Any], Union[bool, Awaitable[bool]]]
+
+
+def _is_async(validator: ValidationCallbackType) -> bool:
+    # Callable objects with an async `__call__` aren't coroutine functions themselves
+    return inspect.iscoroutinefunction(validator) or inspect.iscoroutinefunction(
+        getattr(type(validator), "__call__", None)
+    )
+
+
+class ValidationPipeline:
+    """Runs the validators of a `Stage` against its result.
+
+    Synchronous validators run inline first, since they are expected to be cheap. An
+    awaitable returned by one (e.g. a lambda returning a coroutine) is awaited right away.
+    Coroutine validators, and synchronous ones when an executor is given, run concurrently
+    afterwards. The pipeline stops at the first failed validator and cancels the rest.
+
+    Args:
+        validators (Union[ValidationCallbackType, Sequence[ValidationCallbackType]]):
+            A validator or a list of validators. Each one returns `True` if the value is valid.
+        timeout (Optional[float], optional): Seconds each concurrent validator may run. Defaults to None.
+        executor (Optional[Executor], optional):
+            Executor for CPU-heavy synchronous validators. If None, then they run inline. Defaults to None.
+        stage_keyname (Optional[str], optional): The keyname used in raised errors. Defaults to None.
+    """
+
+    __slots__ = ("_inline", "_concurrent", "_timeout", "_executor", "_stage_keyname")
+
+    def __init__(
+        self,
+        validators: Union[ValidationCallbackType, Sequence[ValidationCallbackType]],
+        timeout: Optional[float] = None,
+        executor: Optional[Executor] = None,
+        stage_keyname: Optional[str] = None,
+    ):
+        if callable(validators):
+            validators = [validators]
+
+        self._inline: List[Callable[[Any], bool]] = []
+        self._concurrent: List[ValidationCallbackType] = []
+        for validator in validators:
+            if not callable(validator):
+                raise ValueError("Validators must be callable.")
+
+            if _is_async(validator) or executor is not None:
+                self._concurrent.append(validator)
+            else:
+                self._inline.append(validator)
+
+        self._timeout = timeout
+        self._executor = executor
+        self._stage_keyname = stage_keyname
+
+    def _start(self, validator: ValidationCallbackType, value: Any) -> "asyncio.Future[bool]":
+        if _is_async(validator):
+            awaitable = validator(value)
+        else:
+            awaitable = self._run_in_executor(validator, value)
+
+        if self._timeout is not None:
+            awaitable = asyncio.wait_for(awaitable, self._timeout)
+        return asyncio.ensure_future(awaitable)
+
+    async def _run_in_executor(self, validator: ValidationCallbackType, value: Any) -> bool:
+        valid = await asyncio.get_running_loop().run_in_executor(
+            self._executor, validator, value
+        )
+        if inspect.isawaitable(valid):
+            valid = await valid
+        return valid
+
+    async def _wait(self, awaitable: Awaitable[bool]) -> bool:
+        try:
+            if self._timeout is None:
+                return await awaitable
+            return await asyncio.wait_for(awaitable, self._timeout)
+        except asyncio.TimeoutError:
+            raise self._timed_out() from None
+
+    def _timed_out(self) -> ValidationTimeout:
+        return ValidationTimeout(
+            f"The '{self._stage_keyname}' stage result validation timed out.",
+            stage_keyname=self._stage_keyname,
+        )
+
+    async def validate(self, value: Any) -> bool:
+        """Returns `True` if all validators accept the value.
+
+        Raises:
+            ValidationTimeout: If a validator didn't finish within the timeout.
+        """
+        for validator in self._inline:
+            valid = validator(value)
+            if inspect.isawaitable(valid):
+                valid = await self._wait(valid)
+            if not valid:
+                return False
+
+        if not self._concurrent:
+            return True
+
+        pending = {self._start(validator, value) for validator in self._concurrent}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    try:
+                        valid = future.result()
+                    except asyncio.TimeoutError:
+                        raise self._timed_out() from None
+                    if not valid:
+                        return False
+        finally:
+            for future in pending:
+                future.cancel()
+
+        return True
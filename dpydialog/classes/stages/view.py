@@ -0,0 +1,53 @@
+from typing import Any, Awaitable, Callable, Optional
+
+import discord
+
+InteractionHookType = Callable[[discord.Interaction], None]
+ErrorHookType = Callable[[discord.Interaction, Exception], Awaitable[bool]]
+TimeoutHookType = Callable[[], Awaitable[None]]
+
+
+class StageView(discord.ui.View):
+    """The view built by a `Stage`.
+
+    Calls the interaction hook of the stage before any component callback runs, which
+    lets the `Dialog` react to every click in one place. Errors raised by the callbacks
+    are passed to the error hook, if it returns `False`, then they are logged as usual.
+    The timeout hook is awaited when the view times out.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = 180.0,
+        interaction_hook: Optional[InteractionHookType] = None,
+        error_hook: Optional[ErrorHookType] = None,
+        timeout_hook: Optional[TimeoutHookType] = None,
+    ):
+        super().__init__(timeout=timeout)
+        self._interaction_hook = interaction_hook
+        self._error_hook = error_hook
+        self._timeout_hook = timeout_hook
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self._interaction_hook is not None:
+            self._interaction_hook(interaction)
+        return True
+
+    async def on_error(
+        self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item[Any]
+    ) -> None:
+        if self._error_hook is None or not await self._error_hook(interaction, error):
+            await super().on_error(interaction, error, item)
+
+    async def on_timeout(self) -> None:
+        if self._timeout_hook is not None:
+            await self._timeout_hook()
+
+    def dispose(self) -> None:
+        """Stops the view and drops its items and hooks."""
+        self.stop()
+        # Items reference the view back, the hooks reference the stage and the dialog
+        self.clear_items()
+        self._interaction_hook = None
+        self._error_hook = None
+        self._timeout_hook = None
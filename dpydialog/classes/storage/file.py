@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+import re
+from typing import Optional
+
+from ...data import DialogState
+from ...interfaces.istore import IDialogStateStore
+
+_DIALOG_ID_RE = re.compile(r"^[A-Za-z0-9_-]+$")
+
+
+class FileDialogStateStore(IDialogStateStore):
+    """Keeps every dialog state in its own JSON file.
+
+    Files are replaced atomically, so a crash never leaves a half-written state.
+    The blocking file I/O runs in the default executor. The directory is created
+    with the first saved state.
+
+    Args:
+        directory (str, optional): The directory for the state files. Defaults to ".dpydialog".
+    """
+
+    def __init__(self, directory: str = ".dpydialog"):
+        self._directory = directory
+        self._created = False
+
+    def _get_path(self, dialog_id: str) -> str:
+        if not _DIALOG_ID_RE.match(dialog_id):
+            raise ValueError(f"The '{dialog_id}' dialog ID can not be used as a file name.")
+        return os.path.join(self._directory, f"{dialog_id}.json")
+
+    def _read(self, dialog_id: str) -> Optional[DialogState]:
+        try:
+            with open(self._get_path(dialog_id), "r", encoding="utf-8") as f:
+                return DialogState.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def _write(self, state: DialogState) -> None:
+        path = self._get_path(state.dialog_id)
+        if not self._created:
+            os.makedirs(self._directory, exist_ok=True)
+            self._created = True
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def _remove(self, dialog_id: str) -> None:
+        try:
+            os.remove(self._get_path(dialog_id))
+        except FileNotFoundError:
+            pass
+
+    async def load(self, dialog_id: str) -> Optional[DialogState]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, dialog_id)
+
+    async def save(self, state: DialogState) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, state)
+
+    async def delete(self, dialog_id: str) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._remove, dialog_id)
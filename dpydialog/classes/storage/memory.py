@@ -0,0 +1,52 @@
+from typing import Any, Dict, List, Optional
+
+from ...data import DialogState, StageCheckpoint
+from ...interfaces.isink import ICheckpointSink
+from ...interfaces.istore import IDialogStateStore
+
+
+class MemoryDialogStateStore(IDialogStateStore):
+    """Keeps dialog states in the process memory.
+
+    States are stored in their reduced form, so the store behaves the same way as
+    the persistent backends. Useful for tests and single-process bots.
+    """
+
+    def __init__(self):
+        self._states: Dict[str, Dict[str, Any]] = {}
+
+    async def load(self, dialog_id: str) -> Optional[DialogState]:
+        data = self._states.get(dialog_id)
+        return None if data is None else DialogState.from_dict(data)
+
+    async def save(self, state: DialogState) -> None:
+        self._states[state.dialog_id] = state.to_dict()
+
+    async def delete(self, dialog_id: str) -> None:
+        self._states.pop(dialog_id, None)
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+
+class MemoryCheckpointSink(ICheckpointSink):
+    """Keeps stage checkpoints in the process memory, useful for tests."""
+
+    def __init__(self):
+        self.checkpoints: List[StageCheckpoint] = []
+        self.batches = 0
+
+    async def write(self, checkpoints: List[StageCheckpoint]) -> None:
+        self.checkpoints.extend(checkpoints)
+        self.batches += 1
+
+    def load(self, dialog_id: str) -> Dict[str, Any]:
+        """Returns the stage keyname -> value of the dialog, the partial result of an abandoned dialog."""
+        return {
+            checkpoint.stage_keyname: checkpoint.value
+            for checkpoint in self.checkpoints
+            if checkpoint.dialog_id == dialog_id
+        }
+
+    def __len__(self) -> int:
+        return len(self.checkpoints)
@@ -0,0 +1,139 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from ...data import DialogState, StageCheckpoint
+from ...interfaces.isink import ICheckpointSink
+from ...interfaces.istore import IDialogStateStore
+
+
+class SQLiteDialogStateStore(IDialogStateStore):
+    """Keeps dialog states in a SQLite database.
+
+    A single connection is shared between the executor threads and guarded by a lock.
+
+    Args:
+        path (str): The path to the database file.
+        table (str, optional): The name of the table with states. Defaults to "dpydialog_states".
+    """
+
+    def __init__(self, path: str, table: str = "dpydialog_states"):
+        if not table.isidentifier():
+            raise ValueError(f"The '{table}' table name is not a valid identifier.")
+
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "dialog_id TEXT PRIMARY KEY, payload TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _read(self, dialog_id: str) -> Optional[DialogState]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT payload FROM {self._table} WHERE dialog_id = ?", (dialog_id,)
+            ).fetchone()
+        return None if row is None else DialogState.from_dict(json.loads(row[0]))
+
+    def _write(self, state: DialogState) -> None:
+        payload = json.dumps(state.to_dict(), separators=(",", ":"))
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self._table} (dialog_id, payload, updated_at) "
+                "VALUES (?, ?, ?)",
+                (state.dialog_id, payload, time.time()),
+            )
+
+    def _remove(self, dialog_id: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"DELETE FROM {self._table} WHERE dialog_id = ?", (dialog_id,)
+            )
+
+    async def load(self, dialog_id: str) -> Optional[DialogState]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, dialog_id)
+
+    async def save(self, state: DialogState) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._write, state)
+
+    async def delete(self, dialog_id: str) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._remove, dialog_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class SQLiteCheckpointSink(ICheckpointSink):
+    """Appends stage checkpoints to a SQLite table, a batch is inserted in one transaction.
+
+    Args:
+        path (str): The path to the database file.
+        table (str, optional): The name of the table with checkpoints. Defaults to "dpydialog_checkpoints".
+    """
+
+    def __init__(self, path: str, table: str = "dpydialog_checkpoints"):
+        if not table.isidentifier():
+            raise ValueError(f"The '{table}' table name is not a valid identifier.")
+
+        self._table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "dialog_id TEXT NOT NULL, stage_keyname TEXT NOT NULL, value TEXT NOT NULL, "
+                "user_id INTEGER, template_name TEXT, created_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_dialog_id ON {table} (dialog_id)"
+            )
+
+    def _insert(self, checkpoints: List[StageCheckpoint]) -> None:
+        rows = [
+            (
+                checkpoint.dialog_id,
+                checkpoint.stage_keyname,
+                json.dumps(checkpoint.value, separators=(",", ":")),
+                checkpoint.user_id,
+                checkpoint.template_name,
+                checkpoint.created_at,
+            )
+            for checkpoint in checkpoints
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f"INSERT INTO {self._table} (dialog_id, stage_keyname, value, user_id, "
+                "template_name, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    def _read(self, dialog_id: str) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT stage_keyname, value FROM {self._table} "
+                "WHERE dialog_id = ? ORDER BY rowid",
+                (dialog_id,),
+            ).fetchall()
+        return {keyname: json.loads(value) for keyname, value in rows}
+
+    async def write(self, checkpoints: List[StageCheckpoint]) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._insert, checkpoints)
+
+    async def load(self, dialog_id: str) -> Dict[str, Any]:
+        """Returns the stage keyname -> value of the dialog, the partial result of an abandoned dialog."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._read, dialog_id)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,173 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Deque, List, Optional
+
+from ..data import DialogResult
+
+
+class DialogResultStream:
+    """A bounded stream of the results of completed dialogs.
+
+    Dialogs publish their result when they are completed, see `Dialog.set_result_stream`
+    and the `result_stream` of `DialogTemplate`. Iterate the stream to get one
+    `DialogResult` at a time, or `batches` to get lists of them for bulk inserts.
+
+    The stream has backpressure: when `max_size` results are waiting, completing
+    dialogs wait (after answering their interaction) until the consumer catches up.
+    Once closed, the iteration ends after the remaining results.
+
+    Args:
+        max_size (int, optional): The number of results waiting for the consumer. Defaults to 1000.
+
+    Raises:
+        ValueError: When `max_size` is less than 1.
+    """
+
+    __slots__ = ("_max_size", "_queue", "_held", "_closed", "_publishing", "_drained")
+
+    def __init__(self, max_size: int = 1000):
+        if max_size < 1:
+            raise ValueError("The stream must hold at least one result.")
+
+        self._max_size = max_size
+        # Created on the first use, so the stream can be built before the event loop runs
+        self._queue: Optional["asyncio.Queue[DialogResult]"] = None
+        # Results taken from the queue by a consumer cancelled at the same time
+        self._held: Deque[DialogResult] = deque()
+        self._closed = False
+        # Publishers waiting for room, their results still belong to the stream after closing
+        self._publishing = 0
+        # Set once the stream is closed and every publisher is done
+        self._drained: Optional[asyncio.Event] = None
+
+    def _get_queue(self) -> "asyncio.Queue[DialogResult]":
+        if self._queue is None:
+            self._queue = asyncio.Queue(self._max_size)
+        return self._queue
+
+    def _get_drained(self) -> asyncio.Event:
+        if self._drained is None:
+            self._drained = asyncio.Event()
+            if self._closed and not self._publishing:
+                self._drained.set()
+        return self._drained
+
+    def __len__(self) -> int:
+        """Returns the number of results waiting for the consumer."""
+        return len(self._held) + (0 if self._queue is None else self._queue.qsize())
+
+    def is_closed(self) -> bool:
+        return self._closed
+
+    async def publish(self, result: DialogResult) -> None:
+        """Adds the result, waits while the stream is full.
+
+        Raises:
+            RuntimeError: When the stream is closed.
+        """
+        if self._closed:
+            raise RuntimeError("The result stream is closed.")
+
+        self._publishing += 1
+        try:
+            await self._get_queue().put(result)
+        finally:
+            self._publishing -= 1
+            if self._closed and not self._publishing:
+                self._get_drained().set()
+
+    async def close(self) -> None:
+        """Stops accepting results, the consumers get the remaining ones and stop.
+
+        Results published before closing aren't lost, including the ones still waiting
+        for room in the stream.
+        """
+        if not self._closed:
+            self._closed = True
+            if not self._publishing:
+                self._get_drained().set()
+
+    async def _get(self, timeout: Optional[float] = None) -> Optional[DialogResult]:
+        """Returns the next result, or None once the stream is closed and empty.
+
+        Raises:
+            asyncio.TimeoutError: When there is no result within `timeout` seconds.
+        """
+        queue = self._get_queue()
+        drained = self._get_drained()
+        while True:
+            if self._held:
+                return self._held.popleft()
+            if not queue.empty():
+                return queue.get_nowait()
+            if drained.is_set():
+                return None
+
+            getter = asyncio.ensure_future(queue.get())
+            waiter = asyncio.ensure_future(drained.wait())
+            done = set()
+            try:
+                done, _ = await asyncio.wait(
+                    (getter, waiter), timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+            finally:
+                waiter.cancel()
+                if not getter.done():
+                    getter.cancel()
+                elif getter not in done and not getter.cancelled():
+                    # The consumer was cancelled after the result was taken
+                    self._held.append(getter.result())
+
+            if getter in done:
+                return getter.result()
+            if not done:
+                raise asyncio.TimeoutError()
+
+    def __aiter__(self) -> AsyncIterator[DialogResult]:
+        return self._results()
+
+    async def _results(self) -> AsyncIterator[DialogResult]:
+        while True:
+            result = await self._get()
+            if result is None:
+                return
+            yield result
+
+    async def batches(
+        self, size: int = 100, window: Optional[float] = None
+    ) -> AsyncIterator[List[DialogResult]]:
+        """Yields the results in lists of at most `size` results.
+
+        A batch starts with the next result. Without a `window` it takes the results that
+        are already waiting, otherwise it waits up to `window` seconds for more.
+
+        Raises:
+            ValueError: When `size` is less than 1 or `window` is negative.
+        """
+        if size < 1:
+            raise ValueError("A batch must hold at least one result.")
+        if window is not None and window < 0:
+            raise ValueError("The batch window can't be negative.")
+
+        loop = asyncio.get_running_loop()
+        queue = self._get_queue()
+        while True:
+            result = await self._get()
+            if result is None:
+                return
+
+            batch = [result]
+            deadline = None if window is None else loop.time() + window
+            while len(batch) < size:
+                try:
+                    if deadline is None:
+                        result = queue.get_nowait()
+                    else:
+                        result = await self._get(max(0.0, deadline - loop.time()))
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+
+                if result is None:
+                    break
+                batch.append(result)
+            yield batch
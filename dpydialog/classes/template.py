@@ -0,0 +1,208 @@
+from typing import Any, Awaitable, Callable, Mapping, MutableMapping, Optional, Sequence, Tuple
+
+import discord
+from discord.abc import MISSING
+
+from ..data import OperatorRules
+from ..errors import DialogException, DialogHasNoStages
+from .dialog import Dialog
+from .checkpoint import CheckpointWriter
+from .controller import DialogController, MessageDialogController
+from .graph import StageGraph, TransitionType
+from .observer import DialogObserver
+from .ratelimit import ChannelRateLimiter
+from .stream import DialogResultStream
+from .stages.template import StageTemplate
+
+
+class DialogTemplate:
+    """An immutable, precompiled description of a `Dialog`.
+
+    Build the template once (e.g. at import time) and call `instantiate` in every
+    command invocation. The stage graph is validated when the template is created,
+    so instantiation only has to create the per-user state: the result dict, the
+    current stage index, the operator IDs and the components of each stage.
+
+    Args:
+        stages (Sequence[StageTemplate]): The stages of the dialog, in order.
+        on_success (Callable, optional): Called with the interaction and the result dict. Defaults to None.
+        on_error (Callable, optional): Called with the interaction and the raised exception. Defaults to None.
+        operator_ids (Optional[Sequence[int]], optional):
+            Default IDs of users allowed to use the dialog. If None, then everyone can use it. Default to None.
+        operator_rules (Optional[OperatorRules], optional):
+            Default role and predicate rules. `operator_ids` overrides its user IDs. Defaults to None.
+        latency_budget (Optional[float], optional):
+            Seconds within which interactions are answered before they are deferred, see
+            `DialogController`. Defaults to None.
+        rate_limiter (Optional[ChannelRateLimiter], optional):
+            Limits message edits per channel for all dialogs of the template. Defaults to None.
+        observer (Optional[DialogObserver], optional):
+            Receives the lifecycle events of all dialogs of the template. Defaults to None.
+        transitions (Optional[Mapping[str, TransitionType]], optional):
+            Stage keyname -> the next stage keyname, a `Branch` or None, see `StageGraph`.
+            Stages without a transition go to the following stage. Defaults to None.
+        allow_cycles (bool, optional): Whether transitions may lead back to earlier stages. Defaults to False.
+        on_timeout (Callable, optional):
+            Called with the latest interaction and the partial result when a dialog expires. Defaults to None.
+        idle_timeout (Optional[float], optional): Seconds without interactions after which a dialog expires. Defaults to None.
+        total_timeout (Optional[float], optional): Seconds after `send` after which a dialog expires. Defaults to None.
+        disable_on_timeout (bool, optional):
+            Whether expired dialogs disable the components of their message. Defaults to True.
+        result_stream (Optional[DialogResultStream], optional):
+            Receives the results of all completed dialogs of the template. Defaults to None.
+        checkpoint_writer (Optional[CheckpointWriter], optional):
+            Records the value of every completed stage of the dialogs. Defaults to None.
+
+    Raises:
+        DialogHasNoStages: When the template is created without stages.
+        ValueError: When a stage isn't a `StageTemplate` or keynames are repeated.
+        InvalidStageGraph: When the transitions have missing targets, unreachable stages or cycles.
+    """
+
+    __slots__ = (
+        "_stages",
+        "_on_success",
+        "_on_error",
+        "_operator_rules",
+        "_latency_budget",
+        "_rate_limiter",
+        "_observer",
+        "_graph",
+        "_on_timeout",
+        "_idle_timeout",
+        "_total_timeout",
+        "_disable_on_timeout",
+        "_result_stream",
+        "_checkpoint_writer",
+    )
+
+    def __init__(
+        self,
+        stages: Sequence[StageTemplate],
+        on_success: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ] = None,
+        on_error: Optional[
+            Callable[[discord.Interaction, DialogException], Awaitable[None]]
+        ] = None,
+        operator_ids: Optional[Sequence[int]] = None,
+        operator_rules: Optional[OperatorRules] = None,
+        latency_budget: Optional[float] = None,
+        rate_limiter: Optional[ChannelRateLimiter] = None,
+        observer: Optional[DialogObserver] = None,
+        transitions: Optional[Mapping[str, TransitionType]] = None,
+        allow_cycles: bool = False,
+        on_timeout: Optional[
+            Callable[[discord.Interaction, MutableMapping[str, Any]], Awaitable[None]]
+        ] = None,
+        idle_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None,
+        disable_on_timeout: bool = True,
+        result_stream: Optional[DialogResultStream] = None,
+        checkpoint_writer: Optional[CheckpointWriter] = None,
+    ):
+        if len(stages) < 1:
+            raise DialogHasNoStages()
+
+        keynames = set()
+        for stage in stages:
+            if not isinstance(stage, StageTemplate):
+                raise ValueError("Dialog template stages must be `StageTemplate`.")
+
+            if stage.get_keyname() in keynames:
+                raise ValueError(
+                    f"The '{stage.get_keyname()}' keyname is used by several stages."
+                )
+            keynames.add(stage.get_keyname())
+
+        self._stages: Tuple[StageTemplate, ...] = tuple(stages)
+        self._on_success = on_success
+        self._on_error = on_error
+        self._operator_rules = operator_rules or OperatorRules()
+        if operator_ids is not None:
+            self._operator_rules = self._operator_rules.with_user_ids(operator_ids)
+        self._latency_budget = latency_budget
+        self._rate_limiter = rate_limiter
+        self._observer = observer
+        self._on_timeout = on_timeout
+        self._idle_timeout = idle_timeout
+        self._total_timeout = total_timeout
+        self._disable_on_timeout = disable_on_timeout
+        self._result_stream = result_stream
+        self._checkpoint_writer = checkpoint_writer
+        # Compiled once, the instantiated dialogs share it
+        self._graph = StageGraph(
+            [stage.get_keyname() for stage in self._stages],
+            transitions,
+            allow_cycles=allow_cycles,
+        )
+
+    def get_stages(self) -> Tuple[StageTemplate, ...]:
+        return self._stages
+
+    def instantiate(
+        self,
+        interaction: discord.Interaction,
+        operator_ids: Optional[Sequence[int]] = MISSING,
+    ) -> Dialog:
+        """Creates a new `Dialog` bound to the given interaction.
+
+        Args:
+            interaction (discord.Interaction): The interaction the dialog answers to.
+            operator_ids (Optional[Sequence[int]], optional):
+                Overrides the template operator IDs for this dialog only.
+        """
+        return self._instantiate(self._create_controller(interaction), operator_ids)
+
+    def _create_controller(
+        self,
+        interaction: discord.Interaction,
+        message_sent: bool = False,
+        user_id: Optional[int] = None,
+    ) -> DialogController:
+        return DialogController(
+            interaction,
+            message_sent=message_sent,
+            latency_budget=self._latency_budget,
+            rate_limiter=self._rate_limiter,
+            user_id=user_id,
+        )
+
+    def _create_message_controller(
+        self, target: discord.abc.Messageable, user_id: Optional[int] = None
+    ) -> MessageDialogController:
+        return MessageDialogController(
+            target,
+            user_id=user_id,
+            latency_budget=self._latency_budget,
+            rate_limiter=self._rate_limiter,
+        )
+
+    def _instantiate(
+        self,
+        controller: DialogController,
+        operator_ids: Optional[Sequence[int]] = MISSING,
+    ) -> Dialog:
+        dialog = Dialog(controller)
+        rules = self._operator_rules
+        if operator_ids is not MISSING:
+            rules = rules.with_user_ids(operator_ids)
+
+        dialog.set_operator_rules(rules)
+        dialog.set_success_callback(self._on_success)
+        dialog.set_error_callback(self._on_error)
+        dialog.set_observer(self._observer)
+        dialog.set_result_stream(self._result_stream)
+        dialog.set_checkpoint_writer(self._checkpoint_writer)
+        dialog.set_timeout_callback(self._on_timeout)
+        dialog.set_timeout(
+            idle=self._idle_timeout,
+            total=self._total_timeout,
+            disable_components=self._disable_on_timeout,
+        )
+
+        for stage in self._stages:
+            dialog.add_stage(stage.instantiate())
+        dialog._set_graph(self._graph)
+
+        return dialog
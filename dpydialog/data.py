@@ -1,12 +1,22 @@
-from dataclasses import dataclass
+import datetime
+import re
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Collection, Optional
+from typing import Any, Callable, Collection, Dict, FrozenSet, Hashable, Iterable, List, Mapping, MutableMapping, Optional, Pattern, Union
 
 import discord
 
+from .serialization import from_msgpack, reduce_value, to_msgpack
+
+# `slots=True` needs Python 3.10, older versions keep the regular dataclasses
+_SLOTS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 
 @dataclass
 class StageComponents:
+    __slots__ = ('content', 'embeds', 'view')
+
     content: str
     embeds: Collection[discord.Embed]
     view: discord.ui.View
@@ -16,9 +26,26 @@ class StageAction(Enum):
     ENTER_MANUALLY = 1
     NEXT = 2
     CLOSE = 3
+    SUBMIT = 4
 
-@dataclass
+# Coercions understood by `ModalOption`: a parser and the error shown for invalid input
+_COERCIONS: Dict[Any, Any] = {
+    int: (int, 'must be a whole number'),
+    float: (float, 'must be a number'),
+    datetime.date: (datetime.date.fromisoformat, 'must be a date like 2024-12-31'),
+    datetime.time: (datetime.time.fromisoformat, 'must be a time like 18:30'),
+    datetime.datetime: (datetime.datetime.fromisoformat, 'must be a date and time like 2024-12-31 18:30'),
+}
+
+@dataclass(**_SLOTS)
 class ModalOption:
+    """A text input of a `DModal`.
+
+    `coerce` converts the submitted text, it's `int`, `float`, `datetime.date`,
+    `datetime.time`, `datetime.datetime` or any function raising `ValueError` for
+    invalid input. `pattern` is a regex the whole text has to match before it's
+    converted. An empty optional input is parsed as `None`.
+    """
     varname: str
     label: str
     style: discord.TextStyle = discord.TextStyle.short
@@ -28,6 +55,12 @@ class ModalOption:
     max_length: Optional[int] = None
     required: bool = True
     row: Optional[int] = None
+    coerce: Optional[Callable[[str], Any]] = None
+    pattern: Optional[Union[str, Pattern[str]]] = None
+
+    def __post_init__(self):
+        if isinstance(self.pattern, str):
+            self.pattern = re.compile(self.pattern)
 
     def to_dict(self):
         return {
@@ -40,3 +73,231 @@ class ModalOption:
             'required': self.required,
             'row': self.row
         }
+
+    def parse(self, text: str) -> Any:
+        """Converts the submitted text.
+
+        Raises:
+            ValueError: With a message for the user, when the text is invalid.
+        """
+        text = text.strip()
+        if not text and not self.required:
+            return None
+
+        if self.pattern is not None and self.pattern.fullmatch(text) is None:
+            raise ValueError("doesn't match the expected format")
+
+        if self.coerce is None:
+            return text
+
+        parser, message = _COERCIONS.get(self.coerce, (self.coerce, None))
+        try:
+            return parser(text)
+        except (TypeError, ValueError) as e:
+            raise ValueError(message or str(e) or 'is invalid') from None
+
+
+@dataclass(frozen=True, **_SLOTS)
+class OperatorRules:
+    """Describes who is allowed to interact with a component.
+
+    A user is allowed when any of the rules matches: the user ID is listed in
+    `user_ids`, the member has one of the `role_ids` or `predicate` returns `True`.
+    If none of the rules is set, then everyone can interact.
+
+    IDs are normalized into frozensets once, so every check is a hash lookup.
+    """
+    user_ids: Optional[FrozenSet[int]] = None
+    role_ids: Optional[FrozenSet[int]] = None
+    predicate: Optional[Callable[[discord.Interaction], bool]] = None
+
+    def __post_init__(self):
+        if self.user_ids is not None:
+            object.__setattr__(self, 'user_ids', frozenset(self.user_ids))
+        if self.role_ids is not None:
+            object.__setattr__(self, 'role_ids', frozenset(self.role_ids))
+
+    def is_unrestricted(self) -> bool:
+        return self.user_ids is None and self.role_ids is None and self.predicate is None
+
+    def with_user_ids(self, ids: Optional[Iterable[int]]) -> "OperatorRules":
+        return OperatorRules(user_ids=ids, role_ids=self.role_ids, predicate=self.predicate)
+
+    def intersect(self, other: "OperatorRules") -> "OperatorRules":
+        """Returns the rules allowing only the users both rules allow."""
+        if other.is_unrestricted():
+            return self
+        if self.is_unrestricted() or self == other:
+            return other
+
+        if self.role_ids is None and self.predicate is None and other.role_ids is None \
+                and other.predicate is None:
+            return OperatorRules(user_ids=self.user_ids & other.user_ids)
+        return OperatorRules(
+            predicate=lambda interaction: self.allows(interaction) and other.allows(interaction)
+        )
+
+    def allows(self, interaction: discord.Interaction) -> bool:
+        if self.is_unrestricted():
+            return True
+
+        user = interaction.user
+        if self.user_ids is not None and user.id in self.user_ids:
+            return True
+
+        if self.role_ids:
+            # `Member.roles` resolves and sorts Role objects on every access,
+            #   the raw role IDs are enough here.
+            member_role_ids = getattr(user, '_roles', None)
+            if member_role_ids and not self.role_ids.isdisjoint(member_role_ids):
+                return True
+
+        if self.predicate is not None:
+            return bool(self.predicate(interaction))
+
+        return False
+
+
+def _branch_key(value: Any) -> Hashable:
+    # Select results are lists, a single selected value is matched as itself
+    if isinstance(value, (list, tuple)):
+        return value[0] if len(value) == 1 else tuple(value)
+    return value
+
+
+@dataclass(frozen=True)
+class Branch:
+    """Chooses the stage that follows a stage by its result.
+
+    The result is converted with `key` and looked up in `cases`. Results without
+    a case go to `default`. A `None` target completes the dialog.
+
+    By default a single selected value is matched as itself and several values
+    are matched as a tuple, so `Branch({"yes": "details"}, default="summary")`
+    works with a `DSelect` result.
+    """
+    cases: Mapping[Hashable, Optional[str]] = field(default_factory=dict)
+    default: Optional[str] = None
+    key: Callable[[Any], Hashable] = _branch_key
+
+    def targets(self) -> List[Optional[str]]:
+        return [*self.cases.values(), self.default]
+
+
+@dataclass
+class DialogState:
+    """The progress of a `Dialog` that can be saved to a `IDialogStateStore`.
+
+    Discord objects in the `result` (members, roles, channels) are stored as references
+    to their IDs, see `dpydialog.serialization`. `to_bytes` gives the compact msgpack
+    form for shipping states between processes.
+
+    The round-trip is lossy: `from_dict` and `from_bytes` return the reduced result, where
+    select options are their values, dataclasses are dicts and dates are ISO strings.
+    A dialog restored from the state wraps it in a `LazyResult`, which turns only the
+    discord references back into objects, so `result` is annotated as a mapping.
+    """
+    dialog_id: str
+    template_name: Optional[str]
+    stage_index: int = 0
+    result: MutableMapping[str, Any] = field(default_factory=dict)
+    operator_ids: Optional[List[int]] = None
+    history: List[int] = field(default_factory=list)
+    user_id: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'dialog_id': self.dialog_id,
+            'template_name': self.template_name,
+            'stage_index': self.stage_index,
+            'history': list(self.history),
+            'result': reduce_value(self.result),
+            'operator_ids': None if self.operator_ids is None else sorted(self.operator_ids),
+            'user_id': self.user_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DialogState":
+        return cls(
+            dialog_id=data['dialog_id'],
+            template_name=data['template_name'],
+            stage_index=data.get('stage_index', 0),
+            result=data.get('result') or {},
+            operator_ids=data.get('operator_ids'),
+            # States saved before the branching support only had linear dialogs
+            history=data.get('history', list(range(data.get('stage_index', 0)))),
+            user_id=data.get('user_id'),
+        )
+
+    def to_bytes(self) -> bytes:
+        return to_msgpack(self.to_dict())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DialogState":
+        return cls.from_dict(from_msgpack(data))
+
+
+@dataclass
+class RegistryStats:
+    """A snapshot of a `DialogRegistry`."""
+    live: int
+    users: int
+    approx_bytes: int
+    evictions: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(**_SLOTS)
+class RenderStats:
+    """Counters of a `DialogController`.
+
+    `coalesced` counts renders merged into a later edit, `dropped` counts the merged renders
+    that were replaced before being shown, `throttled` counts renders delayed by the rate limiter.
+    """
+    renders: int = 0
+    deferred: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    throttled: int = 0
+
+    @property
+    def deferral_rate(self) -> float:
+        return self.deferred / self.renders if self.renders else 0.0
+
+
+@dataclass(**_SLOTS)
+class DialogResult:
+    """The result of a completed `Dialog`, published to a `DialogResultStream`."""
+    dialog_id: str
+    result: MutableMapping[str, Any]
+    user_id: Optional[int] = None
+    template_name: Optional[str] = None
+
+
+@dataclass(**_SLOTS)
+class StageCheckpoint:
+    """The value of one completed stage, written to an `ICheckpointSink` by a `CheckpointWriter`.
+
+    Discord objects in the `value` are stored as their IDs, like in `DialogState`.
+    """
+    dialog_id: str
+    stage_keyname: str
+    value: Any
+    user_id: Optional[int] = None
+    template_name: Optional[str] = None
+    created_at: float = 0.0
+
+
+@dataclass(**_SLOTS)
+class FanOutResult:
+    """The outcome of the dialog sent to one target of a `DialogFanOut`.
+
+    `status` is "completed", "closed", "timeout", "disposed" when the dialog was disposed
+    without an outcome (e.g. evicted from the registry), or "failed" when the first stage
+    couldn't be sent (e.g. the user doesn't accept DMs), then `error` is the raised exception.
+    `result` is the result dict, partial unless the dialog was completed.
+    """
+    target: Any
+    status: str
+    result: MutableMapping[str, Any] = field(default_factory=dict)
+    dialog_id: Optional[str] = None
+    error: Optional[BaseException] = None
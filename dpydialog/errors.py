@@ -18,19 +18,25 @@ class ShouldBeCoroutine(DialogException):
 
 class NotAllowedToInteract(DialogException):
     """Raised when a current user is not allowed to interact with the component."""
-    def __init__(self, *args, allowed_ids: Sequence[int], user_id: int, stage_keyname: Optional[str] = None):
-        self._stage_keyname = stage_keyname
+    def __init__(self, *args, allowed_ids: Optional[Sequence[int]], user_id: int, stage_keyname: Optional[str] = None):
+        super().__init__(*args, stage_keyname=stage_keyname)
         self._allowed_ids = allowed_ids
         self._uid = user_id
     
-    def get_allowed_users(self) -> Sequence[int]:
+    def get_allowed_users(self) -> Optional[Sequence[int]]:
         return self._allowed_ids
 
     def get_user_id(self) -> int:
-        return self.uid
+        return self._uid
 
 class DialogHasNoStages(DialogException):
     """Raised when a `Dialog` is sent without `Stage` classes."""
 
+class InvalidStageGraph(DialogException):
+    """Raised when the stage transitions have missing targets, unreachable stages or cycles."""
+
 class ValidationError(DialogException):
     """Raised when the validation function response isn't `True`."""
+
+class ValidationTimeout(ValidationError):
+    """Raised when a validator doesn't finish within the stage validation timeout."""
@@ -1,15 +1,18 @@
+import copy
 from abc import ABC, abstractmethod
 from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Union
 
 import discord
 
-from ..data import StageAction
+from ..data import OperatorRules, StageAction
 
 CallbackType = Callable[[discord.Interaction, Any], Awaitable[None]]
 ActionType = Union[StageAction, CallbackType]
 
 
 class IComponent(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_extras(self) -> Dict[str, Any]: ...
 
@@ -22,6 +25,15 @@ class IComponent(ABC):
     @abstractmethod
     def _replace_function(self, function: CallbackType) -> None: ...
 
+    def _get_stage_action(self) -> Optional[StageAction]:
+        # The stage resolves its actions from this on every view rebuild
+        action = self.get_action()
+        return action if isinstance(action, StageAction) else None
+
+    def _clone(self) -> "IComponent":
+        # Templates only clone prototypes, which never belong to a stage or a view
+        return copy.copy(self)
+
     @abstractmethod
     def _set_keyname(self, keyname: str) -> None: ...
 
@@ -34,5 +46,34 @@ class IComponent(ABC):
     @abstractmethod
     def get_operator_ids(self) -> Optional[Sequence[int]]: ...
 
+    def set_operator_rules(self, rules: OperatorRules) -> None:
+        """Restricts the component to the users the rules allow.
+
+        The default only supports the rules made of user IDs.
+
+        Raises:
+            NotImplementedError: When the rules have role IDs or a predicate.
+        """
+        if rules.role_ids is not None or rules.predicate is not None:
+            raise NotImplementedError(
+                f"`{type(self).__name__}` can only be restricted by user IDs, "
+                "override `set_operator_rules` to support the role and predicate rules."
+            )
+        self.set_operator_ids(rules.user_ids)
+
+    def _set_stage_rules(self, rules: OperatorRules) -> None:
+        # The stage rules narrow the component's own restriction, never widen it
+        if rules.is_unrestricted():
+            return
+        own = self.get_operator_ids()
+        if own is not None:
+            rules = OperatorRules(user_ids=own).intersect(rules)
+        self.set_operator_rules(rules)
+
     @abstractmethod
     def set_error_callback(self, callback: CallbackType) -> None: ...
+
+    def _set_denied_hook(
+        self, hook: Optional[Callable[[discord.Interaction], None]]
+    ) -> None:
+        pass
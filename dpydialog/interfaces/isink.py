@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from ..data import StageCheckpoint
+
+
+class ICheckpointSink(ABC):
+    @abstractmethod
+    async def write(self, checkpoints: List[StageCheckpoint]) -> None:
+        """Stores a batch of checkpoints, in the order they were recorded."""
@@ -1,14 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Any, Awaitable, Callable, Sequence
+from typing import Any, Awaitable, Callable, Optional, Sequence
 
 import discord
 
-from ..data import StageComponents
+from ..data import OperatorRules, StageComponents
 
 CallbackType = Callable[[discord.Interaction, Any], Awaitable[None]]
+InteractionHookType = Callable[[discord.Interaction, str], None]
+ErrorHookType = Callable[[discord.Interaction, Exception], Awaitable[bool]]
+TimeoutCallbackType = Callable[[str], Awaitable[None]]
 
 
 class IStage(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def get_components(self) -> StageComponents: ...
 
@@ -26,3 +31,47 @@ class IStage(ABC):
 
     @abstractmethod
     def set_operator_ids(self, ids: Sequence[int]) -> None: ...
+
+    # The hooks added after the first release have defaults, so existing
+    #   implementations keep working without them.
+    def set_refresh_callback(self, callback: CallbackType) -> None:
+        pass
+
+    async def prepare(self) -> None:
+        pass
+
+    def set_operator_rules(self, rules: OperatorRules) -> None:
+        """Restricts the stage to the users the rules allow.
+
+        The default only supports the rules made of user IDs.
+
+        Raises:
+            NotImplementedError: When the rules have role IDs or a predicate.
+        """
+        if rules.role_ids is not None or rules.predicate is not None:
+            raise NotImplementedError(
+                f"`{type(self).__name__}` can only be restricted by user IDs, "
+                "override `set_operator_rules` to support the role and predicate rules."
+            )
+        self.set_operator_ids(rules.user_ids)
+
+    def set_custom_id_prefix(self, prefix: Optional[str]) -> None:
+        pass
+
+    def invalidate_view(self) -> None:
+        pass
+
+    def dispose(self) -> None:
+        pass
+
+    def set_interaction_hook(self, hook: Optional[InteractionHookType]) -> None:
+        pass
+
+    def set_error_callback(self, callback: Optional[ErrorHookType]) -> None:
+        pass
+
+    def set_timeout_callback(self, callback: Optional[TimeoutCallbackType]) -> None:
+        pass
+
+    def set_observer(self, observer: Any, dialog: Any) -> None:
+        pass
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ..data import DialogState
+
+
+class IDialogStateStore(ABC):
+    @abstractmethod
+    async def load(self, dialog_id: str) -> Optional[DialogState]: ...
+
+    @abstractmethod
+    async def save(self, state: DialogState) -> None: ...
+
+    @abstractmethod
+    async def delete(self, dialog_id: str) -> None: ...
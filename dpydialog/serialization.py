@@ -0,0 +1,382 @@
+"""Compact forms of dialog results and states.
+
+Results hold discord.py objects (members, roles, channels, select options) that can't
+be stored or sent to another process. `reduce_value` turns them into plain data:
+select options become their values and discord objects become references, e.g.
+`{"$u": 1234}` for a user. The reduced data is encoded as JSON (`to_json`) or as
+msgpack (`to_msgpack`), where a reference takes 10 bytes. `LazyResult` turns the
+references back into discord objects from the client cache when they are read.
+
+The msgpack encoder is a small pure-Python subset of the format (nil, booleans,
+integers, floats, strings, arrays, maps and the references as extension types),
+so no dependency is needed and the output can be read by any msgpack library.
+"""
+import datetime
+import json
+import struct
+from collections import abc
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, Iterator, Mapping, Optional, Set, Tuple, Union
+
+import discord
+
+REF_USER = "$u"
+REF_ROLE = "$r"
+REF_CHANNEL = "$c"
+
+# Reference key -> the msgpack extension type
+_REF_EXT_TYPES: Dict[str, int] = {REF_USER: 1, REF_ROLE: 2, REF_CHANNEL: 3}
+_EXT_TYPE_REFS: Dict[int, str] = {code: key for key, code in _REF_EXT_TYPES.items()}
+_REF_OBJECT_TYPES: Dict[str, Any] = {
+    REF_USER: discord.User,
+    REF_ROLE: discord.Role,
+    REF_CHANNEL: discord.abc.GuildChannel,
+}
+
+_PLAIN_TYPES = frozenset((bool, int, float, str))
+_USER_TYPES = (discord.User, discord.Member, discord.ClientUser)
+_CHANNEL_TYPES = (
+    discord.abc.GuildChannel,
+    discord.abc.PrivateChannel,
+    discord.Thread,
+    discord.app_commands.AppCommandChannel,
+    discord.app_commands.AppCommandThread,
+)
+
+
+def reduce_value(value: Any) -> Any:
+    """Reduces a stage result into JSON-compatible data.
+
+    Users and members, roles and channels become references, select options become
+    their values, dates and times become ISO strings. Other objects with an integer
+    `id` become the ID, anything else becomes a string.
+    """
+    if value is None or type(value) in _PLAIN_TYPES:
+        return value
+    if type(value) is list:
+        return [reduce_value(item) for item in value]
+    if type(value) is dict:
+        return {str(key): reduce_value(item) for key, item in value.items()}
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, LazyResult):
+        return value.reduce()
+    if isinstance(value, abc.Mapping):
+        return {str(key): reduce_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [reduce_value(item) for item in value]
+    if isinstance(value, discord.SelectOption):
+        return value.value
+    if isinstance(value, discord.Role):
+        return {REF_ROLE: value.id}
+    if isinstance(value, _USER_TYPES):
+        return {REF_USER: value.id}
+    if isinstance(value, _CHANNEL_TYPES):
+        return {REF_CHANNEL: value.id}
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if is_dataclass(value) and not isinstance(value, type):
+        return reduce_value(asdict(value))
+    if isinstance(getattr(value, "id", None), int):
+        return value.id
+    return str(value)
+
+
+def _as_ref(value: Any) -> Optional[Tuple[str, int]]:
+    if type(value) is dict and len(value) == 1:
+        key, ref_id = next(iter(value.items()))
+        if key in _REF_EXT_TYPES and type(ref_id) is int:
+            return key, ref_id
+    return None
+
+
+def to_json(value: Any) -> str:
+    """Encodes the reduced form of the value as compact JSON."""
+    return json.dumps(reduce_value(value), separators=(",", ":"), ensure_ascii=False)
+
+
+def from_json(data: Union[str, bytes]) -> Any:
+    """Decodes JSON made by `to_json`, references stay reduced, see `LazyResult`."""
+    return json.loads(data)
+
+
+def to_msgpack(value: Any) -> bytes:
+    """Encodes the reduced form of the value as msgpack.
+
+    Raises:
+        ValueError: When an integer doesn't fit in 64 bits.
+    """
+    buffer = bytearray()
+    _pack(reduce_value(value), buffer)
+    return bytes(buffer)
+
+
+def from_msgpack(data: bytes) -> Any:
+    """Decodes msgpack made by `to_msgpack`, references stay reduced, see `LazyResult`.
+
+    Raises:
+        ValueError: When the data is truncated, has trailing bytes or uses an unsupported type.
+    """
+    view = memoryview(data)
+    try:
+        value, position = _unpack(view, 0)
+    except (IndexError, struct.error):
+        raise ValueError("The msgpack data is truncated.") from None
+    if position != len(view):
+        raise ValueError("The msgpack data has trailing bytes.")
+    return value
+
+
+def _pack_header(
+    size: int, fix: int, fix_limit: int, codes: Tuple[int, int, int], buffer: bytearray
+) -> None:
+    if size < fix_limit:
+        buffer.append(fix | size)
+    elif size <= 0xFF and codes[0]:
+        buffer += struct.pack(">BB", codes[0], size)
+    elif size <= 0xFFFF:
+        buffer += struct.pack(">BH", codes[1], size)
+    else:
+        buffer += struct.pack(">BI", codes[2], size)
+
+
+def _pack(value: Any, buffer: bytearray) -> None:
+    if value is None:
+        buffer.append(0xC0)
+    elif value is True:
+        buffer.append(0xC3)
+    elif value is False:
+        buffer.append(0xC2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            buffer.append(value)
+        elif -0x20 <= value < 0:
+            buffer.append(value & 0xFF)
+        elif 0 <= value <= 0xFF:
+            buffer += struct.pack(">BB", 0xCC, value)
+        elif 0 <= value <= 0xFFFF:
+            buffer += struct.pack(">BH", 0xCD, value)
+        elif 0 <= value <= 0xFFFFFFFF:
+            buffer += struct.pack(">BI", 0xCE, value)
+        elif 0 <= value <= 0xFFFFFFFFFFFFFFFF:
+            buffer += struct.pack(">BQ", 0xCF, value)
+        elif -0x80 <= value < 0:
+            buffer += struct.pack(">Bb", 0xD0, value)
+        elif -0x8000 <= value < 0:
+            buffer += struct.pack(">Bh", 0xD1, value)
+        elif -0x80000000 <= value < 0:
+            buffer += struct.pack(">Bi", 0xD2, value)
+        elif -0x8000000000000000 <= value < 0:
+            buffer += struct.pack(">Bq", 0xD3, value)
+        else:
+            raise ValueError(f"The integer {value} doesn't fit in 64 bits.")
+    elif isinstance(value, float):
+        buffer += struct.pack(">Bd", 0xCB, value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        _pack_header(len(encoded), 0xA0, 32, (0xD9, 0xDA, 0xDB), buffer)
+        buffer += encoded
+    elif isinstance(value, list):
+        _pack_header(len(value), 0x90, 16, (0, 0xDC, 0xDD), buffer)
+        for item in value:
+            _pack(item, buffer)
+    elif isinstance(value, dict):
+        ref = _as_ref(value)
+        if ref is not None and 0 <= ref[1] <= 0xFFFFFFFFFFFFFFFF:
+            # fixext 8: the extension type and the ID
+            buffer += struct.pack(">BbQ", 0xD7, _REF_EXT_TYPES[ref[0]], ref[1])
+            return
+
+        _pack_header(len(value), 0x80, 16, (0, 0xDE, 0xDF), buffer)
+        for key, item in value.items():
+            _pack(key, buffer)
+            _pack(item, buffer)
+    else:
+        raise ValueError(f"A value of the {type(value).__name__} type can't be encoded.")
+
+
+# Format byte -> (struct format, size) of the fixed-size values
+_FIXED = {
+    0xCA: (">f", 4),
+    0xCB: (">d", 8),
+    0xCC: (">B", 1),
+    0xCD: (">H", 2),
+    0xCE: (">I", 4),
+    0xCF: (">Q", 8),
+    0xD0: (">b", 1),
+    0xD1: (">h", 2),
+    0xD2: (">i", 4),
+    0xD3: (">q", 8),
+}
+# Format byte -> (struct format of the length, its size) of strings, arrays and maps
+_SIZED = {
+    0xD9: (">B", 1),
+    0xDA: (">H", 2),
+    0xDB: (">I", 4),
+    0xDC: (">H", 2),
+    0xDD: (">I", 4),
+    0xDE: (">H", 2),
+    0xDF: (">I", 4),
+}
+
+
+def _unpack(view: memoryview, position: int) -> Tuple[Any, int]:
+    code = view[position]
+    position += 1
+
+    if code < 0x80:
+        return code, position
+    if code >= 0xE0:
+        return code - 0x100, position
+    if code == 0xC0:
+        return None, position
+    if code == 0xC2:
+        return False, position
+    if code == 0xC3:
+        return True, position
+
+    if code in _FIXED:
+        fmt, size = _FIXED[code]
+        return struct.unpack_from(fmt, view, position)[0], position + size
+
+    if 0xA0 <= code <= 0xBF:
+        kind, size = "str", code & 0x1F
+    elif 0x90 <= code <= 0x9F:
+        kind, size = "array", code & 0x0F
+    elif 0x80 <= code <= 0x8F:
+        kind, size = "map", code & 0x0F
+    elif code in _SIZED:
+        fmt, length = _SIZED[code]
+        size = struct.unpack_from(fmt, view, position)[0]
+        position += length
+        kind = "str" if code <= 0xDB else "array" if code <= 0xDD else "map"
+    elif code == 0xD7:
+        ext_type, ref_id = struct.unpack_from(">bQ", view, position)
+        key = _EXT_TYPE_REFS.get(ext_type)
+        if key is None:
+            raise ValueError(f"The msgpack extension type {ext_type} isn't supported.")
+        return {key: ref_id}, position + 9
+    else:
+        raise ValueError(f"The msgpack format 0x{code:02x} isn't supported.")
+
+    if kind == "str":
+        end = position + size
+        if end > len(view):
+            raise IndexError(end)
+        return str(view[position:end], "utf-8"), end
+
+    if kind == "array":
+        items = []
+        for _ in range(size):
+            item, position = _unpack(view, position)
+            items.append(item)
+        return items, position
+
+    mapping = {}
+    for _ in range(size):
+        key, position = _unpack(view, position)
+        mapping[key], position = _unpack(view, position)
+    return mapping, position
+
+
+def _resolve(
+    key: str, ref_id: int, guild: Optional[discord.Guild], client: Optional[discord.Client]
+) -> Any:
+    found = None
+    if key == REF_USER:
+        if guild is not None:
+            found = guild.get_member(ref_id)
+        if found is None and client is not None:
+            found = client.get_user(ref_id)
+    elif key == REF_ROLE:
+        if guild is not None:
+            found = guild.get_role(ref_id)
+    else:
+        if guild is not None:
+            found = guild.get_channel_or_thread(ref_id)
+        if found is None and client is not None:
+            found = client.get_channel(ref_id)
+
+    if found is None:
+        # Not cached, the object still has the ID and the type
+        return discord.Object(id=ref_id, type=_REF_OBJECT_TYPES[key])
+    return found
+
+
+def rehydrate(
+    value: Any,
+    guild: Optional[discord.Guild] = None,
+    client: Optional[discord.Client] = None,
+) -> Any:
+    """Replaces the references in reduced data with discord objects from the cache.
+
+    Members and roles are looked up in the guild, users and channels also in the client.
+    References that aren't cached become `discord.Object`s with the ID.
+    """
+    if type(value) is dict:
+        ref = _as_ref(value)
+        if ref is not None:
+            return _resolve(ref[0], ref[1], guild, client)
+        return {key: rehydrate(item, guild, client) for key, item in value.items()}
+    if type(value) is list:
+        return [rehydrate(item, guild, client) for item in value]
+    return value
+
+
+class LazyResult(abc.MutableMapping):
+    """A dialog result restored from its reduced form.
+
+    Stage values are rehydrated (see `rehydrate`) when they are read for the first time,
+    so a restored dialog only looks up the objects that are used. Values that aren't read
+    are reduced again without a lookup.
+
+    Args:
+        data (Mapping[str, Any]): The reduced result, stage keyname -> value.
+        guild (Optional[discord.Guild], optional): The guild with the members, roles and channels. Defaults to None.
+        client (Optional[discord.Client], optional): The client with the users and channels. Defaults to None.
+    """
+
+    __slots__ = ("_items", "_reduced", "_guild", "_client")
+
+    def __init__(
+        self,
+        data: Mapping[str, Any],
+        guild: Optional[discord.Guild] = None,
+        client: Optional[discord.Client] = None,
+    ):
+        self._items: Dict[str, Any] = dict(data)
+        # Keynames whose values weren't rehydrated yet
+        self._reduced: Set[str] = set(self._items)
+        self._guild = guild
+        self._client = client
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._items[key]
+        if key in self._reduced:
+            value = self._items[key] = rehydrate(value, self._guild, self._client)
+            self._reduced.discard(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._items[key] = value
+        self._reduced.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        del self._items[key]
+        self._reduced.discard(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"<LazyResult keys={list(self._items)} reduced={len(self._reduced)}>"
+
+    def reduce(self) -> Dict[str, Any]:
+        """Returns the reduced result, the values that weren't read are reused as they are."""
+        return {
+            key: value if key in self._reduced else reduce_value(value)
+            for key, value in self._items.items()
+        }
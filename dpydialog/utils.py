@@ -0,0 +1,21 @@
+"""Small helpers shared by the dpydialog modules."""
+from typing import Dict, Tuple
+
+_slot_names: Dict[type, Tuple[str, ...]] = {}
+
+
+def get_slot_names(cls: type) -> Tuple[str, ...]:
+    """Returns the names of the slots of the class and its bases, resolved once per class.
+
+    `__slots__` can be a single string, and `__dict__` and `__weakref__` aren't attributes.
+    """
+    names = _slot_names.get(cls)
+    if names is None:
+        names = []
+        for base in cls.__mro__:
+            slots = base.__dict__.get("__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            names.extend(name for name in slots if name not in ("__dict__", "__weakref__"))
+        names = _slot_names[cls] = tuple(names)
+    return names
@@ -0,0 +1,71 @@
+import discord
+from dpydialog import (
+    Branch,
+    DButton,
+    DSelect,
+    DialogTemplate,
+    StageTemplate,
+    StageAction,
+)
+
+MY_GUILD = discord.Object(id=1078657744090959912)  # Replace with your server ID
+
+
+class SimpleClient(discord.Client):
+    """A basic Discord bot client that handles slash command registration."""
+
+    def __init__(self):
+        super().__init__(intents=discord.Intents.default())
+        self.tree = discord.app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        self.tree.copy_global_to(guild=MY_GUILD)
+        await self.tree.sync(guild=MY_GUILD)
+
+
+bot = SimpleClient()
+
+
+def question(keyname: str, content: str, *options: str) -> StageTemplate:
+    return StageTemplate(
+        keyname=keyname,
+        content=content,
+        components=[
+            DButton(emoji="⬅️", row=1, action=StageAction.BACK),
+            DButton(emoji="❌", row=1, action=StageAction.CLOSE),
+            DSelect(
+                options=[discord.SelectOption(label=option) for option in options],
+                row=0,
+                action=StageAction.NEXT,
+            ),
+        ],
+    )
+
+
+async def show_results(i: discord.Interaction, result: dict):
+    answers = ", ".join(f"{key}: {value[0]}" for key, value in result.items())
+    await i.response.edit_message(content=f"Thanks! {answers}", view=None)
+
+
+# Players are asked about their platform, everyone else goes straight to the feedback.
+# The transitions are validated when the template is created.
+SURVEY = DialogTemplate(
+    stages=[
+        question("plays", "Do you play games?", "Yes", "No"),
+        question("platform", "Which platform?", "PC", "Console", "Mobile"),
+        question("feedback", "How do you like the server?", "Great", "Fine", "Bad"),
+    ],
+    transitions={
+        "plays": Branch({"Yes": "platform"}, default="feedback"),
+    },
+    on_success=show_results,
+)
+
+
+@bot.tree.command(name="survey")
+async def survey(i: discord.Interaction):
+    dialog = SURVEY.instantiate(i, operator_ids={i.user.id})
+    await dialog.send(ephemeral=True)
+
+
+bot.run("...")
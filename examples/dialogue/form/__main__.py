@@ -0,0 +1,83 @@
+import discord
+from dpydialog import (
+    DButton,
+    DialogTemplate,
+    DSelect,
+    FormStage,
+    StageTemplate,
+    StageAction,
+)
+
+MY_GUILD = discord.Object(id=1078657744090959912)  # Replace with your server ID
+
+
+class SimpleClient(discord.Client):
+    """A basic Discord bot client that handles slash command registration."""
+
+    def __init__(self):
+        super().__init__(intents=discord.Intents.default())
+        self.tree = discord.app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        self.tree.copy_global_to(guild=MY_GUILD)
+        await self.tree.sync(guild=MY_GUILD)
+
+
+bot = SimpleClient()
+
+
+def options(*labels: str):
+    return [discord.SelectOption(label=label, value=label.lower()) for label in labels]
+
+
+async def show_results(i: discord.Interaction, result: dict):
+    order = result["order"]
+    await i.response.edit_message(
+        content=f"Ordered a {order['size'][0]} {order['drink'][0]} "
+        f"with {', '.join(order['extras']) or 'nothing'}",
+        view=None,
+    )
+
+
+# Three selects, one stage: picks are only stored, "Order" submits them all
+CAFE = DialogTemplate(
+    stages=[
+        StageTemplate(
+            keyname="order",
+            content="Build your drink",
+            components=[
+                DButton(emoji="❌", row=4, action=StageAction.CLOSE),
+                DButton(
+                    label="Order",
+                    style=discord.ButtonStyle.success,
+                    row=4,
+                    action=StageAction.SUBMIT,
+                ),
+            ],
+            stage_class=FormStage,
+            stage_kwargs=dict(
+                fields={
+                    "drink": DSelect(options=options("Latte", "Tea", "Cocoa"), placeholder="Drink"),
+                    "size": DSelect(options=options("Small", "Large"), placeholder="Size"),
+                    "extras": DSelect(
+                        options=options("Cream", "Syrup", "Cinnamon"),
+                        placeholder="Extras",
+                        min_values=0,
+                        max_values=3,
+                    ),
+                },
+                required=["drink", "size"],
+            ),
+        ),
+    ],
+    on_success=show_results,
+)
+
+
+@bot.tree.command(name="cafe")
+async def cafe(i: discord.Interaction):
+    dialog = CAFE.instantiate(i, operator_ids={i.user.id})
+    await dialog.send(ephemeral=True)
+
+
+bot.run("...")
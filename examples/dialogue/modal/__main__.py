@@ -0,0 +1,80 @@
+import datetime
+from dataclasses import dataclass
+
+import discord
+from dpydialog import (
+    DButton,
+    DialogTemplate,
+    ModalOption,
+    ModalStage,
+    StageTemplate,
+    StageAction,
+)
+
+MY_GUILD = discord.Object(id=1078657744090959912)  # Replace with your server ID
+
+
+class SimpleClient(discord.Client):
+    """A basic Discord bot client that handles slash command registration."""
+
+    def __init__(self):
+        super().__init__(intents=discord.Intents.default())
+        self.tree = discord.app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        self.tree.copy_global_to(guild=MY_GUILD)
+        await self.tree.sync(guild=MY_GUILD)
+
+
+bot = SimpleClient()
+
+
+@dataclass
+class Booking:
+    guests: int
+    day: datetime.date
+    phone: str
+    wishes: str = None
+
+
+async def show_results(i: discord.Interaction, result: dict):
+    booking: Booking = result["booking"]
+    await i.response.edit_message(
+        content=f"A table for {booking.guests} on {booking.day:%B %d} is booked", view=None
+    )
+
+
+# One modal instead of four text prompts, invalid fields are reported together
+RESTAURANT = DialogTemplate(
+    stages=[
+        StageTemplate(
+            keyname="booking",
+            content="Book a table",
+            components=[DButton(emoji="❌", action=StageAction.CLOSE)],
+            stage_class=ModalStage,
+            stage_kwargs=dict(
+                title="Booking",
+                result_type=Booking,
+                options=[
+                    ModalOption("guests", "Guests", coerce=int, max_length=2),
+                    ModalOption("day", "Day", placeholder="2024-12-31", coerce=datetime.date),
+                    ModalOption("phone", "Phone", pattern=r"\+?[0-9 ]{6,15}"),
+                    ModalOption(
+                        "wishes", "Wishes", style=discord.TextStyle.long, required=False
+                    ),
+                ],
+            ),
+            validation_func=lambda booking: 0 < booking.guests <= 12,
+        ),
+    ],
+    on_success=show_results,
+)
+
+
+@bot.tree.command(name="book")
+async def book(i: discord.Interaction):
+    dialog = RESTAURANT.instantiate(i, operator_ids={i.user.id})
+    await dialog.send(ephemeral=True)
+
+
+bot.run("...")
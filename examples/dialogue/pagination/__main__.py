@@ -0,0 +1,62 @@
+import discord
+from dpydialog import (
+    DButton,
+    DialogTemplate,
+    PaginatedSelectStage,
+    StageTemplate,
+    StageAction,
+)
+
+MY_GUILD = discord.Object(id=1078657744090959912)  # Replace with your server ID
+
+
+class SimpleClient(discord.Client):
+    """A basic Discord bot client that handles slash command registration."""
+
+    def __init__(self):
+        super().__init__(intents=discord.Intents.default())
+        self.tree = discord.app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        self.tree.copy_global_to(guild=MY_GUILD)
+        await self.tree.sync(guild=MY_GUILD)
+
+
+bot = SimpleClient()
+
+
+async def fetch_products(offset: int, limit: int):
+    # Replace with a database query, only one page is requested at a time
+    return [
+        discord.SelectOption(label=f"Product #{n}", value=str(n))
+        for n in range(offset, min(offset + limit, 5000))
+    ]
+
+
+async def show_results(i: discord.Interaction, result: dict):
+    await i.response.edit_message(
+        content=f"Selected products: {', '.join(result['products'])}", view=None
+    )
+
+
+SHOP = DialogTemplate(
+    stages=[
+        StageTemplate(
+            keyname="products",
+            content="Pick up to 5 products",
+            components=[DButton(emoji="❌", row=1, action=StageAction.CLOSE)],
+            stage_class=PaginatedSelectStage,
+            stage_kwargs=dict(provider=fetch_products, max_values=5),
+        ),
+    ],
+    on_success=show_results,
+)
+
+
+@bot.tree.command(name="shop")
+async def shop(i: discord.Interaction):
+    dialog = SHOP.instantiate(i, operator_ids={i.user.id})
+    await dialog.send(ephemeral=True)
+
+
+bot.run("...")
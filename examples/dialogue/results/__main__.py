@@ -0,0 +1,85 @@
+import asyncio
+import json
+from typing import List
+
+import discord
+from dpydialog import (
+    DButton,
+    DialogResult,
+    DialogResultStream,
+    DialogTemplate,
+    DSelect,
+    StageTemplate,
+    StageAction,
+)
+
+MY_GUILD = discord.Object(id=1078657744090959912)  # Replace with your server ID
+
+# Completed dialogs wait when 500 results aren't written yet
+RESULTS = DialogResultStream(max_size=500)
+
+
+def write_results(results: List[DialogResult]) -> None:
+    # One write per batch instead of one per dialog, e.g. `executemany` with a database
+    with open("survey.jsonl", "a", encoding="utf-8") as file:
+        for result in results:
+            file.write(json.dumps({"user": result.user_id, **result.result}) + "\n")
+
+
+async def consume_results() -> None:
+    async for batch in RESULTS.batches(size=100, window=5.0):
+        await asyncio.get_running_loop().run_in_executor(None, write_results, batch)
+
+
+class SimpleClient(discord.Client):
+    """A basic Discord bot client that handles slash command registration."""
+
+    def __init__(self):
+        super().__init__(intents=discord.Intents.default())
+        self.tree = discord.app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        self.loop.create_task(consume_results())
+        self.tree.copy_global_to(guild=MY_GUILD)
+        await self.tree.sync(guild=MY_GUILD)
+
+
+bot = SimpleClient()
+
+
+def rating_stage(keyname: str, question: str) -> StageTemplate:
+    return StageTemplate(
+        keyname=keyname,
+        content=question,
+        components=[
+            DSelect(
+                options=[
+                    discord.SelectOption(label=str(score), value=str(score))
+                    for score in range(1, 6)
+                ],
+                row=0,
+                action=StageAction.NEXT,
+            ),
+            DButton(emoji="❌", row=1, action=StageAction.CLOSE),
+        ],
+    )
+
+
+# Without a success callback the dialog removes its components when completed,
+# the results are only consumed from the stream
+SURVEY = DialogTemplate(
+    stages=[
+        rating_stage("speed", "How fast is the bot?"),
+        rating_stage("design", "How do you like the commands?"),
+    ],
+    result_stream=RESULTS,
+)
+
+
+@bot.tree.command(name="survey")
+async def survey(i: discord.Interaction):
+    dialog = SURVEY.instantiate(i, operator_ids={i.user.id})
+    await dialog.send(ephemeral=True)
+
+
+bot.run("...")
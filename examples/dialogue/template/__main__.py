@@ -0,0 +1,69 @@
+from typing import List
+import discord
+from dpydialog import (
+    DButton,
+    DRoleSelect,
+    DUserSelect,
+    DialogTemplate,
+    StageTemplate,
+    StageAction,
+)
+
+MY_GUILD = discord.Object(id=1078657744090959912)  # Replace with your server ID
+
+
+class SimpleClient(discord.Client):
+    """A basic Discord bot client that handles slash command registration."""
+
+    def __init__(self):
+        super().__init__(intents=discord.Intents.default())
+        self.tree = discord.app_commands.CommandTree(self)
+
+    async def setup_hook(self):
+        self.tree.copy_global_to(guild=MY_GUILD)
+        await self.tree.sync(guild=MY_GUILD)
+
+
+bot = SimpleClient()
+
+
+async def show_results(i: discord.Interaction, result: dict):
+    users: List[discord.Member] = result.get("user")
+    roles: List[discord.Role] = result.get("roles")
+
+    await i.response.edit_message(
+        content=f"Selected {len(users)} user(s) and {len(roles)} role(s).", view=None
+    )
+
+
+# The template is built and validated once, when the module is imported.
+# Every command invocation only creates the per-user state from it.
+ADD_ROLES = DialogTemplate(
+    stages=[
+        StageTemplate(
+            keyname="user",
+            components=[
+                DButton(emoji="❌", row=1, action=StageAction.CLOSE),
+                DUserSelect(max_values=3, row=0, action=StageAction.NEXT),
+            ],
+        ),
+        StageTemplate(
+            keyname="roles",
+            components=[
+                DButton(emoji="⬅️", row=1, action=StageAction.BACK),
+                DButton(emoji="❌", row=1, action=StageAction.CLOSE),
+                DRoleSelect(max_values=3, row=0, action=StageAction.NEXT),
+            ],
+        ),
+    ],
+    on_success=show_results,
+)
+
+
+@bot.tree.command(name="add-roles")
+async def add_role(i: discord.Interaction):
+    dialog = ADD_ROLES.instantiate(i, operator_ids={i.user.id})
+    await dialog.send(ephemeral=True)
+
+
+bot.run("...")
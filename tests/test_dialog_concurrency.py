@@ -0,0 +1,169 @@
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import discord
+import pytest
+
+from dpydialog import DButton, DialogTemplate, DSelect, StageAction
+from dpydialog.data import DialogState
+from dpydialog.errors import ValidationError
+from dpydialog.interfaces.istore import IDialogStateStore
+
+from benchmarks.common import build_template, find
+from benchmarks.fakes import FakeInteraction, FakeMessage, FakeUser, click
+
+USER = FakeUser(1)
+
+
+class FailingStore(IDialogStateStore):
+    """Fails the first `failures` saves."""
+
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.states: Dict[str, DialogState] = {}
+
+    async def load(self, dialog_id: str) -> Optional[DialogState]:
+        return self.states.get(dialog_id)
+
+    async def save(self, state: DialogState) -> None:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("The store is down.")
+        self.states[state.dialog_id] = state
+
+    async def delete(self, dialog_id: str) -> None:
+        self.states.pop(dialog_id, None)
+
+
+async def _yielding_validator(value: Any) -> bool:
+    await asyncio.sleep(0)
+    return True
+
+
+def build_counting_template(
+    successes: List[Dict[str, Any]], stages: int = 3, **kwargs: Any
+) -> DialogTemplate:
+    async def on_success(interaction: discord.Interaction, result: Dict[str, Any]) -> None:
+        successes.append(result)
+
+    return build_template(stages, buttons=[StageAction.BACK], on_success=on_success, **kwargs)
+
+
+def _find(dialog, action_type: type) -> discord.ui.Item:
+    stage = dialog.get_stage(f"stage{dialog._current_stage_index}")
+    return find(stage.get_components().view, action_type)
+
+
+async def _start(template: DialogTemplate, message: FakeMessage):
+    dialog = template.instantiate(FakeInteraction(USER, message=message), operator_ids=[USER.id])
+    await dialog.send()
+    return dialog
+
+
+def test_double_next_click_moves_one_stage():
+    async def run():
+        successes: List[Dict[str, Any]] = []
+        message = FakeMessage()
+        dialog = await _start(
+            build_counting_template(successes, validation_func=_yielding_validator), message
+        )
+
+        select = _find(dialog, DSelect)
+        first, second = await asyncio.gather(
+            click(select, USER, message, ["1"]), click(select, USER, message, ["1"])
+        )
+
+        assert dialog._current_stage_index == 1
+        assert dialog.get_history() == ["stage0"]
+        assert sorted(call[0] for i in (first, second) for call in i.response.calls) == [
+            "defer",
+            "edit_message",
+        ]
+
+    asyncio.run(run())
+
+
+def test_double_back_click_moves_one_stage():
+    async def run():
+        message = FakeMessage()
+        dialog = await _start(build_counting_template([]), message)
+        await click(_find(dialog, DSelect), USER, message, ["1"])
+        await click(_find(dialog, DSelect), USER, message, ["1"])
+        assert dialog._current_stage_index == 2
+
+        back = _find(dialog, DButton)
+        await asyncio.gather(click(back, USER, message), click(back, USER, message))
+
+        assert dialog._current_stage_index == 1
+        assert not dialog.is_finished()
+
+    asyncio.run(run())
+
+
+def test_double_click_on_last_stage_succeeds_once():
+    async def run():
+        successes: List[Dict[str, Any]] = []
+        message = FakeMessage()
+        dialog = await _start(
+            build_counting_template(successes, stages=1, validation_func=_yielding_validator), message
+        )
+
+        select = _find(dialog, DSelect)
+        await asyncio.gather(*(click(select, USER, message, ["1"]) for _ in range(5)))
+
+        assert dialog.is_finished()
+        assert successes == [{"stage0": ["1"]}]
+
+    asyncio.run(run())
+
+
+def test_stale_click_is_rejected():
+    async def run():
+        message = FakeMessage()
+        dialog = await _start(build_counting_template([]), message)
+        stale = _find(dialog, DSelect)
+        await click(stale, USER, message, ["1"])
+
+        interaction = await click(stale, USER, message, ["1"])
+
+        assert dialog._current_stage_index == 1
+        assert interaction.response.calls == [("defer", {})]
+
+    asyncio.run(run())
+
+
+def test_lock_is_released_after_failed_validation():
+    calls = []
+
+    def validator(value: Any) -> bool:
+        calls.append(value)
+        return len(calls) > 1
+
+    async def run():
+        message = FakeMessage()
+        dialog = await _start(build_counting_template([], validation_func=validator), message)
+
+        with pytest.raises(ValidationError):
+            await click(_find(dialog, DSelect), USER, message, ["1"])
+        await asyncio.wait_for(click(_find(dialog, DSelect), USER, message, ["1"]), 1)
+
+        assert dialog._current_stage_index == 1
+
+    asyncio.run(run())
+
+
+def test_lock_is_released_after_failed_save():
+    async def run():
+        message = FakeMessage()
+        dialog = await _start(build_counting_template([]), message)
+        store = FailingStore()
+        dialog.set_state_store(store, "template")
+
+        with pytest.raises(RuntimeError):
+            await click(_find(dialog, DSelect), USER, message, ["1"])
+        assert not dialog._lock.locked()
+
+        await asyncio.wait_for(click(_find(dialog, DSelect), USER, message, ["1"]), 1)
+        assert store.states[dialog.get_id()].stage_index == dialog._current_stage_index
+
+    asyncio.run(run())
@@ -0,0 +1,101 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from dpydialog import DButton, OperatorRules, Stage
+from dpydialog.errors import NotAllowedToInteract
+from dpydialog.interfaces.icomponent import IComponent
+
+from benchmarks.fakes import FakeInteraction, FakeUser
+
+
+def _clicks(button: DButton, *users: FakeUser) -> List[int]:
+    allowed: List[int] = []
+
+    async def run():
+        for user in users:
+            try:
+                await button.callback(FakeInteraction(user))
+            except NotAllowedToInteract:
+                continue
+            allowed.append(user.id)
+
+    asyncio.run(run())
+    return allowed
+
+
+async def _action(interaction, component) -> None:
+    pass
+
+
+def test_stage_rules_narrow_component_rules():
+    button = DButton(label="Button", action=_action, operator_ids=[1, 2])
+    stage = Stage("stage", [button])
+    stage.set_operator_ids([2, 3])
+    stage.get_components()
+
+    assert _clicks(button, FakeUser(1), FakeUser(2), FakeUser(3)) == [2]
+
+
+def test_stage_role_rules_never_widen_component_rules():
+    button = DButton(label="Button", action=_action, operator_ids=[1])
+    stage = Stage("stage", [button])
+    stage.set_operator_rules(OperatorRules(role_ids=[5]))
+    stage.get_components()
+
+    assert _clicks(button, FakeUser(1, [5]), FakeUser(1), FakeUser(2, [5])) == [1]
+
+
+def test_unrestricted_component_follows_stage_rules():
+    button = DButton(label="Button", action=_action)
+    stage = Stage("stage", [button])
+    stage.set_operator_ids([2])
+    stage.get_components()
+
+    assert _clicks(button, FakeUser(1), FakeUser(2)) == [2]
+
+
+class UserIdComponent(IComponent):
+    """Implements only the abstract methods, like third-party components do."""
+
+    operator_ids = None
+
+    def get_extras(self):
+        return None
+
+    def set_extras(self, extras):
+        pass
+
+    def get_action(self):
+        return None
+
+    def _replace_function(self, function):
+        pass
+
+    def _set_keyname(self, keyname):
+        pass
+
+    def get_keyname(self):
+        return None
+
+    def set_operator_ids(self, operator_ids):
+        self.operator_ids = operator_ids
+
+    def get_operator_ids(self):
+        return self.operator_ids
+
+    def set_error_callback(self, callback):
+        pass
+
+
+def test_default_set_operator_rules_refuses_role_rules():
+    component = UserIdComponent()
+
+    with pytest.raises(NotImplementedError):
+        component.set_operator_rules(OperatorRules(role_ids=[5]))
+    with pytest.raises(NotImplementedError):
+        component.set_operator_rules(OperatorRules(predicate=lambda interaction: True))
+
+    component.set_operator_rules(OperatorRules(user_ids=[3]))
+    assert set(component.get_operator_ids()) == {3}
@@ -0,0 +1,77 @@
+import asyncio
+import gc
+
+from dpydialog import DialogPersistence
+from dpydialog.classes.storage.file import FileDialogStateStore
+
+from benchmarks.common import build_template
+from benchmarks.fakes import FakeInteraction, FakeMessage, FakeUser
+
+
+class SlowStore(FileDialogStateStore):
+    def __init__(self, directory: str):
+        super().__init__(directory)
+        self.loads = 0
+
+    async def load(self, dialog_id: str):
+        self.loads += 1
+        await asyncio.sleep(0.01)
+        return await super().load(dialog_id)
+
+
+async def _on_success(interaction, result) -> None:
+    pass
+
+
+TEMPLATE = build_template(3, buttons=(), on_success=_on_success)
+
+
+def _persistence(store: FileDialogStateStore) -> DialogPersistence:
+    persistence = DialogPersistence(store)
+    persistence.add_template("template", TEMPLATE)
+    return persistence
+
+
+def _select(user: FakeUser, message: FakeMessage, dialog_id: str) -> FakeInteraction:
+    return FakeInteraction(
+        user,
+        message=message,
+        data={"custom_id": f"dpyd:{dialog_id}:stage0:0", "component_type": 3, "values": ["1"]},
+    )
+
+
+def test_concurrent_clicks_resume_the_dialog_once(tmp_path):
+    async def run():
+        store = SlowStore(str(tmp_path))
+        user = FakeUser(1)
+        message = FakeMessage()
+        dialog = _persistence(store).start("template", FakeInteraction(user, message=message))
+        await dialog.send()
+        dialog_id = dialog.get_id()
+        del dialog
+        gc.collect()
+
+        # Another process, where the dialog isn't alive
+        persistence = _persistence(store)
+        clicks = [_select(user, message, dialog_id) for _ in range(2)]
+        handled = await asyncio.gather(*(persistence.dispatch(i) for i in clicks))
+
+        assert handled == [True, True]
+        assert store.loads == 1
+        assert persistence._live[dialog_id]._current_stage_index == 1
+        assert sorted(i.response.calls[0][0] for i in clicks) == ["defer", "edit_message"]
+        assert (await store.load(dialog_id)).stage_index == 1
+
+    asyncio.run(run())
+
+
+def test_unknown_dialog_is_not_handled(tmp_path):
+    async def run():
+        persistence = _persistence(SlowStore(str(tmp_path)))
+        interaction = _select(FakeUser(1), FakeMessage(), "missing")
+
+        assert not await persistence.dispatch(interaction)
+        assert interaction.response.calls == []
+        assert not persistence._resuming
+
+    asyncio.run(run())